@@ -1,13 +1,30 @@
 # app_gui.py
-import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import tkinter as tk
 from tkinter import messagebox, filedialog
 
-from PIL import Image, ImageTk
+from PIL import ImageTk
 
+from bulk_import import import_folder
 from clothing_item import ClothingItem
 from closet_model import Closet, CATEGORIES, VIBES
-from storage import load_closet, save_closet
+from color_extract import extract_colors
+from image_cache import ThumbnailCache
+from image_dedupe import find_duplicates
+from outfit_render import CompositeCache
+from storage import ClosetStore, open_store
+from virtual_list import VirtualListbox
+
+# background load: batches handed to the Tk loop per tick, and tick length
+LOAD_BATCHES_PER_TICK = 2
+LOAD_POLL_MS = 30
+
+# wait this long after the last keystroke before searching
+SEARCH_DELAY_MS = 150
+GALLERY_COLUMNS = 5
+GALLERY_TILE = (90, 220)  # composites scaled down to fit
 
 
 class SquigglePanel(tk.Frame):
@@ -83,7 +100,7 @@ class SquigglePanel(tk.Frame):
 
 
 class OutfitApp:
-    def __init__(self, root: tk.Tk):
+    def __init__(self, root: tk.Tk, store: ClosetStore | None = None):
         self.root = root
         self.root.title("Y2K Virtual Closet")
 
@@ -97,8 +114,17 @@ class OutfitApp:
 
         self.root.configure(bg=self.bg_main)
 
-        self.closet: Closet = load_closet()
+        # the closet fills in from a background load (see _start_loading),
+        # so the window shows up right away even for huge closets
+        self.store = store or open_store()
+        self.closet: Closet = Closet()
+        # index items for search as they load rather than on first search
+        self.closet.enable_search()
+        self.thumbs = ThumbnailCache()
         self.selected_index = None
+        # search results shown in the closet list (None = whole closet)
+        self.closet_view = None
+        self._search_after_id = None
 
         # keep image references alive (current outfit)
         self.outfit_images = {
@@ -107,13 +133,11 @@ class OutfitApp:
             "Shoes": None,
             "Accessory": None,
         }
-        # favorite preview images
-        self.favorite_images = {
-            "TopOrDress": None,
-            "Bottom": None,
-            "Shoes": None,
-            "Accessory": None,
-        }
+        # favorite preview: one pre-rendered image per outfit
+        self.composites = CompositeCache(self.thumbs)
+        self.favorite_image = None
+        # renders favorites ahead of time (neighbours, gallery)
+        self.render_pool = ThreadPoolExecutor(max_workers=1)
 
         # ----- Header -----
         title = tk.Label(
@@ -170,9 +194,6 @@ class OutfitApp:
         fav_panel.pack(side="left", padx=8, pady=5)
         self._build_favorites_panel(fav_panel.inner)
 
-        self._refresh_closet()
-        self._refresh_favorites()
-
         # initial empty previews
         empty_outfit = {
             "Top": None,
@@ -184,6 +205,54 @@ class OutfitApp:
         self._update_outfit_images(empty_outfit)
         self._update_favorite_preview(empty_outfit)
 
+        self._start_loading()
+
+    # ---------------- LOADING ----------------
+    def _start_loading(self):
+        self.closet.loading = True
+        self._load_stream = self.store.stream()
+        self._load_queue = queue.Queue()
+
+        def worker():
+            for batch in self._load_stream:
+                self._load_queue.put(batch)
+            self._load_queue.put(None)
+
+        threading.Thread(target=worker, daemon=True).start()
+        self.root.after(0, self._poll_loading)
+
+    def _poll_loading(self):
+        for _ in range(LOAD_BATCHES_PER_TICK):
+            try:
+                batch = self._load_queue.get_nowait()
+            except queue.Empty:
+                break
+            if batch is None:
+                self._finish_loading()
+                return
+            for item in batch:
+                self.closet.restore_item(item)
+        self.closet_listbox.refresh()
+        self.closet_status_label.config(
+            text=f"Loading… {len(self.closet)} items so far"
+        )
+        self.root.after(LOAD_POLL_MS, self._poll_loading)
+
+    def _finish_loading(self):
+        self._load_stream.finish(self.closet)
+        self.closet.loading = False
+        # the journal replay may have changed rows already shown
+        self._refresh_closet()
+        self._refresh_favorites()
+
+    def _still_loading(self) -> bool:
+        """Edits wait for the load: ids and the journal aren't known yet."""
+        if self.closet.loading:
+            messagebox.showinfo(
+                "Still loading", "Your closet is still loading, try again in a moment."
+            )
+        return self.closet.loading
+
     # ---------------- LEFT PANEL (Closet) ----------------
     def _build_left(self, frame: tk.Frame):
         tk.Label(
@@ -254,6 +323,13 @@ class OutfitApp:
             activebackground=self.button_active,
             width=8
         ).pack(side="left", padx=2)
+        self.import_button = tk.Button(
+            frame, text="Import Folder 📂",
+            command=self._import_folder,
+            bg=self.accent,
+            activebackground=self.button_active
+        )
+        self.import_button.pack(fill="x", pady=2)
 
         # Closet list
         tk.Label(
@@ -262,16 +338,52 @@ class OutfitApp:
             bg=self.bg_panel
         ).pack(pady=(8, 2))
 
-        self.closet_listbox = tk.Listbox(frame, height=13, width=45)
+        search_row = tk.Frame(frame, bg=self.bg_panel)
+        search_row.pack(fill="x", pady=2)
+        tk.Label(search_row, text="Search 🔍", bg=self.bg_panel).pack(side="left")
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add("write", self._on_search_typed)
+        tk.Entry(search_row, textvariable=self.search_var).pack(
+            side="left", fill="x", expand=True, padx=3
+        )
+
+        self.closet_listbox = VirtualListbox(
+            frame,
+            row_count=lambda: len(self._closet_rows()),
+            row_text=self._closet_row_text,
+            on_select=self._on_select_item,
+            height=13, width=45, bg=self.bg_panel
+        )
         self.closet_listbox.pack(fill="both", expand=True, pady=2)
-        self.closet_listbox.bind("<<ListboxSelect>>", self._on_select_item)
 
+        self.closet_status_label = tk.Label(
+            frame, text="Loading…", font=("Comic Sans MS", 9),
+            fg="#777777", bg=self.bg_panel
+        )
+        self.closet_status_label.pack()
+
+        bottom_row = tk.Frame(frame, bg=self.bg_panel)
+        bottom_row.pack(pady=5)
         tk.Button(
-            frame, text="Save Closet 💾",
+            bottom_row, text="Save Closet 💾",
             command=self._save_closet,
             bg=self.button_bg,
             activebackground=self.button_active
-        ).pack(pady=5)
+        ).pack(side="left", padx=2)
+        self.duplicates_button = tk.Button(
+            bottom_row, text="Find Duplicates 👯",
+            command=self._find_duplicates,
+            bg=self.accent2,
+            activebackground=self.button_active
+        )
+        self.duplicates_button.pack(side="left", padx=2)
+        self.colors_button = tk.Button(
+            bottom_row, text="Auto Colors 🎨",
+            command=self._auto_colors,
+            bg=self.accent,
+            activebackground=self.button_active
+        )
+        self.colors_button.pack(side="left", padx=2)
 
     def _browse_image(self):
         path = filedialog.askopenfilename(
@@ -282,6 +394,70 @@ class OutfitApp:
             self.image_entry.delete(0, tk.END)
             self.image_entry.insert(0, path)
 
+    # ---------------- BULK IMPORT ----------------
+    def _import_folder(self):
+        if self._still_loading():
+            return
+        folder = filedialog.askdirectory(title="Choose a folder of clothing photos")
+        if not folder:
+            return
+        existing = [item.image_path for item in self.closet if item.image_path]
+        progress = queue.Queue()
+        results = queue.Queue()
+
+        def worker():
+            # always put something, or _poll_import would wait forever
+            try:
+                results.put(import_folder(
+                    folder, existing,
+                    on_progress=lambda done, total: progress.put((done, total))
+                ))
+            except Exception as e:  # unreadable folder, broken process pool...
+                results.put(e)
+
+        self.import_button.config(state="disabled", text="Scanning folder…")
+        threading.Thread(target=worker, daemon=True).start()
+        self._poll_import(progress, results)
+
+    def _poll_import(self, progress, results):
+        latest = None
+        while not progress.empty():
+            latest = progress.get_nowait()
+        if latest is not None:
+            self.import_button.config(text=f"Importing {latest[0]}/{latest[1]}…")
+        try:
+            result = results.get_nowait()
+        except queue.Empty:
+            self.root.after(100, self._poll_import, progress, results)
+            return
+        self.import_button.config(state="normal", text="Import Folder 📂")
+        if isinstance(result, Exception):
+            messagebox.showerror("Import failed", f"Could not import the folder:\n{result}")
+            return
+        items, thumbs, skipped = result
+
+        for key, phash in thumbs:
+            self.thumbs.add(key, phash)
+        for item in items:
+            self.closet.add_item(item)
+        self._refresh_closet()
+
+        # one save for the whole import
+        try:
+            self.thumbs.save_index()
+        except OSError:
+            pass
+        saved = self.store.save(self.closet)
+
+        message = f"Added {len(items)} items."
+        if skipped:
+            message += f"\n{len(skipped)} files couldn't be read as images."
+        if not saved:
+            message += "\n\nCould not write the closet file; use Save Closet to retry."
+        messagebox.showinfo("Import finished", message)
+        if items:
+            self._auto_colors([item.item_id for item in items])
+
     # ---------------- MIDDLE PANEL (Today's Outfit) ----------------
     def _build_middle(self, frame: tk.Frame):
         tk.Label(
@@ -317,13 +493,28 @@ class OutfitApp:
             variable=self.include_accessory_var,
             bg=self.bg_panel
         ).pack(pady=3)
+        self.avoid_recent_var = tk.BooleanVar(value=True)
+        tk.Checkbutton(
+            frame,
+            text="Skip recently worn",
+            variable=self.avoid_recent_var,
+            bg=self.bg_panel
+        ).pack(pady=3)
 
+        pick_row = tk.Frame(frame, bg=self.bg_panel)
+        pick_row.pack(pady=5)
         tk.Button(
-            frame, text="Pick My Outfit!",
+            pick_row, text="Pick My Outfit!",
             command=self._pick_outfit,
             bg=self.accent,
             activebackground=self.button_active
-        ).pack(pady=5)
+        ).pack(side="left", padx=2)
+        tk.Button(
+            pick_row, text="Wore It Today 👕",
+            command=self._wear_outfit,
+            bg=self.button_bg,
+            activebackground=self.button_active
+        ).pack(side="left", padx=2)
 
         # Outfit preview (STACKED like paper dolls)
         tk.Label(
@@ -378,9 +569,20 @@ class OutfitApp:
         ).pack(pady=5)
 
         # list of saved outfits
-        self.favorites_listbox = tk.Listbox(frame, height=7)
+        self.favorites_listbox = VirtualListbox(
+            frame,
+            row_count=lambda: len(self.closet.favorites),
+            row_text=lambda i: self.closet.favorites[i].get("label", "Favorite"),
+            on_select=self._on_select_favorite,
+            height=7, bg=self.bg_panel
+        )
         self.favorites_listbox.pack(fill="both", expand=False, pady=(2, 4))
-        self.favorites_listbox.bind("<<ListboxSelect>>", self._on_select_favorite)
+        tk.Button(
+            frame, text="Gallery 🖼️",
+            command=self._open_gallery,
+            bg=self.accent,
+            activebackground=self.button_active
+        ).pack(pady=(0, 4))
 
         # details text
         tk.Label(
@@ -406,31 +608,13 @@ class OutfitApp:
             bg=self.bg_panel
         ).pack(pady=(6, 2))
 
-        preview = tk.Frame(frame, bg=self.bg_panel)
-        preview.pack(pady=2)
-
-        self.favorite_preview_canvases = {
-            "TopOrDress": tk.Canvas(preview, width=200, height=120,
-                                    bg="#FFFFFF", highlightthickness=1,
-                                    highlightbackground="#000000"),
-            "Bottom": tk.Canvas(preview, width=200, height=120,
-                                bg="#FFFFFF", highlightthickness=1,
-                                highlightbackground="#000000"),
-            "Shoes": tk.Canvas(preview, width=200, height=120,
-                               bg="#FFFFFF", highlightthickness=1,
-                               highlightbackground="#000000"),
-            "Accessory": tk.Canvas(preview, width=200, height=120,
-                                   bg="#FFFFFF", highlightthickness=1,
-                                   highlightbackground="#000000"),
-        }
-
-        self.favorite_preview_canvases["TopOrDress"].pack(pady=2)
-        self.favorite_preview_canvases["Bottom"].pack(pady=2)
-        self.favorite_preview_canvases["Shoes"].pack(pady=2)
-        self.favorite_preview_canvases["Accessory"].pack(pady=2)
+        self.favorite_preview = tk.Label(frame, bg=self.bg_panel)
+        self.favorite_preview.pack(pady=2)
 
     # ---------------- CLOSET LOGIC ----------------
     def _add_item(self):
+        if self._still_loading():
+            return
         name = self.name_entry.get().strip()
         if not name:
             messagebox.showwarning("Missing name", "Please enter an item name.")
@@ -450,17 +634,19 @@ class OutfitApp:
         self.color_entry.delete(0, tk.END)
         self.image_entry.delete(0, tk.END)
         self.selected_index = None
-        self.closet_listbox.selection_clear(0, tk.END)
-
-        self._refresh_closet()
-
-    def _on_select_item(self, event):
-        selection = self.closet_listbox.curselection()
-        if not selection:
-            self.selected_index = None
-            return
-
-        idx = selection[0]
+        self.closet_listbox.selection_clear()
+
+        if self.closet_view is None:
+            self.closet_listbox.row_inserted(len(self.closet) - 1)
+            self._update_closet_status()
+        else:
+            self._run_search()
+
+    def _on_select_item(self, row):
+        if self.closet_view is None:
+            idx = row
+        else:
+            idx = self.closet.index_of(self.closet_view[row].item_id)
         self.selected_index = idx
         item = self.closet.items[idx]
 
@@ -474,6 +660,8 @@ class OutfitApp:
         self.image_entry.insert(0, item.image_path)
 
     def _update_item(self):
+        if self._still_loading():
+            return
         if self.selected_index is None:
             messagebox.showwarning("No selection", "Select an item to update.")
             return
@@ -490,10 +678,15 @@ class OutfitApp:
             vibe=self.vibe_var.get().strip(),
             image_path=self.image_entry.get().strip()
         )
-        self.closet.items[self.selected_index] = updated
-        self._refresh_closet()
+        self.closet.update_item(self.selected_index, updated)
+        if self.closet_view is None:
+            self.closet_listbox.row_changed(self.selected_index)
+        else:
+            self._run_search()
 
     def _delete_item(self):
+        if self._still_loading():
+            return
         if self.selected_index is None:
             messagebox.showwarning("No selection", "Select an item to delete.")
             return
@@ -502,19 +695,201 @@ class OutfitApp:
         if not messagebox.askyesno("Delete item", f"Remove '{item.name}' from your closet?"):
             return
 
-        del self.closet.items[self.selected_index]
+        self.closet.remove_item(self.selected_index)
+        if self.closet_view is None:
+            self.closet_listbox.row_deleted(self.selected_index)
+            self._update_closet_status()
+        else:
+            self.closet_listbox.selection_clear()
+            self._run_search()
         self.selected_index = None
-        self.closet_listbox.selection_clear(0, tk.END)
-        self._refresh_closet()
+
+    def _closet_rows(self) -> list:
+        return self.closet.items if self.closet_view is None else self.closet_view
+
+    def _closet_row_text(self, index: int) -> str:
+        item = self._closet_rows()[index]
+        return f"{item.category}: {item}"
 
     def _refresh_closet(self):
-        self.closet_listbox.delete(0, tk.END)
-        for item in self.closet.items:
-            self.closet_listbox.insert(tk.END, f"{item.category}: {item}")
+        if self.closet_view is not None:
+            self._run_search()
+            return
+        # only redraws the visible rows; edits use row_* for single rows
+        self.closet_listbox.refresh()
+        self._update_closet_status()
+
+    def _update_closet_status(self):
+        if self.closet_view is None:
+            text = f"{len(self.closet)} items"
+        else:
+            text = f"{len(self.closet_view)} of {len(self.closet)} items"
+        self.closet_status_label.config(text=text)
+
+    # ---------------- SEARCH ----------------
+    def _on_search_typed(self, *args):
+        # debounce: only search once typing pauses
+        if self._search_after_id is not None:
+            self.root.after_cancel(self._search_after_id)
+        self._search_after_id = self.root.after(SEARCH_DELAY_MS, self._run_search)
+
+    def _run_search(self):
+        self._search_after_id = None
+        query = self.search_var.get().strip()
+        self.closet_view = self.closet.search(query) if query else None
+        self.selected_index = None
+        self.closet_listbox.selection_clear()
+        self.closet_listbox.top = 0
+        self.closet_listbox.refresh()
+        self._update_closet_status()
 
     def _save_closet(self):
-        save_closet(self.closet)
-        messagebox.showinfo("Saved", "Closet saved successfully.")
+        if self._still_loading():
+            return
+        try:
+            self.thumbs.save_index()
+        except OSError:
+            pass  # only a cache
+        if self.store.save(self.closet):
+            messagebox.showinfo("Saved", "Closet saved successfully.")
+        else:
+            messagebox.showerror("Not saved", "Could not write the closet file.")
+
+    # ---------------- DUPLICATE PHOTOS ----------------
+    def _find_duplicates(self):
+        if self._still_loading():
+            return
+        # hashing photos that aren't cached yet can take a while -> worker
+        jobs = [(item.item_id, item.image_path)
+                for item in self.closet if item.image_path]
+        results = queue.Queue()
+
+        def worker():
+            # always put something, or _poll_duplicates would wait forever
+            try:
+                hashes = {}
+                for item_id, path in jobs:
+                    phash = self.thumbs.phash(path)
+                    if phash is not None:
+                        hashes[item_id] = phash
+                try:
+                    self.thumbs.save_index()
+                except OSError:
+                    pass  # only a cache
+                results.put(find_duplicates(hashes))
+            except Exception as e:
+                results.put(e)
+
+        self.duplicates_button.config(state="disabled", text="Scanning photos…")
+        threading.Thread(target=worker, daemon=True).start()
+        self._poll_duplicates(results)
+
+    def _poll_duplicates(self, results):
+        try:
+            groups = results.get_nowait()
+        except queue.Empty:
+            self.root.after(100, self._poll_duplicates, results)
+            return
+        self.duplicates_button.config(state="normal", text="Find Duplicates 👯")
+        if isinstance(groups, Exception):
+            messagebox.showerror("Find duplicates", f"Scanning the photos failed:\n{groups}")
+            return
+
+        # items may have been deleted while the scan ran
+        groups = [[i for i in ids if self.closet.get_item(i)] for ids in groups]
+        groups = [ids for ids in groups if len(ids) > 1]
+        if not groups:
+            messagebox.showinfo("No duplicates", "No duplicate photos found.")
+            return
+
+        extra = sum(len(ids) - 1 for ids in groups)
+        examples = "\n".join(
+            f"• {self.closet.get_item(ids[0]).name} ×{len(ids)}" for ids in groups[:8]
+        )
+        if len(groups) > 8:
+            examples += f"\n… and {len(groups) - 8} more"
+        if not messagebox.askyesno(
+            "Merge duplicates",
+            f"Found {len(groups)} photos used by more than one item:\n\n"
+            f"{examples}\n\nMerge them? This removes {extra} items, keeping "
+            "the oldest of each; saved outfits switch to the kept item."
+        ):
+            return
+
+        for ids in groups:
+            self.closet.merge_items(ids[0], ids[1:])
+        self.selected_index = None
+        self.closet_listbox.selection_clear()
+        self._refresh_closet()
+
+    # ---------------- AUTO COLORS ----------------
+    def _auto_colors(self, item_ids=None):
+        """
+        Fill in the color of items that have a photo but no color.
+        item_ids limits it to those items (e.g. just imported ones).
+        """
+        if self._still_loading():
+            return
+        items = self.closet if item_ids is None else filter(
+            None, map(self.closet.get_item, item_ids))
+        jobs = {item.item_id: item.image_path
+                for item in items if item.image_path and not item.color}
+        if not jobs:
+            if item_ids is None:
+                messagebox.showinfo("Auto colors", "Every item with a photo has a color.")
+            return
+        progress = queue.Queue()
+        results = queue.Queue()
+
+        def worker():
+            # always put something, or _poll_auto_colors would wait forever
+            try:
+                colors = extract_colors(
+                    jobs.values(), on_progress=lambda done, total: progress.put(done))
+                results.put({item_id: colors[path] for item_id, path in jobs.items()})
+            except Exception as e:  # e.g. BrokenProcessPool
+                results.put(e)
+
+        self.colors_button.config(state="disabled")
+        threading.Thread(target=worker, daemon=True).start()
+        self._poll_auto_colors(progress, results, len(jobs))
+
+    def _poll_auto_colors(self, progress, results, total):
+        done = None
+        while not progress.empty():
+            done = progress.get_nowait()
+        if done is not None:
+            self.colors_button.config(text=f"Coloring {done}/{total}…")
+        try:
+            colors = results.get_nowait()
+        except queue.Empty:
+            self.root.after(100, self._poll_auto_colors, progress, results, total)
+            return
+        self.colors_button.config(state="normal", text="Auto Colors 🎨")
+        if isinstance(colors, Exception):
+            messagebox.showerror("Auto colors", f"Reading the photos failed:\n{colors}")
+            return
+
+        # updates don't move items, so positions can be looked up once
+        positions = {item.item_id: i for i, item in enumerate(self.closet.items)}
+        filled = 0
+        for item_id, color in colors.items():
+            item = self.closet.get_item(item_id)
+            # skip items deleted or given a color while the scan ran
+            if not color or item is None or item.color:
+                continue
+            self.closet.update_item(positions[item_id], ClothingItem(
+                name=item.name, category=item.category, color=color,
+                vibe=item.vibe, image_path=item.image_path
+            ))
+            filled += 1
+        if filled:
+            self._refresh_closet()
+        unreadable = sum(1 for color in colors.values() if not color)
+        status = f"Colored {filled} of {total} items"
+        if unreadable:
+            status += f" ({unreadable} photos unreadable)"
+        self.closet_status_label.config(text=status)
 
     # ---------------- TODAY'S OUTFIT + IMAGES ----------------
     def _pick_outfit(self):
@@ -524,7 +899,8 @@ class OutfitApp:
 
         outfit = self.closet.random_outfit(
             vibe=self.today_vibe_var.get(),
-            include_accessory=self.include_accessory_var.get()
+            include_accessory=self.include_accessory_var.get(),
+            avoid_recent=self.avoid_recent_var.get()
         )
 
         # text labels
@@ -537,6 +913,15 @@ class OutfitApp:
 
         self.current_outfit = outfit
 
+    def _wear_outfit(self):
+        if not hasattr(self, "current_outfit"):
+            messagebox.showwarning("No outfit", "Pick an outfit first!")
+            return
+        if self._still_loading():
+            return
+        self.closet.wear_outfit(self.current_outfit)
+        self.closet_status_label.config(text="Logged today's outfit ✔")
+
     def _update_outfit_images(self, outfit: dict):
         # clear old
         for key in self.outfit_images:
@@ -549,23 +934,10 @@ class OutfitApp:
         shoes_item = outfit.get("Shoes")
         accessory_item = outfit.get("Accessory")
 
-        def load_img(item):
-            if not item or not item.image_path:
-                return None
-            if not os.path.exists(item.image_path):
-                return None
-            try:
-                img = Image.open(item.image_path)
-                img = img.convert("RGBA")
-                img.thumbnail((200, 130))  # fit inside each rectangle
-                return ImageTk.PhotoImage(img)
-            except Exception:
-                return None
-
-        self.outfit_images["TopOrDress"] = load_img(top_or_dress_item)
-        self.outfit_images["Bottom"] = load_img(bottom_item)
-        self.outfit_images["Shoes"] = load_img(shoes_item)
-        self.outfit_images["Accessory"] = load_img(accessory_item)
+        self.outfit_images["TopOrDress"] = self._load_thumbnail(top_or_dress_item)
+        self.outfit_images["Bottom"] = self._load_thumbnail(bottom_item)
+        self.outfit_images["Shoes"] = self._load_thumbnail(shoes_item)
+        self.outfit_images["Accessory"] = self._load_thumbnail(accessory_item)
 
         placeholders = {
             "TopOrDress": "Top / Dress",
@@ -587,26 +959,30 @@ class OutfitApp:
                     fill="#777777"
                 )
 
+    def _load_thumbnail(self, item):
+        if not item or not item.image_path:
+            return None
+        img = self.thumbs.thumbnail(item.image_path)
+        return ImageTk.PhotoImage(img) if img is not None else None
+
     # ---------------- FAVORITES (SAVE + VIEW PANEL) ----------------
     def _save_favorite(self):
         if not hasattr(self, "current_outfit"):
             messagebox.showwarning("No outfit", "Pick an outfit first!")
             return
 
+        if self._still_loading():
+            return
         name = self.favorite_name_entry.get().strip()
         self.closet.add_favorite(self.current_outfit, name)
         self.favorite_name_entry.delete(0, tk.END)
-        self._refresh_favorites()
+        self.favorites_listbox.row_inserted(len(self.closet.favorites) - 1)
 
     def _refresh_favorites(self):
-        # rebuild listbox of saved outfits
-        self.favorites_listbox.delete(0, tk.END)
-        for fav in self.closet.favorites:
-            self.favorites_listbox.insert(tk.END, fav.get("label", "Favorite"))
-
-    def _on_select_favorite(self, event):
-        selection = self.favorites_listbox.curselection()
-        if not selection:
+        self.favorites_listbox.refresh()
+
+    def _on_select_favorite(self, idx):
+        if idx is None:
             empty = {
                 "Top": None,
                 "Bottom": None,
@@ -617,70 +993,97 @@ class OutfitApp:
             self._update_favorite_preview(empty)
             return
 
-        idx = selection[0]
         fav = self.closet.favorites[idx]
-        outfit_data = fav.get("outfit", {})
-
-        # convert dicts back to ClothingItem for preview
-        outfit_items = {}
-        for cat in ["Top", "Bottom", "Dress", "Shoes", "Accessory"]:
-            data = outfit_data.get(cat)
-            outfit_items[cat] = ClothingItem.from_dict(data) if data else None
+        outfit_items = self.closet.resolve_favorite(fav)
+        refs = fav.get("outfit", {})
 
         # update text labels
         for cat, lbl in self.favorite_detail_labels.items():
             item = outfit_items.get(cat)
-            lbl.config(text=str(item) if item else "(none)")
+            if item:
+                lbl.config(text=str(item))
+            elif refs.get(cat) is not None:
+                lbl.config(text="(removed from closet)")
+            else:
+                lbl.config(text="(none)")
 
         # update stacked images
         self._update_favorite_preview(outfit_items)
+        self._prerender_favorites([idx - 1, idx + 1])
 
     def _update_favorite_preview(self, outfit_items: dict):
         # outfit_items: dict with ClothingItem or None
-        for key in self.favorite_images:
-            self.favorite_images[key] = None
-        for canvas in self.favorite_preview_canvases.values():
-            canvas.delete("all")
-
-        top_or_dress_item = outfit_items.get("Dress") or outfit_items.get("Top")
-        bottom_item = outfit_items.get("Bottom")
-        shoes_item = outfit_items.get("Shoes")
-        accessory_item = outfit_items.get("Accessory")
+        self.favorite_image = ImageTk.PhotoImage(self.composites.image(outfit_items))
+        self.favorite_preview.config(image=self.favorite_image)
+
+    def _prerender_favorites(self, indexes):
+        """Render favorites in the background so arrowing to them is instant."""
+        for idx in indexes:
+            if 0 <= idx < len(self.closet.favorites):
+                outfit_items = self.closet.resolve_favorite(self.closet.favorites[idx])
+                self.render_pool.submit(self.composites.image, outfit_items)
+
+    # ---------------- FAVORITES GALLERY ----------------
+    def _open_gallery(self):
+        favorites = list(self.closet.favorites)
+        if not favorites:
+            messagebox.showinfo("Gallery", "No saved outfits yet.")
+            return
 
-        def load_img(item):
-            if not item or not item.image_path:
-                return None
-            if not os.path.exists(item.image_path):
-                return None
+        window = tk.Toplevel(self.root, bg=self.bg_main)
+        window.title("Saved Outfits Gallery")
+        canvas = tk.Canvas(window, bg=self.bg_main, highlightthickness=0,
+                           width=GALLERY_COLUMNS * (GALLERY_TILE[0] + 16), height=600)
+        scrollbar = tk.Scrollbar(window, orient="vertical", command=canvas.yview)
+        canvas.configure(yscrollcommand=scrollbar.set)
+        canvas.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        grid = tk.Frame(canvas, bg=self.bg_main)
+        canvas.create_window(0, 0, window=grid, anchor="nw")
+        grid.bind("<Configure>",
+                  lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
+        canvas.bind("<MouseWheel>",
+                    lambda e: canvas.yview_scroll(-1 if e.delta > 0 else 1, "units"))
+
+        cells = []
+        for n, fav in enumerate(favorites):
+            cell = tk.Label(
+                grid, text=fav.get("label", "Favorite"), compound="top",
+                wraplength=GALLERY_TILE[0], bg=self.bg_panel,
+                font=("Comic Sans MS", 8)
+            )
+            cell.grid(row=n // GALLERY_COLUMNS, column=n % GALLERY_COLUMNS,
+                      padx=6, pady=6)
+            cell.bind("<Button-1>", lambda e, idx=n: self.favorites_listbox.select(idx))
+            cells.append(cell)
+
+        # render off the Tk thread; only PhotoImages are made here
+        outfits = [self.closet.resolve_favorite(fav) for fav in favorites]
+        rendered = queue.Queue()
+        closed = threading.Event()
+        window.bind("<Destroy>", lambda e: e.widget is window and closed.set())
+        window.images = {}  # keep PhotoImages alive with the window
+
+        def render(n, outfit_items):
+            img = None
             try:
-                img = Image.open(item.image_path)
-                img = img.convert("RGBA")
-                img.thumbnail((200, 130))
-                return ImageTk.PhotoImage(img)
-            except Exception:
-                return None
-
-        self.favorite_images["TopOrDress"] = load_img(top_or_dress_item)
-        self.favorite_images["Bottom"] = load_img(bottom_item)
-        self.favorite_images["Shoes"] = load_img(shoes_item)
-        self.favorite_images["Accessory"] = load_img(accessory_item)
-
-        placeholders = {
-            "TopOrDress": "Top / Dress",
-            "Bottom": "Bottom",
-            "Shoes": "Shoes",
-            "Accessory": "Accessory",
-        }
-
-        for key, canvas in self.favorite_preview_canvases.items():
-            img = self.favorite_images[key]
+                if not closed.is_set():
+                    img = self.composites.image(outfit_items)
+                    img.thumbnail(GALLERY_TILE)
+            finally:
+                rendered.put((n, img))
+
+        for n, outfit_items in enumerate(outfits):
+            self.render_pool.submit(render, n, outfit_items)
+        self._poll_gallery(window, cells, rendered)
+
+    def _poll_gallery(self, window, cells, rendered):
+        if not window.winfo_exists():
+            return
+        while not rendered.empty():
+            n, img = rendered.get_nowait()
+            window.images[n] = img and ImageTk.PhotoImage(img)
             if img is not None:
-                canvas.create_image(100, 60, image=img)
-            else:
-                canvas.create_text(
-                    70,
-                    30,
-                    text=placeholders[key],
-                    font=("Comic Sans MS", 9),
-                    fill="#777777"
-                )
+                cells[n].config(image=window.images[n])
+        if len(window.images) < len(cells):
+            self.root.after(LOAD_POLL_MS, self._poll_gallery, window, cells, rendered)
@@ -0,0 +1,53 @@
+# bench_items.py
+#
+# Per-item memory of ClothingItem, compared with the old __dict__-based
+# class (plain attributes, no interning).
+#
+#   python bench_items.py          # 100k items
+import json
+import sys
+import tracemalloc
+
+from bench_storage import make_closet
+from clothing_item import ClothingItem
+
+
+class DictClothingItem:
+    """The original ClothingItem layout, kept here only for comparison."""
+
+    def __init__(self, name, category, color="", vibe="Any", image_path="", item_id=None):
+        self.name = name.strip()
+        self.category = category.strip()
+        self.color = color.strip()
+        self.vibe = vibe.strip() or "Any"
+        self.image_path = image_path.strip()
+        self.item_id = item_id
+
+    # same dict format as ClothingItem (the "id" key included)
+    from_dict = classmethod(ClothingItem.from_dict.__func__)
+
+
+def bytes_per_item(cls, text: str) -> float:
+    # parse inside the trace, like a real load: whatever strings the items
+    # keep alive (rather than share) are counted against them
+    tracemalloc.start()
+    items = [cls.from_dict(row) for row in json.loads(text)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size / len(items)
+
+
+def main(argv):
+    n = int(argv[0]) if argv else 100_000
+    text = json.dumps([item.to_dict() for item in make_closet(n).items])
+
+    before = bytes_per_item(DictClothingItem, text)
+    after = bytes_per_item(ClothingItem, text)
+    print(f"{n} items")
+    print(f"before (__dict__):          {before:7.1f} bytes/item")
+    print(f"after (__slots__, interned): {after:7.1f} bytes/item")
+    print(f"saved: {100 * (1 - after / before):.0f}%")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
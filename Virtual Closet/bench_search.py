@@ -0,0 +1,34 @@
+# bench_search.py
+#
+# Closet.search latency on a synthetic closet, as if typing each query
+# one letter at a time.
+#
+#   python bench_search.py          # 100k items
+import sys
+import time
+
+from bench_storage import make_closet
+
+QUERIES = ["cardigan", "pink tee", "baby blue going", "clip", "42"]
+
+
+def main(argv):
+    n = int(argv[0]) if argv else 100_000
+    closet = make_closet(n)
+
+    start = time.perf_counter()
+    closet.search("")  # builds the index
+    print(f"{n} items, index built in {time.perf_counter() - start:.2f} s")
+
+    for query in QUERIES:
+        worst = 0.0
+        for end in range(1, len(query) + 1):
+            start = time.perf_counter()
+            results = closet.search(query[:end])
+            worst = max(worst, time.perf_counter() - start)
+        print(f"{query!r:18} {len(results):7} results, "
+              f"slowest keystroke {worst * 1000:6.1f} ms")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,138 @@
+# bench_server.py
+#
+# Load test for outfit_server.py on localhost. Writes some synthetic
+# closets to a temp folder, starts the server on them in a subprocess and
+# hammers it with keep-alive clients: mostly outfits, some item searches
+# and a few new favorites. Prints requests/second and latency.
+#
+#   python bench_server.py [--closets 20] [--items 2000]
+#                          [--clients 50] [--seconds 10]
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from urllib.parse import quote
+
+from bench_storage import make_closet
+from storage import save_closet
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+QUERIES = ["pink", "tee", "baby", "cargo", "cl", "denim mini"]
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def pick_request(rng: random.Random, names: list) -> tuple:
+    name = rng.choice(names)
+    roll = rng.random()
+    if roll < 0.80:
+        return "GET", f"/closets/{name}/outfit?vibe=Casual", b""
+    if roll < 0.95:
+        return "GET", f"/closets/{name}/items?q={quote(rng.choice(QUERIES))}&limit=20", b""
+    # ids 1..3 always exist in the synthetic closets
+    body = json.dumps({"label": "load test", "outfit": {"Top": 1, "Shoes": 3}})
+    return "POST", f"/closets/{name}/favorites", body.encode()
+
+
+async def client(port: int, names: list, deadline: float, seed: int,
+                 latencies: list, errors: list):
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        while time.perf_counter() < deadline:
+            method, path, body = pick_request(rng, names)
+            start = time.perf_counter()
+            writer.write(
+                f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+                f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+            )
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.split(b"\r\n"):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":")[1])
+            payload = await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            if not head.startswith((b"HTTP/1.1 200", b"HTTP/1.1 201")):
+                errors.append(head.split(b"\r\n")[0] + b" " + payload[:200])
+    finally:
+        writer.close()
+
+
+async def wait_for_server(port: int, timeout: float = 10):
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            return
+        except OSError:
+            if time.perf_counter() > deadline:
+                raise
+            await asyncio.sleep(0.05)
+
+
+async def run_clients(port: int, names: list, clients: int, seconds: float):
+    await wait_for_server(port)
+    latencies, errors = [], []
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        client(port, names, start + seconds, seed, latencies, errors)
+        for seed in range(clients)
+    ))
+    return latencies, errors, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the outfit service.")
+    parser.add_argument("--closets", type=int, default=20)
+    parser.add_argument("--items", type=int, default=2000)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--max-closets", type=int, default=64,
+                        help="server LRU size (smaller than --closets forces evictions)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        names = [f"user{i}" for i in range(args.closets)]
+        for i, name in enumerate(names):
+            save_closet(make_closet(args.items, seed=i, favorites=5),
+                        os.path.join(tmp, name + ".json"))
+
+        port = free_port()
+        server = subprocess.Popen(
+            [sys.executable, os.path.join(HERE, "outfit_server.py"), "--dir", tmp,
+             "--port", str(port), "--max-closets", str(args.max_closets)],
+            stdout=subprocess.DEVNULL,
+        )
+        try:
+            latencies, errors, elapsed = asyncio.run(
+                run_clients(port, names, args.clients, args.seconds)
+            )
+        finally:
+            server.terminate()
+            server.wait()
+
+    latencies.sort()
+    count = len(latencies)
+    print(f"{args.closets} closets x {args.items} items, {args.clients} clients")
+    print(f"{count} requests in {elapsed:.1f}s: {count / elapsed:,.0f} req/s")
+    if count:
+        for label, q in (("p50", 0.50), ("p90", 0.90), ("p99", 0.99)):
+            print(f"  {label}: {latencies[min(count - 1, int(q * count))] * 1000:.1f} ms")
+    if errors:
+        print(f"{len(errors)} errors, e.g. {errors[0].decode(errors='replace')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# bench_storage.py
+#
+# Compare the JSON and SQLite closet backends on a synthetic closet.
+#
+#   python bench_storage.py            # 100k items
+#   python bench_storage.py 20000
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from clothing_item import ClothingItem
+from closet_model import Closet, CATEGORIES, VIBES
+from sqlite_storage import SqliteStore
+from storage import JsonStore
+
+COLORS = ["black", "white", "pink", "baby blue", "lilac", "denim", "silver",
+          "red", "cream", "leopard", ""]
+NAMES = ["tee", "cardigan", "mini skirt", "cargo pants", "platforms",
+         "baguette bag", "slip dress", "hoodie", "sneakers", "butterfly clip"]
+
+
+def make_closet(n: int, seed: int = 0, favorites: int = 0) -> Closet:
+    """Synthetic closet with n random items (and some favorite outfits)."""
+    rng = random.Random(seed)
+    closet = Closet()
+    for i in range(n):
+        closet.restore_item(ClothingItem(
+            name=f"{rng.choice(NAMES)} {i}",
+            category=rng.choice(CATEGORIES),
+            color=rng.choice(COLORS),
+            vibe=rng.choice(VIBES),
+            image_path=f"photos/item_{i}.png",
+        ))
+    for i in range(favorites):
+        closet.add_favorite(closet.random_outfit(rng.choice(VIBES)), f"fav {i}")
+    return closet
+
+
+def measure(fn):
+    """Run fn once; return (result, seconds, peak traced MiB)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / (1024 * 1024)
+
+
+def main(argv):
+    n = int(argv[0]) if argv else 100_000
+    closet = make_closet(n, favorites=100)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        stores = {
+            "json": JsonStore(os.path.join(tmp, "closet.json")),
+            "sqlite": SqliteStore(os.path.join(tmp, "closet.db")),
+        }
+        print(f"{n} items")
+        print(f"{'backend':8} {'save s':>8} {'load s':>8} {'load MiB':>9} "
+              f"{'query ms':>9} {'size MiB':>9}")
+        for name, store in stores.items():
+            closet.needs_checkpoint = True
+            _, save_s, _ = measure(lambda: store.save(closet))
+            loaded, load_s, load_mib = measure(store.load)
+            assert len(loaded.items) == n
+
+            if name == "sqlite":
+                query = lambda: store.items_by_category_and_vibe("Top", "Comfy")
+            else:
+                query = lambda: loaded.get_items_by_category_and_vibe("Top", "Comfy")
+            start = time.perf_counter()
+            query()
+            query_ms = (time.perf_counter() - start) * 1000
+
+            size_mib = os.path.getsize(store.path) / (1024 * 1024)
+            print(f"{name:8} {save_s:8.2f} {load_s:8.2f} {load_mib:9.1f} "
+                  f"{query_ms:9.1f} {size_mib:9.1f}")
+            store.close()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
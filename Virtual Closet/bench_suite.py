@@ -0,0 +1,224 @@
+# bench_suite.py
+#
+# Benchmarks for the closet model and storage on synthetic closets of 1k,
+# 10k and 100k items:
+#   - JSON and SQLite save/load time, load peak memory, file size
+#   - random_outfit throughput (uniform and avoid_recent)
+#   - favorite serialization and resolve_favorite throughput
+#   - thumbnail throughput, cold and cached (needs PIL)
+#
+# Results go to a JSON file; --compare prints the change against an
+# earlier run.
+#
+#   python bench_suite.py [--sizes 1000,10000,100000] [-o results.json]
+#                         [--compare old_results.json]
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+from bench_storage import make_closet, measure
+from closet_model import Closet
+from sqlite_storage import SqliteStore
+from storage import JsonStore
+
+# next to this script, whatever folder it is run from
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_results")
+FAVORITES = 1000
+THUMBNAILS = 40
+MIN_SECONDS = 0.5  # run each throughput loop at least this long
+
+
+def rate(fn, min_runs: int = 5) -> float:
+    """Calls of fn per second."""
+    runs = 0
+    start = time.perf_counter()
+    while runs < min_runs or time.perf_counter() - start < MIN_SECONDS:
+        fn()
+        runs += 1
+    return runs / (time.perf_counter() - start)
+
+
+def bench_storage(closet: Closet, tmp: str) -> dict:
+    results = {}
+    stores = {
+        "json": JsonStore(os.path.join(tmp, "closet.json")),
+        "sqlite": SqliteStore(os.path.join(tmp, "closet.db")),
+    }
+    for name, store in stores.items():
+        closet.needs_checkpoint = True
+        _, save_s, save_mib = measure(lambda: store.save(closet))
+        loaded, load_s, load_mib = measure(store.load)
+        assert len(loaded) == len(closet)
+
+        # one edit, then an incremental save (journal append / one INSERT)
+        loaded.add_favorite(loaded.random_outfit(), "bench")
+        _, incr_s, _ = measure(lambda: store.save(loaded))
+
+        results[name] = {
+            "save_s": save_s,
+            "save_peak_mib": save_mib,
+            "load_s": load_s,
+            "load_peak_mib": load_mib,
+            "incremental_save_s": incr_s,
+            "file_mib": os.path.getsize(store.path) / (1024 * 1024),
+        }
+        store.close()
+    return results
+
+
+def bench_outfits(closet: Closet) -> dict:
+    rng = random.Random(0)
+    today = date(2026, 1, 1)
+    for k in range(30):  # some history so weights aren't all 1
+        day = today - timedelta(days=k)
+        closet.wear_outfit(closet.random_outfit(rng=rng), day)
+    closet.random_outfit(avoid_recent=True, today=today)  # build the picker
+
+    return {
+        "uniform_per_s": rate(lambda: closet.random_outfit("Casual", rng=rng)),
+        "avoid_recent_per_s": rate(
+            lambda: closet.random_outfit("Casual", rng=rng, avoid_recent=True, today=today)
+        ),
+    }
+
+
+def bench_favorites(closet: Closet) -> dict:
+    rng = random.Random(1)
+    for i in range(FAVORITES):
+        closet.add_favorite(closet.random_outfit(rng=rng), f"fav {i}")
+    favorites = closet.favorites
+
+    text = json.dumps(favorites)
+
+    def reload():
+        fresh = Closet()
+        for fav in json.loads(text):
+            fresh.restore_favorite(fav)
+
+    return {
+        "count": len(favorites),
+        "dump_per_s": rate(lambda: json.dumps(favorites)),
+        "load_per_s": rate(reload),
+        "resolve_per_s": rate(lambda: closet.resolve_favorite(rng.choice(favorites))),
+        "json_kib": len(text) / 1024,
+    }
+
+
+def bench_thumbnails(tmp: str) -> dict:
+    try:
+        from PIL import Image
+        from image_cache import ThumbnailCache
+    except ImportError:
+        return {"skipped": "PIL is not installed"}
+
+    rng = random.Random(2)
+    photos = []
+    for i in range(THUMBNAILS):
+        path = os.path.join(tmp, f"photo_{i}.png")
+        color = tuple(rng.randrange(256) for _ in range(3))
+        Image.new("RGB", (900, 1200), color).save(path)
+        photos.append(path)
+
+    cache = ThumbnailCache(os.path.join(tmp, "thumbs"))
+    start = time.perf_counter()
+    for path in photos:
+        cache.thumbnail(path)
+    cold = len(photos) / (time.perf_counter() - start)
+    warm = rate(lambda: [cache.thumbnail(path) for path in photos]) * len(photos)
+    return {"cold_per_s": cold, "cached_per_s": warm}
+
+
+def run(sizes: list) -> dict:
+    results = {}
+    for n in sizes:
+        print(f"{n} items...", flush=True)
+        with tempfile.TemporaryDirectory() as tmp:
+            closet, build_s, _ = measure(lambda: make_closet(n))
+            results[str(n)] = {
+                "build_s": build_s,
+                "storage": bench_storage(closet, tmp),
+                "outfits": bench_outfits(closet),
+                "favorites": bench_favorites(closet),
+            }
+    with tempfile.TemporaryDirectory() as tmp:
+        results["thumbnails"] = bench_thumbnails(tmp)
+    return results
+
+
+def metadata() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    }
+
+
+def flatten(results: dict, prefix: str = "") -> dict:
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, name + "."))
+        elif isinstance(value, (int, float)):
+            flat[name] = value
+    return flat
+
+
+def compare(old: dict, new: dict):
+    """Print each metric with its change; higher is better for *_per_s."""
+    old_flat, new_flat = flatten(old["results"]), flatten(new["results"])
+    print(f"\nvs {old['meta'].get('commit') or 'old run'} ({old['meta'].get('date', '?')})")
+    print(f"{'metric':48} {'old':>12} {'new':>12} {'change':>8}")
+    for name, value in new_flat.items():
+        before = old_flat.get(name)
+        if before is None:
+            continue
+        change = (value - before) / before * 100 if before else 0.0
+        better = change > 0 if name.endswith("_per_s") else change < 0
+        flag = " " if abs(change) < 5 else ("+" if better else "!")
+        print(f"{name:48} {before:12.4g} {value:12.4g} {change:+7.1f}% {flag}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Closet benchmarks.")
+    parser.add_argument("--sizes", default="1000,10000,100000",
+                        help="comma-separated closet sizes")
+    parser.add_argument("-o", "--output", help=f"results file (default: {RESULTS_DIR}/<date>.json)")
+    parser.add_argument("--compare", help="earlier results file to compare with")
+    args = parser.parse_args(argv)
+
+    sizes = [int(n) for n in args.sizes.split(",")]
+    report = {"meta": metadata(), "results": run(sizes)}
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, time.strftime("%Y%m%d-%H%M%S") + ".json")
+    if os.path.dirname(output):
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"wrote {output}")
+
+    for name, value in flatten(report["results"]).items():
+        print(f"  {name:48} {value:12.4g}")
+    if args.compare:
+        with open(args.compare, "r") as f:
+            compare(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,102 @@
+# bulk_import.py
+#
+# Turn a folder of clothing photos into closet items. The category comes
+# from the subfolder names ("closet/jeans/blue.png" -> Bottom), the name
+# from the file name, and thumbnails are made in a process pool so a few
+# hundred photos don't take minutes.
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+from closet_model import CATEGORIES
+from clothing_item import ClothingItem
+from image_cache import THUMB_DIR, make_thumbnail
+
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".gif", ".webp", ".bmp"}
+
+# folder-name words -> category
+CATEGORY_WORDS = {
+    "Top": ["top", "tops", "shirt", "shirts", "tee", "tees", "tshirt", "blouse",
+            "blouses", "tank", "tanks", "sweater", "sweaters", "hoodie", "hoodies",
+            "cardigan", "jacket", "jackets", "coat", "coats", "crop"],
+    "Bottom": ["bottom", "bottoms", "pants", "trousers", "jeans", "skirt", "skirts",
+               "shorts", "leggings", "cargos", "joggers"],
+    "Dress": ["dress", "dresses", "jumpsuit", "jumpsuits", "romper", "rompers"],
+    "Shoes": ["shoe", "shoes", "sneakers", "trainers", "boots", "heels", "sandals",
+              "platforms", "flats", "footwear"],
+    "Accessory": ["accessory", "accessories", "bag", "bags", "purse", "purses",
+                  "jewelry", "jewellery", "necklace", "earrings", "hat", "hats",
+                  "belt", "belts", "sunglasses", "scarf", "scarves"],
+}
+_category_of = {word: cat for cat, words in CATEGORY_WORDS.items() for word in words}
+_word_re = re.compile(r"[a-z]+")
+
+
+def guess_category(rel_dir: str) -> str:
+    """Category for a photo in rel_dir; the deepest recognised folder wins."""
+    for part in reversed(rel_dir.replace("\\", "/").split("/")):
+        for word in _word_re.findall(part.lower()):
+            if word in _category_of:
+                return _category_of[word]
+    return CATEGORIES[0]
+
+
+def item_name(filename: str) -> str:
+    """'pink_baby-tee.png' -> 'Pink baby tee'."""
+    stem = os.path.splitext(filename)[0]
+    name = " ".join(re.split(r"[\s_\-.]+", stem)).strip()
+    return name[:1].upper() + name[1:] if name else stem
+
+
+def find_photos(folder: str, skip_paths=()) -> list:
+    """
+    New photos under folder as ClothingItems (no id yet), sorted by path.
+    Images whose path is in skip_paths (already in the closet) are left out.
+    """
+    skip = {os.path.abspath(p) for p in skip_paths}
+    items = []
+    for dirpath, dirnames, filenames in os.walk(folder):
+        dirnames.sort()
+        category = guess_category(os.path.relpath(dirpath, folder))
+        for filename in sorted(filenames):
+            if os.path.splitext(filename)[1].lower() not in IMAGE_EXTENSIONS:
+                continue
+            path = os.path.abspath(os.path.join(dirpath, filename))
+            if path in skip:
+                continue
+            items.append(ClothingItem(
+                name=item_name(filename), category=category, image_path=path
+            ))
+    return items
+
+
+def import_folder(folder: str, skip_paths=(), workers: int | None = None,
+                  on_progress=None, thumb_dir: str = THUMB_DIR):
+    """
+    Scan folder and make the thumbnails of its photos in parallel.
+
+    Returns (items, thumbs, skipped): the items whose photo could be read,
+    the (cache key, hash) of their thumbnails for ThumbnailCache.add, and
+    the paths of photos that couldn't be read. Nothing is added to a
+    closet here, so this can run off the GUI thread. on_progress(done,
+    total) is called after each photo.
+    """
+    found = find_photos(folder, skip_paths)
+    items, thumbs, skipped = [], [], []
+    if on_progress:
+        on_progress(0, len(found))
+    if not found:
+        return items, thumbs, skipped
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        made = pool.map(make_thumbnail, [item.image_path for item in found],
+                        [thumb_dir] * len(found), chunksize=8)
+        for done, (item, thumb) in enumerate(zip(found, made), 1):
+            if thumb is None:
+                skipped.append(item.image_path)
+            else:
+                items.append(item)
+                thumbs.append(thumb)
+            if on_progress:
+                on_progress(done, len(found))
+    return items, thumbs, skipped
@@ -0,0 +1,94 @@
+# closet_cli.py
+#
+# Headless outfit generation: no Tk, no PIL, so it starts fast and can
+# run on a server. Generates outfits for any number of closet files (JSON
+# or SQLite) in parallel and prints one JSON object per closet (JSON
+# Lines), in the order the files were given.
+#
+#   python closet_cli.py [-n 3] [--vibe Casual] [--no-accessory]
+#                        [--seed 42] [--workers 4] closet.json other.db ...
+import argparse
+import json
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from closet_model import OUTFIT_SLOTS, VIBES
+from storage import open_store
+
+
+def outfit_to_dict(outfit: dict) -> dict:
+    return {
+        slot: outfit[slot].to_dict() if outfit.get(slot) else None
+        for slot in OUTFIT_SLOTS
+    }
+
+
+def generate(path: str, count: int = 1, vibe: str | None = None,
+             include_accessory: bool = True, seed=None) -> dict:
+    """
+    Load one closet and pick count outfits from it.
+    With a seed, the same closet file always gets the same outfits.
+    """
+    if not os.path.exists(path):
+        return {"closet": path, "error": "no such file"}
+    try:
+        # read-only: a damaged closet is reported, never repaired or moved
+        store = open_store(path, readonly=True)
+    except Exception as e:
+        return {"closet": path, "error": f"{type(e).__name__}: {e}"}
+    try:
+        closet = store.load()
+    except Exception as e:  # a bad file shouldn't stop the batch
+        return {"closet": path, "error": f"{type(e).__name__}: {e}"}
+    finally:
+        store.close()
+
+    rng = random.Random(None if seed is None else f"{seed}:{path}")
+    outfits = [
+        outfit_to_dict(closet.random_outfit(vibe, include_accessory, rng))
+        for _ in range(count)
+    ]
+    return {"closet": path, "items": len(closet), "outfits": outfits}
+
+
+def _generate_job(args: tuple) -> dict:
+    return generate(*args)
+
+
+def run(paths: list, count: int = 1, vibe: str | None = None,
+        include_accessory: bool = True, seed=None, workers: int | None = None):
+    """Yield generate() results for paths, in order, using a process pool."""
+    jobs = [(path, count, vibe, include_accessory, seed) for path in paths]
+    if workers == 1 or len(jobs) == 1:
+        yield from map(_generate_job, jobs)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(_generate_job, jobs)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Generate outfits from closet files and print them as JSON lines."
+    )
+    parser.add_argument("closets", nargs="+", help="closet .json / .db files")
+    parser.add_argument("-n", "--count", type=int, default=1,
+                        help="outfits per closet (default 1)")
+    parser.add_argument("--vibe", choices=VIBES, default="Any")
+    parser.add_argument("--no-accessory", action="store_true")
+    parser.add_argument("--seed", help="make the outfits repeatable")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="processes to use (default: one per CPU)")
+    args = parser.parse_args(argv)
+
+    failed = 0
+    for result in run(args.closets, args.count, args.vibe,
+                      not args.no_accessory, args.seed, args.workers):
+        failed += "error" in result
+        print(json.dumps(result), flush=True)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,10 @@
 # closet_model.py
 import random
+from datetime import date
 from clothing_item import ClothingItem
+from rotation import RotationPicker
+from search_index import SearchIndex
+from wear_history import WearHistory
 
 # Now includes Dress
 CATEGORIES = ["Top", "Bottom", "Shoes", "Accessory", "Dress"]
@@ -15,16 +19,143 @@ VIBES = [
     "Game Day",
 ]
 
+# keys of an outfit dict (see Closet.random_outfit)
+OUTFIT_SLOTS = ["Top", "Bottom", "Dress", "Shoes", "Accessory"]
+
 
 class Closet:
     """Holds all clothing items and handles outfit generation."""
 
     def __init__(self):
         self.items = []      # list of ClothingItem
-        self.favorites = []  # list of dicts
+        self.favorites = []  # list of dicts: {"label", "outfit": {cat: item id}}
+        self.next_id = 1     # ids are never reused, favorites may outlive items
+        self._by_id = {}     # item id -> ClothingItem
+
+        # Changes made since the last save, as journal entries (dicts).
+        # storage.save_closet appends these instead of rewriting everything.
+        self.pending_changes = []
+        # True when the on-disk snapshot can't be trusted to match this
+        # closet (new closet, migrated data...) and a full write is needed.
+        self.needs_checkpoint = True
+        # True if old-format data was converted while loading
+        self.migrated = False
+        self._legacy_lookup = None  # see restore_favorite
+        # True while a background load (storage.ClosetStream) is still
+        # adding items; everything works on the items loaded so far
+        self.loading = False
+        # built on the first search(), then kept up to date item by item
+        self._search_index = None
+        # which days items were worn (see wear_outfit)
+        self.wear_history = WearHistory()
+        # built on the first random_outfit(avoid_recent=True), kept up to date
+        self._picker = None
+
+    def __iter__(self):
+        # list iteration also picks up items appended while it runs, so a
+        # consumer can start before a background load is done
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
 
     def add_item(self, item: ClothingItem):
+        self.restore_item(item)
+        self.pending_changes.append({"op": "add", "item": item.to_dict()})
+
+    def restore_item(self, item: ClothingItem):
+        """Add an item that is already saved (no journal entry)."""
+        if item.item_id is None or item.item_id in self._by_id:
+            item.item_id = self.next_id
+        self.next_id = max(self.next_id, item.item_id + 1)
         self.items.append(item)
+        self._by_id[item.item_id] = item
+        self._legacy_lookup = None
+        if self._search_index is not None:
+            self._search_index.add(item.item_id, _search_text(item))
+        if self._picker is not None:
+            self._picker.add(item)
+
+    def update_item(self, index: int, item: ClothingItem):
+        """Replace the item at index; the replacement keeps its id."""
+        self._replace(index, item)
+        self.pending_changes.append({"op": "update", "item": item.to_dict()})
+
+    def remove_item(self, index: int):
+        item = self._pop(index)
+        self.pending_changes.append({"op": "delete", "id": item.item_id})
+
+    def _replace(self, index: int, item: ClothingItem):
+        item.item_id = self.items[index].item_id
+        self.items[index] = item
+        self._by_id[item.item_id] = item
+        self._legacy_lookup = None
+        if self._search_index is not None:
+            self._search_index.remove(item.item_id)
+            self._search_index.add(item.item_id, _search_text(item))
+        if self._picker is not None:
+            self._picker.remove(item.item_id)
+            self._picker.add(item)
+
+    def _pop(self, index: int) -> ClothingItem:
+        item = self.items.pop(index)
+        del self._by_id[item.item_id]
+        self._legacy_lookup = None
+        if self._search_index is not None:
+            self._search_index.remove(item.item_id)
+        if self._picker is not None:
+            self._picker.remove(item.item_id)
+        self.wear_history.remove(item.item_id)
+        return item
+
+    def merge_items(self, keep_id: int, duplicate_ids: list):
+        """
+        Fold duplicates into one item: favorites that used any of
+        duplicate_ids now use keep_id, and the duplicates are removed.
+        """
+        self._merge(keep_id, duplicate_ids)
+        self.pending_changes.append(
+            {"op": "merge", "keep": keep_id, "ids": list(duplicate_ids)}
+        )
+
+    def _merge(self, keep_id: int, duplicate_ids: list):
+        dupes = set(duplicate_ids) - {keep_id}
+        for fav in self.favorites:
+            outfit = fav.get("outfit", {})
+            for cat, ref in outfit.items():
+                if ref in dupes:
+                    outfit[cat] = keep_id
+        self.wear_history.merge(keep_id, dupes)
+        if self._picker is not None:
+            self._picker.update(keep_id)
+        for item_id in dupes:
+            if item_id in self._by_id:
+                self._pop(self.index_of(item_id))
+
+    def get_item(self, item_id: int | None):
+        """Item with this id, or None (also for ids of deleted items)."""
+        return self._by_id.get(item_id)
+
+    def index_of(self, item_id: int) -> int:
+        return self.items.index(self._by_id[item_id])
+
+    def enable_search(self):
+        """Build the search index now; it's kept up to date from then on."""
+        if self._search_index is None:
+            self._search_index = SearchIndex()
+            for item in self.items:
+                self._search_index.add(item.item_id, _search_text(item))
+
+    def search(self, query: str, limit: int | None = None) -> list:
+        """
+        Items whose name, color, category or vibe contain every word of
+        query (as a prefix or anywhere in a word). Prefix matches first.
+        """
+        self.enable_search()
+        ids = self._search_index.search(query)
+        if limit is not None:
+            ids = ids[:limit]
+        return [self._by_id[item_id] for item_id in ids]
 
     def get_items_by_category_and_vibe(self, category: str, vibe: str | None):
         """Return all items for a category filtered by vibe."""
@@ -36,7 +167,9 @@ class Closet:
             if item.category == category and (item.vibe == vibe or item.vibe == "Any")
         ]
 
-    def random_outfit(self, vibe: str | None = None, include_accessory: bool = True):
+    def random_outfit(self, vibe: str | None = None, include_accessory: bool = True,
+                      rng: random.Random | None = None, avoid_recent: bool = False,
+                      today: date | None = None):
         """
         Build a random outfit.
 
@@ -44,7 +177,11 @@ class Closet:
         - "Top", "Bottom", "Dress", "Shoes", "Accessory"
 
         If a Dress is chosen, Top and Bottom will be None.
+        rng: a random.Random to draw from (for repeatable outfits).
+        avoid_recent: make items worn in the last couple of weeks (as of
+        today) less likely, see rotation.py.
         """
+        rng = rng or random
         outfit = {
             "Top": None,
             "Bottom": None,
@@ -53,51 +190,182 @@ class Closet:
             "Accessory": None,
         }
 
-        shoes = self.get_items_by_category_and_vibe("Shoes", vibe)
-        outfit["Shoes"] = random.choice(shoes) if shoes else None
+        if avoid_recent:
+            picker = self._rotation_picker((today or date.today()).toordinal())
 
-        if include_accessory:
-            acc = self.get_items_by_category_and_vibe("Accessory", vibe)
-            outfit["Accessory"] = random.choice(acc) if acc else None
+            def has(category):
+                return picker.count(category, vibe) > 0
+
+            def pick(category):
+                return self._by_id.get(picker.choose(category, vibe, rng))
+        else:
+            candidates = {}
+
+            def has(category):
+                if category not in candidates:
+                    candidates[category] = self.get_items_by_category_and_vibe(category, vibe)
+                return bool(candidates[category])
+
+            def pick(category):
+                return rng.choice(candidates[category]) if has(category) else None
 
-        dresses = self.get_items_by_category_and_vibe("Dress", vibe)
-        tops = self.get_items_by_category_and_vibe("Top", vibe)
-        bottoms = self.get_items_by_category_and_vibe("Bottom", vibe)
+        outfit["Shoes"] = pick("Shoes")
+
+        if include_accessory:
+            outfit["Accessory"] = pick("Accessory")
 
         use_dress = False
-        if dresses and (not tops or not bottoms):
+        if has("Dress") and (not has("Top") or not has("Bottom")):
             use_dress = True
-        elif dresses and tops and bottoms:
-            use_dress = random.choice([True, False])
+        elif has("Dress") and has("Top") and has("Bottom"):
+            use_dress = rng.choice([True, False])
 
         if use_dress:
-            outfit["Dress"] = random.choice(dresses)
+            outfit["Dress"] = pick("Dress")
         else:
-            outfit["Top"] = random.choice(tops) if tops else None
-            outfit["Bottom"] = random.choice(bottoms) if bottoms else None
+            outfit["Top"] = pick("Top")
+            outfit["Bottom"] = pick("Bottom")
 
         return outfit
 
+    def _rotation_picker(self, today: int) -> RotationPicker:
+        if self._picker is None:
+            self._picker = RotationPicker(self.wear_history, today)
+            for item in self.items:
+                self._picker.add(item)
+        else:
+            self._picker.set_today(today)
+        return self._picker
+
+    # ---------------- wear history ----------------
+    def wear_outfit(self, outfit: dict, day: date | None = None):
+        """Record that the items of outfit were worn on day (default today)."""
+        ids = [item.item_id for item in outfit.values() if item is not None]
+        day = (day or date.today()).toordinal()
+        self._record_wear(ids, day)
+        self.pending_changes.append({"op": "wear", "ids": ids, "day": day})
+
+    def _record_wear(self, ids: list, day: int):
+        for item_id in ids:
+            if item_id in self._by_id:
+                self.wear_history.record(item_id, day)
+                if self._picker is not None:
+                    self._picker.update(item_id)
+
+    def restore_wear(self, worn: dict):
+        """Load a saved wear history ({item id: [times worn, day, ...]})."""
+        for key, (count, *days) in worn.items():
+            item_id = int(key)
+            if item_id in self._by_id:
+                self.wear_history.restore(item_id, count, days)
+                if self._picker is not None:
+                    self._picker.update(item_id)
+
     def add_favorite(self, outfit: dict, name: str = ""):
         fav = {
             "label": name or "Favorite outfit",
             "outfit": {
-                cat: item.to_dict() if item else None
+                cat: item.item_id if item else None
                 for cat, item in outfit.items()
             }
         }
         self.favorites.append(fav)
+        self.pending_changes.append({"op": "favorite", "favorite": fav})
+
+    def resolve_favorite(self, fav: dict) -> dict:
+        """
+        Outfit dict of ClothingItem (or None) for a saved favorite.
+        Items deleted since the favorite was saved come back as None.
+        """
+        outfit = fav.get("outfit", {})
+        return {cat: self.get_item(outfit.get(cat)) for cat in OUTFIT_SLOTS}
+
+    def apply_change(self, change: dict):
+        """Replay one journal entry (without recording it again)."""
+        op = change["op"]
+        if op == "add":
+            self.migrated = self.migrated or "id" not in change["item"]
+            self.restore_item(ClothingItem.from_dict(change["item"]))
+        elif op == "update":
+            item = ClothingItem.from_dict(change["item"])
+            index = (change["index"] if "index" in change  # old journals
+                     else self.index_of(item.item_id))
+            self._replace(index, item)
+        elif op == "delete":
+            index = (change["index"] if "index" in change
+                     else self.index_of(change["id"]))
+            self._pop(index)
+        elif op == "favorite":
+            self.restore_favorite(change["favorite"])
+        elif op == "merge":
+            self._merge(change["keep"], change["ids"])
+        elif op == "wear":
+            self._record_wear(change["ids"], change["day"])
+        else:
+            raise ValueError(f"Unknown change: {op!r}")
+
+    def mark_saved(self):
+        """Forget pending changes once they are safely on disk."""
+        self.pending_changes = []
+        self.needs_checkpoint = False
+        self.migrated = False
 
     def to_dict(self) -> dict:
         return {
             "items": [item.to_dict() for item in self.items],
             "favorites": self.favorites,
+            "next_id": self.next_id,
+            "worn": self.wear_history.to_dict(),
         }
 
     @classmethod
     def from_dict(cls, data: dict):
         closet = cls()
+        closet.next_id = data.get("next_id", 1)
         for item_data in data.get("items", []):
-            closet.add_item(ClothingItem.from_dict(item_data))
-        closet.favorites = data.get("favorites", [])
+            closet.migrated = closet.migrated or "id" not in item_data
+            closet.restore_item(ClothingItem.from_dict(item_data))
+        for fav in data.get("favorites", []):
+            closet.restore_favorite(fav)
+        closet.restore_wear(data.get("worn", {}))
         return closet
+
+    def restore_favorite(self, fav: dict):
+        """
+        Add a favorite that is already saved (no journal entry).
+
+        Older closet files stored full item dicts in favorites. Those are
+        swapped for the id of the matching closet item; an item that is no
+        longer in the closet gets a fresh id that resolves to None (deleted).
+        """
+        outfit = fav.get("outfit", {})
+        if not any(isinstance(ref, dict) for ref in outfit.values()):
+            self.favorites.append(fav)
+            return
+
+        if self._legacy_lookup is None:
+            self._legacy_lookup = {}
+            for item in self.items:
+                self._legacy_lookup.setdefault(_item_key(item), item.item_id)
+
+        migrated = {}
+        for cat, ref in outfit.items():
+            if isinstance(ref, dict):
+                key = _item_key(ClothingItem.from_dict(ref))
+                if key not in self._legacy_lookup:
+                    self._legacy_lookup[key] = self.next_id
+                    self.next_id += 1
+                ref = self._legacy_lookup[key]
+            migrated[cat] = ref
+        self.migrated = True
+        self.favorites.append(
+            {"label": fav.get("label", "Favorite"), "outfit": migrated}
+        )
+
+
+def _search_text(item: ClothingItem) -> str:
+    return f"{item.name} {item.color} {item.category} {item.vibe}"
+
+
+def _item_key(item: ClothingItem) -> tuple:
+    return (item.name, item.category, item.color, item.vibe, item.image_path)
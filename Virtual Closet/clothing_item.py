@@ -1,22 +1,32 @@
 # clothing_item.py
+from sys import intern
+
 
 class ClothingItem:
     """Represents one item in the closet."""
 
+    # Closets can hold a lot of items: no per-item __dict__, and the
+    # category/vibe/color strings (a handful of distinct values) are
+    # interned so every item shares the same string objects.
+    __slots__ = ("name", "category", "color", "vibe", "image_path", "item_id")
+
     def __init__(
         self,
         name: str,
         category: str,
         color: str = "",
         vibe: str = "Any",
-        image_path: str = ""
+        image_path: str = "",
+        item_id: int | None = None
     ):
         self.name = name.strip()
         # Category can be: "Top", "Bottom", "Shoes", "Accessory", "Dress"
-        self.category = category.strip()
-        self.color = color.strip()
-        self.vibe = vibe.strip() or "Any"
+        self.category = intern(category.strip())
+        self.color = intern(color.strip())
+        self.vibe = intern(vibe.strip() or "Any")
         self.image_path = image_path.strip()
+        # stable id, handed out by the Closet (favorites refer to it)
+        self.item_id = item_id
 
     def __str__(self):
         parts = [self.name]
@@ -27,13 +37,16 @@ class ClothingItem:
         return " ".join(parts)
 
     def to_dict(self) -> dict:
-        return {
+        data = {
             "name": self.name,
             "category": self.category,
             "color": self.color,
             "vibe": self.vibe,
             "image_path": self.image_path,
         }
+        if self.item_id is not None:
+            data["id"] = self.item_id
+        return data
 
     @classmethod
     def from_dict(cls, data: dict):
@@ -43,4 +56,5 @@ class ClothingItem:
             color=data.get("color", ""),
             vibe=data.get("vibe", "Any"),
             image_path=data.get("image_path", ""),
+            item_id=data.get("id"),
         )
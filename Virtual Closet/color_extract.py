@@ -0,0 +1,173 @@
+# color_extract.py
+#
+# Guess an item's color from its photo: shrink the image, drop transparent
+# and white-background pixels, take the most common coarse color bin and
+# name it after the closest entry in COLOR_NAMES. Results are cached by
+# the file's content hash, so re-importing or renaming a photo is free.
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+from storage import DATA_DIR
+
+COLOR_CACHE_FILE = os.path.join(DATA_DIR, "colors.json")
+SAMPLE_SIZE = (64, 64)
+
+COLOR_NAMES = {
+    "black": (25, 25, 25),
+    "white": (245, 245, 245),
+    "grey": (128, 128, 128),
+    "silver": (192, 192, 200),
+    "red": (200, 30, 40),
+    "pink": (245, 150, 190),
+    "hot pink": (235, 50, 140),
+    "orange": (240, 130, 40),
+    "yellow": (245, 220, 70),
+    "green": (60, 150, 70),
+    "mint": (160, 225, 190),
+    "baby blue": (160, 200, 240),
+    "blue": (40, 90, 200),
+    "navy": (25, 35, 80),
+    "denim": (80, 110, 150),
+    "purple": (120, 60, 160),
+    "lilac": (200, 170, 230),
+    "brown": (110, 70, 40),
+    "beige": (225, 205, 170),
+    "cream": (250, 240, 215),
+}
+_names = list(COLOR_NAMES)
+_palette = np.array([COLOR_NAMES[name] for name in _names], dtype=np.float64)
+
+
+def file_hash(path: str) -> str:
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def dominant_rgb(img: Image.Image):
+    """Most common color of an image as an (r, g, b) tuple, or None."""
+    img = img.convert("RGBA")
+    img.thumbnail(SAMPLE_SIZE)
+    pixels = np.asarray(img).reshape(-1, 4)
+    rgb = pixels[pixels[:, 3] > 128, :3].astype(np.int32)
+    if not len(rgb):
+        return None
+
+    # product photos are mostly white background; ignore it unless the
+    # item itself is white
+    background = rgb.min(axis=1) > 235
+    if (~background).sum() > 0.05 * len(rgb):
+        rgb = rgb[~background]
+
+    # 3 bits per channel -> 512 bins; average the pixels of the biggest one
+    bins = rgb >> 5
+    codes = (bins[:, 0] << 6) | (bins[:, 1] << 3) | bins[:, 2]
+    top = np.bincount(codes, minlength=512).argmax()
+    return tuple(int(c) for c in rgb[codes == top].mean(axis=0).round())
+
+
+def color_name(rgb) -> str:
+    """Closest name in COLOR_NAMES ("redmean" weighted RGB distance)."""
+    r, g, b = rgb
+    rmean = (_palette[:, 0] + r) / 2
+    dr, dg, db = (_palette - np.array(rgb)).T
+    dist = (2 + rmean / 256) * dr ** 2 + 4 * dg ** 2 + (2 + (255 - rmean) / 256) * db ** 2
+    return _names[int(dist.argmin())]
+
+
+def dominant_color(image_path: str) -> str:
+    """Color name for a photo ("" if it can't be read)."""
+    try:
+        with Image.open(image_path) as img:
+            rgb = dominant_rgb(img)
+        return color_name(rgb) if rgb is not None else ""
+    except Exception:
+        return ""
+
+
+class ColorCache:
+    """{file content hash: color name}, saved as JSON."""
+
+    def __init__(self, path: str = COLOR_CACHE_FILE):
+        self.path = path
+        try:
+            with open(path, "r") as f:
+                self.colors = json.load(f)
+        except (OSError, ValueError):
+            self.colors = {}
+
+    def save(self):
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.colors, f)
+        os.replace(tmp, self.path)
+
+
+def _hash_or_none(path: str):
+    try:
+        return file_hash(path)
+    except OSError:
+        return None
+
+
+def extract_colors(paths, cache: ColorCache | None = None,
+                   workers: int | None = None, on_progress=None) -> dict:
+    """
+    Color names for many photos: {path: color}, "" where unknown.
+
+    Files are hashed in threads (I/O bound); photos not in the cache are
+    decoded in a process pool. on_progress(done, total) is called as
+    results come in (from this thread). If the pool breaks (a worker
+    died), the colors found so far are cached before the error is raised.
+    """
+    cache = cache or ColorCache()
+    paths = list(dict.fromkeys(paths))
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        hashes = dict(zip(paths, pool.map(_hash_or_none, paths)))
+
+    results = {}
+    todo = {}  # content hash -> a path with that content
+    for path, digest in hashes.items():
+        if digest is None:
+            results[path] = ""
+        elif digest in cache.colors:
+            results[path] = cache.colors[digest]
+        else:
+            todo.setdefault(digest, path)
+
+    done = len(paths) - len(todo)
+    if on_progress:
+        on_progress(done, len(paths))
+    if todo:
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                digests = list(todo)
+                colors = pool.map(dominant_color, [todo[d] for d in digests], chunksize=16)
+                for digest, color in zip(digests, colors):
+                    if color:  # unreadable photos are retried next time
+                        cache.colors[digest] = color
+                    done += 1
+                    if on_progress and done % 16 == 0:
+                        on_progress(done, len(paths))
+        finally:
+            try:
+                cache.save()
+            except OSError:
+                pass  # only a cache; keep the colors (or the pool's error)
+
+    for path, digest in hashes.items():
+        if path not in results:
+            results[path] = cache.colors.get(digest, "")
+    if on_progress:
+        on_progress(len(paths), len(paths))
+    return results
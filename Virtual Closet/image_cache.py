@@ -0,0 +1,128 @@
+# image_cache.py
+#
+# On-disk cache of item thumbnails, plus a perceptual hash (dHash) of each
+# image computed from the same downscaled copy. Entries are keyed on the
+# image path, size and modification time, so an edited photo gets a new
+# thumbnail and an unchanged one is never decoded twice.
+import hashlib
+import json
+import os
+import threading
+
+from PIL import Image
+
+from storage import DATA_DIR
+
+THUMB_DIR = os.path.join(DATA_DIR, "thumbs")
+THUMB_SIZE = (200, 130)  # fits the preview canvases
+
+
+def cache_key(image_path: str) -> str | None:
+    """Key for the current version of an image file (None if missing)."""
+    try:
+        st = os.stat(image_path)
+    except OSError:
+        return None
+    raw = f"{os.path.abspath(image_path)}|{st.st_size}|{st.st_mtime_ns}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def dhash(img: Image.Image) -> int:
+    """64-bit difference hash: is each pixel brighter than its neighbour?"""
+    small = img.convert("L").resize((9, 8), Image.LANCZOS)
+    pixels = list(small.getdata())
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            left = pixels[row * 9 + col]
+            right = pixels[row * 9 + col + 1]
+            bits = (bits << 1) | (left > right)
+    return bits
+
+
+def make_thumbnail(image_path: str, folder: str = THUMB_DIR):
+    """
+    Write the thumbnail for image_path into folder.
+    Returns (key, hash), or None if the image can't be read. A plain
+    function so it can run in a process pool (see bulk imports).
+    """
+    key = cache_key(image_path)
+    if key is None:
+        return None
+    try:
+        with Image.open(image_path) as src:
+            img = src.convert("RGBA")
+        img.thumbnail(THUMB_SIZE)
+        os.makedirs(folder, exist_ok=True)
+        # write aside and rename, so a reader (or a crash) never sees
+        # half a PNG; the pid keeps pool workers off each other's files
+        final_path = os.path.join(folder, key + ".png")
+        tmp_path = f"{final_path}.{os.getpid()}.tmp"
+        try:
+            img.save(tmp_path, format="PNG")
+            os.replace(tmp_path, final_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return key, dhash(img)
+    except Exception:
+        return None
+
+
+class ThumbnailCache:
+    """Thumbnails and perceptual hashes of item images, cached on disk."""
+
+    def __init__(self, folder: str = THUMB_DIR):
+        self.folder = folder
+        self.index_file = os.path.join(folder, "index.json")
+        self.hashes = {}  # cache key -> dhash
+        self._lock = threading.Lock()  # GUI thread + background scans
+        try:
+            with open(self.index_file, "r") as f:
+                self.hashes = {k: int(v, 16) for k, v in json.load(f).items()}
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    def thumbnail(self, image_path: str):
+        """PIL image of the thumbnail, or None if there's no usable image."""
+        key = self._ensure(image_path)
+        if key is None:
+            return None
+        try:
+            with Image.open(os.path.join(self.folder, key + ".png")) as img:
+                return img.copy()
+        except OSError:
+            return None
+
+    def phash(self, image_path: str) -> int | None:
+        key = self._ensure(image_path)
+        return None if key is None else self.hashes.get(key)
+
+    def add(self, key: str, phash: int):
+        """Record a thumbnail made elsewhere (e.g. by make_thumbnail in a pool)."""
+        with self._lock:
+            self.hashes[key] = phash
+
+    def save_index(self):
+        with self._lock:
+            data = {k: format(v, "016x") for k, v in self.hashes.items()}
+        os.makedirs(self.folder, exist_ok=True)
+        tmp = self.index_file + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp, self.index_file)
+
+    def _ensure(self, image_path: str) -> str | None:
+        if not image_path:
+            return None
+        key = cache_key(image_path)
+        if key is None:
+            return None
+        if key in self.hashes and os.path.exists(
+                os.path.join(self.folder, key + ".png")):
+            return key
+        made = make_thumbnail(image_path, self.folder)
+        if made is None:
+            return None
+        self.add(*made)
+        return key
@@ -0,0 +1,71 @@
+# image_dedupe.py
+#
+# Find items whose photos are the same (or nearly the same) image, using
+# the 64-bit perceptual hashes from image_cache.
+#
+# Comparing every pair is quadratic, so hashes are bucketed instead: each
+# hash is cut into four 16-bit bands. Two hashes at most 7 bits apart
+# have a band where they differ in at most one bit (pigeonhole), so each
+# hash only needs comparing with the buckets of its bands and of their
+# one-bit neighbours (4 x 17 bucket lookups) rather than with every hash.
+
+# hashes at most this many bits apart count as the same photo
+DUPLICATE_DISTANCE = 5
+
+BANDS = 4
+BAND_BITS = 16
+BAND_MASK = (1 << BAND_BITS) - 1
+MAX_DISTANCE = 2 * BANDS - 1  # what the one-bit probing can guarantee
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def _band_keys(phash: int) -> list:
+    return [(band << BAND_BITS) | ((phash >> (band * BAND_BITS)) & BAND_MASK)
+            for band in range(BANDS)]
+
+
+def find_duplicates(hashes: dict, max_distance: int = DUPLICATE_DISTANCE) -> list:
+    """
+    Group item ids whose image hashes are within max_distance bits.
+    hashes: {item id: phash}. Returns lists of 2+ ids, each sorted.
+    """
+    if max_distance > MAX_DISTANCE:
+        raise ValueError(f"max_distance can be at most {MAX_DISTANCE}")
+
+    buckets = {}
+    for item_id, phash in hashes.items():
+        for key in _band_keys(phash):
+            buckets.setdefault(key, []).append(item_id)
+
+    # union-find, so chains of near matches end up in one group
+    parent = {}
+
+    def find(x):
+        root = x
+        while parent.get(root, root) != root:
+            root = parent[root]
+        while x != root:
+            parent[x], x = root, parent[x]
+        return root
+
+    # below BANDS bits apart, some band matches exactly: no need to probe
+    flips = [0]
+    if max_distance >= BANDS:
+        flips += [1 << bit for bit in range(BAND_BITS)]
+    for item_id, phash in hashes.items():
+        for key in _band_keys(phash):
+            for flip in flips:
+                for other in buckets.get(key ^ flip, ()):
+                    if other == item_id or hamming(phash, hashes[other]) > max_distance:
+                        continue
+                    a, b = find(item_id), find(other)
+                    if a != b:
+                        parent[max(a, b)] = min(a, b)
+
+    groups = {}
+    for item_id in hashes:
+        groups.setdefault(find(item_id), []).append(item_id)
+    return [sorted(ids) for ids in groups.values() if len(ids) > 1]
@@ -0,0 +1,109 @@
+# json_stream.py
+#
+# Incremental reader for a JSON object whose big members are arrays, like
+# closet.json: {"items": [...], "favorites": [...], "next_id": 7}.
+# The file is read in chunks and array elements are handed out one at a
+# time, so the whole document is never parsed (or held) in one go.
+import json
+import re
+
+CHUNK_SIZE = 64 * 1024
+
+_decoder = json.JSONDecoder()
+_whitespace = re.compile(r"[ \t\r\n]*")
+_number_chars = re.compile(r"[-+0-9.eE]*")
+
+
+class _Reader:
+    """Chunked text buffer with just enough JSON tokenizing for iter_object."""
+
+    def __init__(self, f, chunk_size: int):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _more(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character ("" at end of file)."""
+        while True:
+            self.pos = _whitespace.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._more():
+                return ""
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise json.JSONDecodeError(f"Expecting {char!r}", self.buf, self.pos)
+        self.pos += 1
+
+    def skip(self, char: str) -> bool:
+        if self.peek() == char:
+            self.pos += 1
+            return True
+        return False
+
+    def value(self):
+        first = self.peek()
+        if first and first in "-0123456789":
+            # a number cut off by the chunk boundary would still parse
+            # ("2.5" -> 2), so make sure all of it is in the buffer
+            while (_number_chars.match(self.buf, self.pos).end() == len(self.buf)
+                   and self._more()):
+                pass
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                # probably cut off at the end of the buffer
+                if self._more():
+                    continue
+                raise
+            self.pos = end
+            return value
+
+
+def iter_object(f, chunk_size: int = CHUNK_SIZE):
+    """
+    Yield (key, value) for the members of the JSON object in text file f.
+
+    Array members are yielded element by element as (key, element), so an
+    empty array yields nothing. Raises json.JSONDecodeError on bad input
+    (after yielding everything before the problem).
+    """
+    reader = _Reader(f, chunk_size)
+    reader.expect("{")
+    if reader.skip("}"):
+        return
+
+    while True:
+        key = reader.value()
+        if not isinstance(key, str):
+            raise json.JSONDecodeError("Expecting property name", reader.buf, reader.pos)
+        reader.expect(":")
+
+        if reader.skip("["):
+            if not reader.skip("]"):
+                while True:
+                    yield key, reader.value()
+                    if not reader.skip(","):
+                        reader.expect("]")
+                        break
+        else:
+            yield key, reader.value()
+
+        if not reader.skip(","):
+            reader.expect("}")
+            return
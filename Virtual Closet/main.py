@@ -1,10 +1,21 @@
 # main.py
-import tkinter as tk
-from app_gui import OutfitApp
+import sys
 
 def main():
+    # headless: python main.py --headless [closet_cli options] closets...
+    if sys.argv[1:2] == ["--headless"]:
+        import closet_cli
+        sys.exit(closet_cli.main(sys.argv[2:]))
+
+    # Tk and PIL are only imported for the GUI
+    import tkinter as tk
+    from app_gui import OutfitApp
+    from storage import open_store
+
+    # optional: path to the closet file (closet.json or an SQLite .db)
+    store = open_store(*sys.argv[1:2])
     root = tk.Tk()
-    app = OutfitApp(root)
+    app = OutfitApp(root, store)
     root.mainloop()
 
 if __name__ == "__main__":
@@ -0,0 +1,49 @@
+# migrate_closet.py
+#
+# Convert a closet.json from before item ids (favorites holding full item
+# copies) to the current format, keeping a .bak of the original. Prints
+# the file size and load time before and after.
+#
+#   python migrate_closet.py [data/closet.json]
+import os
+import shutil
+import sys
+import time
+
+from storage import CLOSET_FILE, load_closet, save_closet
+
+
+def timed_load(path: str):
+    start = time.perf_counter()
+    closet = load_closet(path)
+    return closet, time.perf_counter() - start
+
+
+def main(argv):
+    path = argv[0] if argv else CLOSET_FILE
+    if not os.path.exists(path):
+        print(f"No closet file at {path}")
+        return 1
+
+    size_before = os.path.getsize(path)
+    closet, load_before = timed_load(path)
+    if not closet.needs_checkpoint:
+        print(f"{path} is already up to date.")
+        return 0
+
+    shutil.copy2(path, path + ".bak")
+    if not save_closet(closet, path):
+        print(f"Could not write {path}")
+        return 1
+
+    size_after = os.path.getsize(path)
+    closet, load_after = timed_load(path)
+    print(f"{len(closet.items)} items, {len(closet.favorites)} favorites "
+          f"(original kept as {path}.bak)")
+    print(f"file size: {size_before / 1024:10.1f} KiB -> {size_after / 1024:10.1f} KiB")
+    print(f"load time: {load_before * 1000:10.1f} ms  -> {load_after * 1000:10.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
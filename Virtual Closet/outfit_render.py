@@ -0,0 +1,109 @@
+# outfit_render.py
+#
+# Saved outfits are previewed as one pre-rendered image (top/dress,
+# bottom, shoes and accessory stacked) instead of four thumbnails loaded
+# separately. Renders are cached on disk under a key made from the cache
+# keys of the item images, so a favorite is only composed again when one
+# of its photos changes, and showing one is a single small PNG read.
+import hashlib
+import os
+import threading
+
+from PIL import Image, ImageDraw
+
+from image_cache import cache_key
+from storage import DATA_DIR
+
+COMPOSITE_DIR = os.path.join(DATA_DIR, "composites")
+TILE_SIZE = (200, 120)
+TILE_GAP = 4
+# bump when the layout changes so old renders aren't reused
+LAYOUT_VERSION = 1
+
+# (preview slot, placeholder text), top to bottom
+PREVIEW_SLOTS = [
+    ("TopOrDress", "Top / Dress"),
+    ("Bottom", "Bottom"),
+    ("Shoes", "Shoes"),
+    ("Accessory", "Accessory"),
+]
+
+
+def preview_items(outfit_items: dict) -> list:
+    """The item shown in each of PREVIEW_SLOTS (None for empty slots)."""
+    return [
+        outfit_items.get("Dress") or outfit_items.get("Top"),
+        outfit_items.get("Bottom"),
+        outfit_items.get("Shoes"),
+        outfit_items.get("Accessory"),
+    ]
+
+
+def composite_key(items: list) -> str:
+    parts = [str(LAYOUT_VERSION)]
+    for item in items:
+        key = cache_key(item.image_path) if item and item.image_path else None
+        parts.append(key or "-")
+    return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()
+
+
+def render_composite(thumbs, items: list, bg: str = "#FFF9FF"):
+    """
+    Stack the thumbnails of items (see preview_items) into one image.
+    Returns (image, complete): complete is False if a photo couldn't be
+    read and got a placeholder instead.
+    """
+    width, tile_h = TILE_SIZE
+    height = len(PREVIEW_SLOTS) * (tile_h + TILE_GAP) - TILE_GAP
+    img = Image.new("RGB", (width, height), bg)
+    draw = ImageDraw.Draw(img)
+    complete = True
+
+    for n, (item, (_, placeholder)) in enumerate(zip(items, PREVIEW_SLOTS)):
+        y = n * (tile_h + TILE_GAP)
+        draw.rectangle([0, y, width - 1, y + tile_h - 1], fill="#FFFFFF", outline="#000000")
+        has_photo = bool(item and item.image_path)
+        thumb = thumbs.thumbnail(item.image_path) if has_photo else None
+        if thumb is None:
+            complete = complete and not has_photo
+            draw.text((10, y + 8), placeholder, fill="#777777")
+            continue
+        thumb.thumbnail((width - 2, tile_h - 2))
+        x0 = (width - thumb.width) // 2
+        y0 = y + (tile_h - thumb.height) // 2
+        img.paste(thumb, (x0, y0), thumb if thumb.mode == "RGBA" else None)
+    return img, complete
+
+
+class CompositeCache:
+    """Pre-rendered favorite previews, cached on disk."""
+
+    def __init__(self, thumbs, folder: str = COMPOSITE_DIR):
+        self.thumbs = thumbs  # ThumbnailCache
+        self.folder = folder
+
+    def image(self, outfit_items: dict) -> Image.Image:
+        """Composite preview of an outfit ({category: item or None})."""
+        items = preview_items(outfit_items)
+        path = os.path.join(self.folder, composite_key(items) + ".png")
+        try:
+            with Image.open(path) as img:
+                return img.copy()
+        except OSError:
+            pass
+
+        img, complete = render_composite(self.thumbs, items)
+        if not complete:
+            return img  # a missing or unreadable photo: try again next time
+        # unique per thread: the GUI and the gallery worker may race
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.folder, exist_ok=True)
+            img.save(tmp, format="PNG")
+            os.replace(tmp, path)
+        except OSError:
+            pass  # only a cache
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        return img
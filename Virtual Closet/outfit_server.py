@@ -0,0 +1,346 @@
+# outfit_server.py
+#
+# Small asyncio HTTP service over a folder of closets, one file per user
+# (<name>.json or <name>.db):
+#
+#   GET  /closets/<name>/outfit?vibe=Casual&accessory=0
+#   GET  /closets/<name>/items?q=pink&category=Top&vibe=Comfy&limit=50
+#   GET  /closets/<name>/favorites
+#   POST /closets/<name>/favorites   {"label": "...", "outfit": {"Top": 12, ...}}
+#
+# Recently used closets stay in memory (LRU, at most MAX_CLOSETS, dropped
+# after IDLE_SECONDS unused). Changes are saved by a background task
+# every WRITEBACK_SECONDS, before a closet is dropped and on shutdown; a
+# closet that can't be saved is kept (outside the MAX_CLOSETS count) and
+# retried, with a message on stderr.
+# Each closet has an asyncio.Lock so concurrent requests for it take
+# turns; loads and saves run in a thread so they don't stall the others.
+#
+#   python outfit_server.py [--dir data/closets] [--port 8080]
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import re
+import signal
+import sys
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from closet_model import Closet, OUTFIT_SLOTS
+from closet_cli import outfit_to_dict
+from storage import DATA_DIR, open_store
+
+CLOSETS_DIR = os.path.join(DATA_DIR, "closets")
+MAX_CLOSETS = 64
+IDLE_SECONDS = 300
+WRITEBACK_SECONDS = 5
+MAX_BODY = 64 * 1024
+DEFAULT_LIMIT = 50
+
+_name_re = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+_route_re = re.compile(r"^/closets/([^/]+)/(outfit|items|favorites)$")
+
+REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 413: "Payload Too Large",
+           500: "Internal Server Error"}
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class CachedCloset:
+    """A loaded closet, its store and the lock requests take turns on."""
+
+    def __init__(self, name: str, store):
+        self.name = name
+        self.store = store
+        self.closet: Closet | None = None
+        self.lock = asyncio.Lock()
+        self.last_used = time.monotonic()
+        self.evicted = False
+        self.save_failed = False  # the last save didn't work
+
+    @property
+    def dirty(self) -> bool:
+        closet = self.closet
+        return closet is not None and bool(closet.pending_changes or closet.needs_checkpoint)
+
+
+class ClosetCache:
+    """LRU of loaded closets with idle eviction and background write-back."""
+
+    def __init__(self, folder: str = CLOSETS_DIR, max_closets: int = MAX_CLOSETS,
+                 idle_seconds: float = IDLE_SECONDS):
+        self.folder = folder
+        self.max_closets = max_closets
+        self.idle_seconds = idle_seconds
+        self.entries = OrderedDict()  # name -> CachedCloset, oldest first
+
+    def path_for(self, name: str) -> str | None:
+        if not _name_re.match(name):
+            return None
+        for ext in (".db", ".json"):
+            path = os.path.join(self.folder, name + ext)
+            if os.path.exists(path):
+                return path
+        return None
+
+    @contextlib.asynccontextmanager
+    async def use(self, name: str):
+        """
+        Lock the closet called name for one request and yield it, loaded.
+        Raises HttpError(404) if there's no such closet.
+        """
+        while True:
+            entry = self.entries.get(name)
+            if entry is None:
+                path = self.path_for(name)
+                if path is None:
+                    raise HttpError(404, f"no closet named {name!r}")
+                entry = self.entries[name] = CachedCloset(name, open_store(path))
+                await self._evict_over_capacity()
+            if self.entries.get(name) is entry:
+                self.entries.move_to_end(name)
+            entry.last_used = time.monotonic()
+
+            async with entry.lock:
+                # dropped while we waited: start over with a fresh entry
+                if entry.evicted:
+                    continue
+                if entry.closet is None:
+                    entry.closet = await asyncio.to_thread(entry.store.load)
+                yield entry.closet
+                return
+
+    async def flush(self, entry: CachedCloset) -> bool:
+        """Save entry if it has changes (caller holds entry.lock); False if that failed."""
+        if not entry.dirty:
+            return True
+        saved = await asyncio.to_thread(entry.store.save, entry.closet)
+        # say so once per failure, not on every retry
+        if not saved and not entry.save_failed:
+            print(f"could not save closet {entry.name!r}; keeping it in memory and retrying",
+                  file=sys.stderr, flush=True)
+        elif saved and entry.save_failed:
+            print(f"closet {entry.name!r} saved after earlier failures", file=sys.stderr, flush=True)
+        entry.save_failed = not saved
+        return saved
+
+    async def evict(self, name: str):
+        entry = self.entries.get(name)
+        if entry is None:
+            return
+        async with entry.lock:
+            await self.flush(entry)
+            # a request may have picked it up again while we saved
+            if self.entries.get(name) is entry and not entry.dirty:
+                del self.entries[name]
+                entry.evicted = True
+                entry.store.close()
+
+    async def _evict_over_capacity(self):
+        # the newest entry is last, so it is never the one dropped; closets
+        # that failed to save can't be dropped, so they don't count
+        names = [name for name, entry in self.entries.items() if not entry.save_failed]
+        for name in names[:max(0, len(names) - self.max_closets)]:
+            await self.evict(name)
+
+    async def write_back(self, interval: float = WRITEBACK_SECONDS):
+        """Background task: save dirty closets, drop idle ones."""
+        while True:
+            await asyncio.sleep(interval)
+            now = time.monotonic()
+            for name, entry in list(self.entries.items()):
+                if now - entry.last_used > self.idle_seconds:
+                    await self.evict(name)
+                elif entry.dirty:
+                    async with entry.lock:
+                        await self.flush(entry)
+
+    async def close(self):
+        for name in list(self.entries):
+            await self.evict(name)
+        for name, entry in self.entries.items():
+            if entry.dirty:
+                print(f"closet {name!r} could not be saved; its latest changes are lost",
+                      file=sys.stderr, flush=True)
+
+
+# ---------------- request handlers ----------------
+async def handle(cache: ClosetCache, method: str, target: str, body: bytes):
+    """Route one request; returns (status, JSON-able result)."""
+    url = urlsplit(target)
+    match = _route_re.match(url.path)
+    if not match:
+        raise HttpError(404, "unknown path")
+    name, what = unquote(match.group(1)), match.group(2)
+    query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+
+    allowed = ("GET", "POST") if what == "favorites" else ("GET",)
+    if method not in allowed:
+        raise HttpError(405, f"{method} not allowed here")
+
+    async with cache.use(name) as closet:
+        if what == "outfit":
+            vibe = query.get("vibe") or None
+            accessory = query.get("accessory", "1") not in ("0", "false", "no")
+            return 200, outfit_to_dict(closet.random_outfit(vibe, accessory))
+        if what == "items":
+            return 200, [item.to_dict() for item in _query_items(closet, query)]
+        if method == "GET":
+            return 200, closet.favorites
+        closet.add_favorite(*_parse_favorite(closet, body))
+        return 201, closet.favorites[-1]
+
+
+def _query_items(closet: Closet, query: dict) -> list:
+    try:
+        limit = int(query.get("limit", DEFAULT_LIMIT))
+    except ValueError:
+        raise HttpError(400, "limit must be a number")
+    category = query.get("category")
+    vibe = query.get("vibe")
+    items = closet.search(query["q"]) if query.get("q") else closet.items
+
+    found = []
+    for item in items:
+        if len(found) >= limit:
+            break
+        if category and item.category != category:
+            continue
+        if vibe and vibe != "Any" and item.vibe not in (vibe, "Any"):
+            continue
+        found.append(item)
+    return found
+
+
+def _parse_favorite(closet: Closet, body: bytes):
+    try:
+        data = json.loads(body or b"{}")
+        refs = data.get("outfit") or {}
+        label = str(data.get("label", ""))
+    except (ValueError, AttributeError):
+        raise HttpError(400, "body must be a JSON object")
+    if not isinstance(refs, dict) or not refs:
+        raise HttpError(400, "outfit must map slots to item ids")
+
+    outfit = {}
+    for slot in OUTFIT_SLOTS:
+        item_id = refs.get(slot)
+        # JSON true/false are ints to Python; true would pick item 1
+        is_id = isinstance(item_id, int) and not isinstance(item_id, bool)
+        item = closet.get_item(item_id) if is_id else None
+        if item_id is not None and item is None:
+            raise HttpError(400, f"no item {item_id!r} for {slot}")
+        outfit[slot] = item
+    return outfit, label
+
+
+# ---------------- HTTP/1.1 ----------------
+async def serve_connection(cache: ClosetCache, reader, writer):
+    try:
+        while True:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError,
+                    ConnectionError):
+                break
+            lines = head.decode("latin-1").split("\r\n")
+            try:
+                method, target, version = lines[0].split(" ", 2)
+            except ValueError:
+                await _respond(writer, 400, {"error": "bad request line"}, False)
+                break
+            headers = {}
+            for line in lines[1:]:
+                key, _, value = line.partition(":")
+                headers[key.strip().lower()] = value.strip()
+            keep_alive = (headers.get("connection", "").lower() != "close"
+                          and version == "HTTP/1.1")
+
+            raw_length = headers.get("content-length", "") or "0"
+            if not (raw_length.isascii() and raw_length.isdigit()):
+                # int() would take "-1", "+5" or "1_0"; the body can't be framed
+                await _respond(writer, 400, {"error": "bad Content-Length"}, False)
+                break
+            length = int(raw_length)
+            if length > MAX_BODY:
+                await _respond(writer, 413, {"error": "body too large"}, False)
+                break
+            body = await reader.readexactly(length) if length else b""
+
+            try:
+                status, result = await handle(cache, method, target, body)
+            except HttpError as e:
+                status, result = e.status, {"error": str(e)}
+            except Exception as e:
+                status, result = 500, {"error": f"{type(e).__name__}: {e}"}
+            await _respond(writer, status, result, keep_alive)
+            if not keep_alive:
+                break
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def _respond(writer, status: int, result, keep_alive: bool):
+    payload = json.dumps(result).encode("utf-8")
+    writer.write(
+        f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+        f"Content-Type: application/json\r\n"
+        f"Content-Length: {len(payload)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1")
+        + payload
+    )
+    await writer.drain()
+
+
+async def run_server(folder: str, host: str, port: int, max_closets: int = MAX_CLOSETS,
+                     idle_seconds: float = IDLE_SECONDS):
+    cache = ClosetCache(folder, max_closets, idle_seconds)
+    server = await asyncio.start_server(
+        lambda r, w: serve_connection(cache, r, w), host, port
+    )
+    writer_task = asyncio.create_task(cache.write_back())
+    # save dirty closets on SIGTERM too, not just Ctrl-C
+    try:
+        asyncio.get_running_loop().add_signal_handler(
+            signal.SIGTERM, asyncio.current_task().cancel)
+    except NotImplementedError:  # Windows
+        pass
+    print(f"Serving closets from {folder} on http://{host}:{port}", flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    except asyncio.CancelledError:
+        pass  # shutting down
+    finally:
+        writer_task.cancel()
+        await cache.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HTTP outfit service.")
+    parser.add_argument("--dir", default=CLOSETS_DIR, help="folder of closet files")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--max-closets", type=int, default=MAX_CLOSETS)
+    parser.add_argument("--idle", type=float, default=IDLE_SECONDS,
+                        help="seconds before an unused closet is dropped")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(run_server(args.dir, args.host, args.port,
+                               args.max_closets, args.idle))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
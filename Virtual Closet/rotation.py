@@ -0,0 +1,170 @@
+# rotation.py
+#
+# Outfit picking that rotates through the closet: an item worn recently
+# is less likely to come up again until COOLDOWN_DAYS have passed.
+#
+# Each (category, vibe) bucket keeps its items' weights in a Fenwick tree,
+# so picking an item with probability proportional to its weight, and
+# changing one weight when an item is worn, added or removed, are all
+# O(log n) instead of a pass over the closet.
+from wear_history import WearHistory
+
+COOLDOWN_DAYS = 14
+MIN_WEIGHT = 0.02  # worn today: still possible, just unlikely
+
+
+def wear_weight(last_worn: int | None, today: int) -> float:
+    """Pick weight of an item last worn on day last_worn (None = never)."""
+    if last_worn is None:
+        return 1.0
+    days = max(0, today - last_worn)
+    if days >= COOLDOWN_DAYS:
+        return 1.0
+    return max(MIN_WEIGHT, (days / COOLDOWN_DAYS) ** 2)
+
+
+class FenwickTree:
+    """Weights with O(log n) update, append and weighted search."""
+
+    def __init__(self):
+        self.weights = []
+        self._tree = [0.0]  # 1-based; node i sums weights (i - lowbit(i), i]
+
+    def __len__(self):
+        return len(self.weights)
+
+    def append(self, weight: float):
+        i = len(self._tree)
+        total = weight
+        j, stop = i - 1, i - (i & -i)
+        while j > stop:
+            total += self._tree[j]
+            j -= j & -j
+        self._tree.append(total)
+        self.weights.append(weight)
+
+    def pop(self) -> float:
+        # no other node covers the last position, so nothing to fix up
+        self._tree.pop()
+        return self.weights.pop()
+
+    def set(self, index: int, weight: float):
+        delta = weight - self.weights[index]
+        self.weights[index] = weight
+        i = index + 1
+        while i < len(self._tree):
+            self._tree[i] += delta
+            i += i & -i
+
+    def total(self) -> float:
+        total, i = 0.0, len(self.weights)
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def find(self, x: float) -> int:
+        """Index where the running total of weights passes x."""
+        n = len(self.weights)
+        pos, step = 0, 1 << n.bit_length()
+        while step:
+            nxt = pos + step
+            if nxt <= n and self._tree[nxt] <= x:
+                pos = nxt
+                x -= self._tree[nxt]
+            step >>= 1
+        return min(pos, n - 1)
+
+
+class _Bucket:
+    """Item ids of one (category, vibe) with their weights."""
+
+    def __init__(self):
+        self.ids = []
+        self.pos = {}  # item id -> index in ids / tree
+        self.tree = FenwickTree()
+
+    def add(self, item_id: int, weight: float):
+        self.pos[item_id] = len(self.ids)
+        self.ids.append(item_id)
+        self.tree.append(weight)
+
+    def remove(self, item_id: int):
+        # move the last item into the hole so the tree only shrinks at the end
+        index = self.pos.pop(item_id)
+        last_id = self.ids.pop()
+        weight = self.tree.pop()
+        if last_id != item_id:
+            self.ids[index] = last_id
+            self.pos[last_id] = index
+            self.tree.set(index, weight)
+
+
+class RotationPicker:
+    """
+    Weighted random picks from a closet, favoring items not worn lately.
+    The Closet keeps it up to date as items change (see Closet.random_outfit).
+    """
+
+    def __init__(self, history: WearHistory, today: int):
+        self.history = history
+        self.today = today
+        self._buckets = {}  # category -> {vibe: _Bucket}
+        self._where = {}    # item id -> _Bucket
+        self._cooling = set()  # ids of items below full weight
+
+    def add(self, item):
+        bucket = self._buckets.setdefault(item.category, {}).setdefault(
+            item.vibe, _Bucket())
+        bucket.add(item.item_id, self._weight(item.item_id))
+        self._where[item.item_id] = bucket
+
+    def remove(self, item_id: int):
+        bucket = self._where.pop(item_id, None)
+        if bucket is not None:
+            bucket.remove(item_id)
+        self._cooling.discard(item_id)
+
+    def update(self, item_id: int):
+        """Recompute an item's weight after its wear history changed."""
+        bucket = self._where.get(item_id)
+        if bucket is not None:
+            bucket.tree.set(bucket.pos[item_id], self._weight(item_id))
+
+    def set_today(self, today: int):
+        # only items still cooling down have a weight that depends on the day
+        if today != self.today:
+            self.today = today
+            for item_id in list(self._cooling):
+                self.update(item_id)
+
+    def count(self, category: str, vibe: str | None) -> int:
+        return sum(len(b.ids) for b in self._candidates(category, vibe))
+
+    def choose(self, category: str, vibe: str | None, rng) -> int | None:
+        """Id of a random item of category for vibe, or None if there's none."""
+        buckets = [b for b in self._candidates(category, vibe) if b.ids]
+        if not buckets:
+            return None
+        totals = [b.tree.total() for b in buckets]
+        x = rng.random() * sum(totals)
+        for bucket, total in zip(buckets, totals):
+            if x < total:
+                break
+            x -= total
+        return bucket.ids[bucket.tree.find(x)]
+
+    def _candidates(self, category: str, vibe: str | None) -> list:
+        # same rule as Closet.get_items_by_category_and_vibe
+        by_vibe = self._buckets.get(category, {})
+        if vibe is None or vibe == "Any":
+            return list(by_vibe.values())
+        return [by_vibe[v] for v in (vibe, "Any") if v in by_vibe]
+
+    def _weight(self, item_id: int) -> float:
+        weight = wear_weight(self.history.last_worn(item_id), self.today)
+        if weight < 1.0:
+            self._cooling.add(item_id)
+        else:
+            self._cooling.discard(item_id)
+        return weight
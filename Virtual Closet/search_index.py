@@ -0,0 +1,101 @@
+# search_index.py
+import re
+
+# substrings up to this length are indexed directly; longer query words
+# are found by intersecting their trigrams
+GRAM = 3
+
+_word_re = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list:
+    return _word_re.findall(text.lower())
+
+
+def _grams(word: str) -> set:
+    return {
+        word[i:i + n]
+        for n in range(1, GRAM + 1)
+        for i in range(len(word) - n + 1)
+    }
+
+
+class SearchIndex:
+    """
+    Inverted index for as-you-type search over item text.
+
+    Text is split into words. Each word maps to the ids of the items that
+    contain it, and every 1-3 letter substring maps to the words that
+    contain it, so finding the words that match a query word only looks
+    at candidates sharing its trigrams, not at every item. Items are
+    added and removed one at a time as the closet changes.
+    """
+
+    def __init__(self):
+        self._postings = {}  # word -> set of item ids
+        self._grams = {}     # substring (1..GRAM letters) -> set of words
+        self._words = {}     # item id -> words of that item (for remove)
+
+    def __len__(self):
+        return len(self._words)
+
+    def add(self, item_id: int, text: str):
+        words = tuple(set(tokenize(text)))
+        self._words[item_id] = words
+        for word in words:
+            ids = self._postings.get(word)
+            if ids is None:
+                ids = self._postings[word] = set()
+                for gram in _grams(word):
+                    self._grams.setdefault(gram, set()).add(word)
+            ids.add(item_id)
+
+    def remove(self, item_id: int):
+        for word in self._words.pop(item_id, ()):
+            ids = self._postings[word]
+            ids.discard(item_id)
+            if ids:
+                continue
+            del self._postings[word]
+            for gram in _grams(word):
+                words = self._grams[gram]
+                words.discard(word)
+                if not words:
+                    del self._grams[gram]
+
+    def search(self, query: str) -> list:
+        """
+        Ids of items with a word containing each word of the query.
+        Items where every query word is a prefix match come first; each
+        group is sorted by id (i.e. in the order items were added).
+        """
+        parts = tokenize(query)
+        if not parts:
+            return []
+
+        matched = prefixed = None
+        for part in parts:
+            ids = set()
+            prefix_ids = set()
+            for word in self._matching_words(part):
+                ids |= self._postings[word]
+                if word.startswith(part):
+                    prefix_ids |= self._postings[word]
+            matched = ids if matched is None else matched & ids
+            prefixed = prefix_ids if prefixed is None else prefixed & prefix_ids
+            if not matched:
+                return []
+
+        return sorted(prefixed) + sorted(matched - prefixed)
+
+    def _matching_words(self, part: str):
+        if len(part) <= GRAM:
+            return self._grams.get(part, ())
+
+        candidates = sorted(
+            (self._grams.get(part[i:i + GRAM], set())
+             for i in range(len(part) - GRAM + 1)),
+            key=len,
+        )
+        words = candidates[0].intersection(*candidates[1:])
+        return [word for word in words if part in word]
@@ -0,0 +1,321 @@
+# sqlite_storage.py
+#
+# SQLite backend for the closet. Items and favorites live in their own
+# tables, so saving only runs the statements for the pending changes and
+# category/vibe lookups can be answered by the database without loading
+# the whole closet.
+import json
+import os
+import sqlite3
+from urllib.request import pathname2url
+
+from clothing_item import ClothingItem
+from closet_model import Closet
+from storage import DATA_DIR, STREAM_BATCH, ClosetStore, ClosetStream, load_closet, save_closet
+from wear_history import WEAR_SLOTS
+
+DB_FILE = os.path.join(DATA_DIR, "closet.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id         INTEGER PRIMARY KEY,  -- ClothingItem.item_id
+    position   INTEGER NOT NULL,
+    name       TEXT NOT NULL,
+    category   TEXT NOT NULL,
+    color      TEXT NOT NULL DEFAULT '',
+    vibe       TEXT NOT NULL DEFAULT 'Any',
+    image_path TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS items_position ON items (position);
+CREATE INDEX IF NOT EXISTS items_category_vibe ON items (category, vibe);
+
+CREATE TABLE IF NOT EXISTS favorites (
+    id     INTEGER PRIMARY KEY,
+    label  TEXT NOT NULL,
+    outfit TEXT NOT NULL  -- JSON {category: item id}, as in closet.json
+);
+
+-- the last WEAR_SLOTS days each item was worn, and how often in total
+CREATE TABLE IF NOT EXISTS wear (
+    item_id INTEGER NOT NULL,
+    day     INTEGER NOT NULL  -- date.toordinal()
+);
+CREATE INDEX IF NOT EXISTS wear_item ON wear (item_id);
+
+CREATE TABLE IF NOT EXISTS wear_counts (
+    item_id INTEGER PRIMARY KEY,
+    count   INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+ITEM_COLUMNS = "name, category, color, vibe, image_path, id"
+
+
+class SqliteStore(ClosetStore):
+    """Closet stored in an SQLite database (items ordered by position)."""
+
+    def __init__(self, path: str = DB_FILE, readonly: bool = False):
+        self.path = path
+        self.readonly = readonly
+        if readonly:
+            # no file is created and nothing is written, schema included
+            uri = f"file:{pathname2url(os.path.abspath(path))}?mode=ro"
+            self.conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            return
+        folder = os.path.dirname(path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        # callers may load/save from worker threads (one at a time)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    # ---------------- ClosetStore ----------------
+    def load(self) -> Closet:
+        closet = Closet()
+        stream = self.stream()
+        for batch in stream:
+            for item in batch:
+                closet.restore_item(item)
+        stream.finish(closet)
+        return closet
+
+    def stream(self, batch_size: int = STREAM_BATCH) -> "SqliteClosetStream":
+        return SqliteClosetStream(self, batch_size)
+
+    def save(self, closet: Closet) -> bool:
+        if self.readonly:
+            return False
+        try:
+            with self.conn:  # one transaction
+                if closet.needs_checkpoint:
+                    self._replace_all(closet)
+                else:
+                    for change in closet.pending_changes:
+                        self._apply(change)
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                    ("next_id", closet.next_id),
+                )
+            closet.mark_saved()
+            return True
+        except sqlite3.Error:
+            return False
+
+    # ---------------- queries ----------------
+    def items_by_category_and_vibe(self, category: str, vibe: str | None):
+        """Same result as Closet.get_items_by_category_and_vibe, via SQL."""
+        if vibe is None or vibe == "Any":
+            rows = self.conn.execute(
+                f"SELECT {ITEM_COLUMNS} FROM items WHERE category = ? "
+                "ORDER BY position",
+                (category,),
+            )
+        else:
+            rows = self.conn.execute(
+                f"SELECT {ITEM_COLUMNS} FROM items "
+                "WHERE category = ? AND vibe IN (?, 'Any') ORDER BY position",
+                (category, vibe),
+            )
+        return [_row_to_item(row) for row in rows]
+
+    def count_items(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+    # ---------------- closet.json import / export ----------------
+    def import_json(self, json_path: str) -> bool:
+        """Replace the database contents with a closet.json file."""
+        closet = load_closet(json_path)
+        closet.needs_checkpoint = True
+        return self.save(closet)
+
+    def export_json(self, json_path: str) -> bool:
+        """Write the database contents out as a closet.json file."""
+        closet = self.load()
+        closet.needs_checkpoint = True
+        return save_closet(closet, json_path)
+
+    # ---------------- helpers ----------------
+    def _replace_all(self, closet: Closet):
+        for table in ("items", "favorites", "wear", "wear_counts"):
+            self.conn.execute(f"DELETE FROM {table}")
+        self.conn.executemany(
+            f"INSERT INTO items (position, {ITEM_COLUMNS}) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                (pos, item.name, item.category, item.color, item.vibe,
+                 item.image_path, item.item_id)
+                for pos, item in enumerate(closet.items)
+            ),
+        )
+        self.conn.executemany(
+            "INSERT INTO favorites (label, outfit) VALUES (?, ?)",
+            (
+                (fav.get("label", "Favorite"), json.dumps(fav.get("outfit", {})))
+                for fav in closet.favorites
+            ),
+        )
+        worn = closet.wear_history.to_dict()
+        self.conn.executemany(
+            "INSERT INTO wear_counts (item_id, count) VALUES (?, ?)",
+            ((int(key), days[0]) for key, days in worn.items()),
+        )
+        self.conn.executemany(
+            "INSERT INTO wear (item_id, day) VALUES (?, ?)",
+            ((int(key), day) for key, days in worn.items() for day in days[1:]),
+        )
+
+    def _apply(self, change: dict):
+        op = change["op"]
+        if op == "add":
+            self.conn.execute(
+                f"INSERT INTO items (position, {ITEM_COLUMNS}) "
+                "VALUES ((SELECT COUNT(*) FROM items), ?, ?, ?, ?, ?, ?)",
+                _item_values(change["item"]),
+            )
+        elif op == "update":
+            values = _item_values(change["item"])
+            self.conn.execute(
+                "UPDATE items SET name = ?, category = ?, color = ?, vibe = ?, "
+                "image_path = ? WHERE id = ?",
+                values,
+            )
+        elif op == "delete":
+            row = self.conn.execute(
+                "SELECT position FROM items WHERE id = ?", (change["id"],)
+            ).fetchone()
+            if row is not None:
+                self.conn.execute("DELETE FROM items WHERE id = ?", (change["id"],))
+                self.conn.execute("DELETE FROM wear WHERE item_id = ?", (change["id"],))
+                self.conn.execute(
+                    "DELETE FROM wear_counts WHERE item_id = ?", (change["id"],))
+                self.conn.execute(
+                    "UPDATE items SET position = position - 1 WHERE position > ?",
+                    row,
+                )
+        elif op == "favorite":
+            fav = change["favorite"]
+            self.conn.execute(
+                "INSERT INTO favorites (label, outfit) VALUES (?, ?)",
+                (fav.get("label", "Favorite"), json.dumps(fav.get("outfit", {}))),
+            )
+        elif op == "merge":
+            dupes = set(change["ids"]) - {change["keep"]}
+            rows = self.conn.execute("SELECT id, outfit FROM favorites").fetchall()
+            for fav_id, outfit in rows:
+                outfit = json.loads(outfit)
+                if not dupes.intersection(outfit.values()):
+                    continue
+                outfit = {cat: change["keep"] if ref in dupes else ref
+                          for cat, ref in outfit.items()}
+                self.conn.execute(
+                    "UPDATE favorites SET outfit = ? WHERE id = ?",
+                    (json.dumps(outfit), fav_id),
+                )
+            marks = ", ".join("?" * len(dupes))
+            self.conn.execute(
+                f"UPDATE wear SET item_id = ? WHERE item_id IN ({marks})",
+                (change["keep"], *dupes),
+            )
+            merged = self.conn.execute(
+                f"SELECT SUM(count) FROM wear_counts WHERE item_id IN (?, {marks})",
+                (change["keep"], *dupes),
+            ).fetchone()[0]
+            if merged:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO wear_counts (item_id, count) VALUES (?, ?)",
+                    (change["keep"], merged),
+                )
+                self._trim_wear(change["keep"])
+            for item_id in dupes:
+                self._apply({"op": "delete", "id": item_id})
+        elif op == "wear":
+            ids = [item_id for item_id in change["ids"] if self.conn.execute(
+                "SELECT 1 FROM items WHERE id = ?", (item_id,)).fetchone()]
+            for item_id in ids:
+                self.conn.execute(
+                    "INSERT INTO wear (item_id, day) VALUES (?, ?)",
+                    (item_id, change["day"]),
+                )
+                self.conn.execute(
+                    "INSERT INTO wear_counts (item_id, count) VALUES (?, 1) "
+                    "ON CONFLICT (item_id) DO UPDATE SET count = count + 1",
+                    (item_id,),
+                )
+                self._trim_wear(item_id)
+        else:
+            raise ValueError(f"Unknown change: {op!r}")
+
+
+    def _trim_wear(self, item_id: int):
+        # keep the same WEAR_SLOTS days the in-memory ring buffer keeps
+        self.conn.execute(
+            "DELETE FROM wear WHERE item_id = ? AND rowid NOT IN ("
+            "SELECT rowid FROM wear WHERE item_id = ? "
+            "ORDER BY day DESC, rowid DESC LIMIT ?)",
+            (item_id, item_id, WEAR_SLOTS),
+        )
+
+
+class SqliteClosetStream(ClosetStream):
+    """
+    Fetches item rows a batch at a time; the favorites and wear history
+    are read too once the items are done, so finish() only has to add
+    them to the closet.
+    """
+
+    def __init__(self, store: SqliteStore, batch_size: int = STREAM_BATCH):
+        super().__init__(store, batch_size)
+        self.meta = {}
+        self.favorites = []
+        self.worn = {}
+
+    def __iter__(self):
+        conn = self.store.conn
+        self.meta = dict(conn.execute("SELECT key, value FROM meta"))
+        rows = conn.execute(f"SELECT {ITEM_COLUMNS} FROM items ORDER BY position")
+        while True:
+            batch = rows.fetchmany(self.batch_size)
+            if not batch:
+                break
+            yield [_row_to_item(row) for row in batch]
+
+        self.favorites = [
+            {"label": label, "outfit": json.loads(outfit)}
+            for label, outfit in conn.execute("SELECT label, outfit FROM favorites ORDER BY id")
+        ]
+        worn = {item_id: [count] for item_id, count in conn.execute(
+            "SELECT item_id, count FROM wear_counts")}
+        for item_id, day in conn.execute("SELECT item_id, day FROM wear ORDER BY day, rowid"):
+            worn.setdefault(item_id, [0]).append(day)
+        self.worn = worn
+
+    def finish(self, closet: Closet):
+        closet.next_id = max(closet.next_id, self.meta.get("next_id", 1))
+        for fav in self.favorites:
+            closet.restore_favorite(fav)
+        closet.restore_wear(self.worn)
+
+        # databases written before item ids get rewritten on the next save
+        rewrite = closet.migrated
+        closet.mark_saved()
+        closet.needs_checkpoint = rewrite
+
+
+def _item_values(data: dict) -> tuple:
+    # same order as ITEM_COLUMNS
+    item = ClothingItem.from_dict(data)
+    return (item.name, item.category, item.color, item.vibe, item.image_path,
+            item.item_id)
+
+
+def _row_to_item(row) -> ClothingItem:
+    name, category, color, vibe, image_path, item_id = row
+    return ClothingItem(name, category, color, vibe, image_path, item_id)
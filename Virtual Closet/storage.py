@@ -1,35 +1,308 @@
 # storage.py
+#
+# The closet is stored as a snapshot (closet.json) plus an append-only
+# journal (closet.journal) of the changes made since that snapshot.
+# Saving only appends the new changes; once the journal grows bigger than
+# the snapshot it is folded back in ("checkpoint"). Snapshots are written
+# to a temp file and renamed into place, so a crash never leaves a
+# half-written closet.json behind.
+#
+# The journal starts with a header line {"generation": N} that must match
+# the "generation" stored in the snapshot. A checkpoint bumps the
+# generation, so a journal left over from a crash mid-checkpoint (whose
+# changes are already in the new snapshot) is ignored instead of being
+# replayed twice.
+#
+# Other backends (see sqlite_storage.py) implement the ClosetStore
+# interface; open_store() picks one from the file name.
+#
+# Big closets can be loaded incrementally with ClosetStore.stream(): the
+# snapshot is parsed in batches (see json_stream.py) that can be added to
+# the closet while the rest is still being read.
 import json
 import os
+from clothing_item import ClothingItem
 from closet_model import Closet
+from json_stream import iter_object
 
 DATA_DIR = "data"
 CLOSET_FILE = os.path.join(DATA_DIR, "closet.json")
+JOURNAL_FILE = os.path.join(DATA_DIR, "closet.journal")
 
-def load_closet() -> Closet:
-    """Load closet from JSON, or return an empty closet if missing/corrupt."""
-    if not os.path.exists(DATA_DIR):
-        os.makedirs(DATA_DIR)
+# don't bother compacting journals smaller than this
+COMPACT_MIN_BYTES = 64 * 1024
 
-    if not os.path.exists(CLOSET_FILE):
-        return Closet()
+# items per batch when loading incrementally
+STREAM_BATCH = 1000
 
+
+class ClosetStore:
+    """Somewhere a closet can be loaded from and saved to."""
+
+    def load(self) -> Closet:
+        raise NotImplementedError
+
+    def save(self, closet: Closet) -> bool:
+        """Save closet changes. Return True if success, False if error."""
+        raise NotImplementedError
+
+    def stream(self, batch_size: int = STREAM_BATCH) -> "ClosetStream":
+        """Incremental load, see ClosetStream."""
+        return ClosetStream(self, batch_size)
+
+    def close(self):
+        pass
+
+
+class ClosetStream:
+    """
+    An incremental load.
+
+    Iterating yields lists of ClothingItem as they are read. It doesn't
+    touch any Closet, so it can run in a worker thread while the caller
+    adds each batch with closet.restore_item(). Once iteration is done,
+    finish(closet) adds the favorites etc. on the caller's thread.
+
+    This default does a full store.load() while iterating (so still off
+    the caller's thread) and hands out its items; backends that can do
+    better override both.
+    """
+
+    def __init__(self, store: ClosetStore, batch_size: int = STREAM_BATCH):
+        self.store = store
+        self.batch_size = batch_size
+        self.loaded = None
+
+    def __iter__(self):
+        self.loaded = self.store.load()
+        items = self.loaded.items
+        for start in range(0, len(items), self.batch_size):
+            yield items[start:start + self.batch_size]
+
+    def finish(self, closet: Closet):
+        loaded = self.loaded
+        if loaded is None:  # not iterated
+            loaded = self.store.load()
+            for item in loaded.items:
+                closet.restore_item(item)
+        for fav in loaded.favorites:
+            closet.restore_favorite(fav)
+        closet.restore_wear(loaded.wear_history.to_dict())
+        closet.next_id = max(closet.next_id, loaded.next_id)
+        closet.needs_checkpoint = loaded.needs_checkpoint
+
+
+class JsonStore(ClosetStore):
+    """
+    closet.json snapshot + journal (the default).
+    A readonly store never touches the files: a damaged closet.json makes
+    load() raise ValueError instead of being set aside, and save() fails.
+    """
+
+    def __init__(self, path: str = CLOSET_FILE, readonly: bool = False):
+        self.path = path
+        self.readonly = readonly
+
+    def load(self) -> Closet:
+        return load_closet(self.path, self.readonly)
+
+    def save(self, closet: Closet) -> bool:
+        if self.readonly:
+            return False
+        return save_closet(closet, self.path)
+
+    def stream(self, batch_size: int = STREAM_BATCH) -> ClosetStream:
+        return JsonClosetStream(self.path, batch_size, self.readonly)
+
+
+class JsonClosetStream(ClosetStream):
+    """Parses closet.json batch by batch, then replays the journal."""
+
+    def __init__(self, path: str = CLOSET_FILE, batch_size: int = STREAM_BATCH,
+                 readonly: bool = False):
+        self.path = path
+        self.batch_size = batch_size
+        self.readonly = readonly
+        self.rest = {"favorites": []}  # everything but the items
+        self.legacy = False            # items without ids (old format)
+        self.error = None
+
+    def __iter__(self):
+        if not os.path.exists(self.path):
+            return
+
+        batch = []
+        try:
+            with open(self.path, "r") as f:
+                for key, value in iter_object(f):
+                    if key == "items":
+                        self.legacy = self.legacy or "id" not in value
+                        batch.append(ClothingItem.from_dict(value))
+                        if len(batch) >= self.batch_size:
+                            yield batch
+                            batch = []
+                    elif key == "favorites":
+                        self.rest["favorites"].append(value)
+                    else:
+                        self.rest[key] = value
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            self.error = e
+        if batch:
+            yield batch
+
+    def finish(self, closet: Closet):
+        journal = _journal_path(self.path)
+        if self.error is not None and self.readonly:
+            raise ValueError(f"{self.path} is damaged: {self.error}")
+        if self.error is not None:
+            # bad file -> keep it aside for recovery, keep the items read
+            # before the damage, and write a fresh snapshot on next save
+            _set_aside(self.path)
+            _set_aside(journal)
+            closet.mark_saved()
+            closet.needs_checkpoint = True
+            return
+
+        closet.next_id = max(closet.next_id, self.rest.get("next_id", 1))
+        for fav in self.rest["favorites"]:
+            closet.restore_favorite(fav)
+        closet.restore_wear(self.rest.get("worn", {}))
+
+        clean = _replay_journal(closet, journal, self.rest.get("generation", 0))
+        # a stale or torn journal can't be appended to, and converted
+        # old-format data should be written out -> full rewrite on next save
+        rewrite = self.legacy or closet.migrated or not clean
+        closet.mark_saved()
+        closet.needs_checkpoint = rewrite
+
+
+def open_store(path: str = CLOSET_FILE, readonly: bool = False) -> ClosetStore:
+    """
+    Pick a backend from the file extension (.db/.sqlite -> SQLite).
+    readonly stores only load, and raise on damaged files instead of
+    repairing them.
+    """
+    if os.path.splitext(path)[1] in (".db", ".sqlite", ".sqlite3"):
+        from sqlite_storage import SqliteStore
+        return SqliteStore(path, readonly)
+    return JsonStore(path, readonly)
+
+
+def load_closet(path: str = CLOSET_FILE, readonly: bool = False) -> Closet:
+    """Load the last snapshot and replay the journal on top of it."""
+    if not readonly:
+        _ensure_dir(path)
+    closet = Closet()
+    stream = JsonClosetStream(path, readonly=readonly)
+    for batch in stream:
+        for item in batch:
+            closet.restore_item(item)
+    stream.finish(closet)
+    return closet
+
+
+def save_closet(closet: Closet, path: str = CLOSET_FILE) -> bool:
+    """Save closet changes. Return True if success, False if error."""
     try:
-        with open(CLOSET_FILE, "r") as f:
-            data = json.load(f)
-        return Closet.from_dict(data)
-    except (OSError, json.JSONDecodeError):
-        # bad file -> start fresh
-        return Closet()
-
-def save_closet(closet: Closet) -> bool:
-    """Save closet to JSON. Return True if success, False if error."""
-    try:
-        if not os.path.exists(DATA_DIR):
-            os.makedirs(DATA_DIR)
+        _ensure_dir(path)
+        journal = _journal_path(path)
 
-        with open(CLOSET_FILE, "w") as f:
-            json.dump(closet.to_dict(), f, indent=4)
+        if (closet.needs_checkpoint or not os.path.exists(path)
+                or not os.path.exists(journal)):
+            _checkpoint(closet, path)
+        elif closet.pending_changes:
+            _append_journal(closet.pending_changes, journal)
+            if _journal_too_big(path, journal):
+                _checkpoint(closet, path)
+        closet.mark_saved()
         return True
     except OSError:
         return False
+
+
+# ---------------- snapshot ----------------
+def _checkpoint(closet: Closet, path: str):
+    """Write a full snapshot atomically and start a fresh journal."""
+    journal = _journal_path(path)
+    generation = _journal_generation(journal) + 1
+    data = closet.to_dict()
+    data["generation"] = generation
+
+    _write_atomic(path, json.dumps(data))
+    _write_atomic(journal, json.dumps({"generation": generation}) + "\n")
+
+
+def _write_atomic(path: str, text: str):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _set_aside(path: str):
+    if os.path.exists(path):
+        os.replace(path, path + ".corrupt")
+
+
+def _ensure_dir(path: str):
+    folder = os.path.dirname(path)
+    if folder and not os.path.exists(folder):
+        os.makedirs(folder)
+
+
+# ---------------- journal ----------------
+def _journal_path(path: str) -> str:
+    # data/closet.json -> data/closet.journal
+    return os.path.splitext(path)[0] + ".journal"
+
+
+def _journal_generation(journal: str) -> int:
+    try:
+        with open(journal, "r") as f:
+            return json.loads(f.readline()).get("generation", 0)
+    except (OSError, json.JSONDecodeError, AttributeError):
+        return 0
+
+
+def _append_journal(changes: list, journal: str):
+    lines = "".join(json.dumps(change) + "\n" for change in changes)
+    with open(journal, "a") as f:
+        f.write(lines)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _journal_too_big(path: str, journal: str) -> bool:
+    journal_size = os.path.getsize(journal)
+    return journal_size > max(COMPACT_MIN_BYTES, os.path.getsize(path))
+
+
+def _replay_journal(closet: Closet, journal: str, generation: int) -> bool:
+    """
+    Apply journal entries to closet.
+    Returns False if the journal is missing, stale or ends in a torn write.
+    """
+    if not os.path.exists(journal):
+        return False
+
+    with open(journal, "r") as f:
+        try:
+            header = json.loads(f.readline())
+        except json.JSONDecodeError:
+            return False
+        if not isinstance(header, dict) or header.get("generation", 0) != generation:
+            # stale (or not a journal): its changes are already in the snapshot
+            return False
+
+        for line in f:
+            try:
+                closet.apply_change(json.loads(line))
+            except (json.JSONDecodeError, KeyError, IndexError, ValueError, TypeError):
+                # torn write at the end of the journal -> stop here
+                return False
+            if not line.endswith("\n"):
+                # last write lost its newline; the next append would merge
+                return False
+    return True
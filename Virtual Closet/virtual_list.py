@@ -0,0 +1,153 @@
+# virtual_list.py
+import tkinter as tk
+import tkinter.font as tkfont
+
+
+class VirtualListbox(tk.Frame):
+    """
+    Listbox + scrollbar that only holds the rows currently on screen.
+
+    Rows come from the model through row_count() and row_text(index), so a
+    closet with 100k items still costs one screenful of Tk rows. Tell the
+    widget about model changes with row_changed / row_inserted /
+    row_deleted (or refresh() for anything else); each of those touches
+    at most the visible rows.
+
+    on_select(index) is called with the model index of the clicked row.
+    """
+
+    def __init__(self, parent, row_count, row_text, on_select=None,
+                 height=10, width=20, bg=None):
+        super().__init__(parent, bg=bg)
+        self.row_count = row_count
+        self.row_text = row_text
+        self.on_select = on_select
+
+        self.top = 0          # model index of the first visible row
+        self.rows = height    # how many rows fit (updated on resize)
+        self.selected = None  # model index, may be scrolled out of view
+
+        self.listbox = tk.Listbox(self, height=height, width=width,
+                                  exportselection=False)
+        self.scrollbar = tk.Scrollbar(self, orient="vertical",
+                                      command=self._on_scrollbar)
+        self.listbox.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.listbox.bind("<<ListboxSelect>>", self._on_listbox_select)
+        self.listbox.bind("<Configure>", self._on_resize)
+        self.listbox.bind("<MouseWheel>", self._on_wheel)
+        self.listbox.bind("<Button-4>", lambda e: self.scroll(-3))
+        self.listbox.bind("<Button-5>", lambda e: self.scroll(3))
+        self.listbox.bind("<Up>", lambda e: self._move(-1))
+        self.listbox.bind("<Down>", lambda e: self._move(1))
+        self.listbox.bind("<Prior>", lambda e: self._move(-self.rows))
+        self.listbox.bind("<Next>", lambda e: self._move(self.rows))
+
+    # ---------------- model changes ----------------
+    def refresh(self):
+        """Redraw the visible rows from the model."""
+        n = self.row_count()
+        self.top = max(0, min(self.top, n - self.rows))
+        end = min(n, self.top + self.rows)
+
+        self.listbox.delete(0, tk.END)
+        if end > self.top:
+            self.listbox.insert(0, *(self.row_text(i) for i in range(self.top, end)))
+        if self.selected is not None and self.top <= self.selected < end:
+            self.listbox.selection_set(self.selected - self.top)
+        self._update_scrollbar(n)
+
+    def row_changed(self, index: int):
+        if not self.top <= index < self.top + self.rows:
+            return
+        pos = index - self.top
+        self.listbox.delete(pos)
+        self.listbox.insert(pos, self.row_text(index))
+        if index == self.selected:
+            self.listbox.selection_set(pos)
+
+    def row_inserted(self, index: int):
+        if self.selected is not None and index <= self.selected:
+            self.selected += 1
+        self._rows_shifted(index)
+
+    def row_deleted(self, index: int):
+        if self.selected == index:
+            self.selected = None
+        elif self.selected is not None and index < self.selected:
+            self.selected -= 1
+        self._rows_shifted(index)
+
+    def _rows_shifted(self, index: int):
+        if index < self.top + self.rows:
+            self.refresh()
+        else:
+            self._update_scrollbar(self.row_count())
+
+    # ---------------- selection ----------------
+    def curselection(self) -> tuple:
+        return () if self.selected is None else (self.selected,)
+
+    def selection_clear(self):
+        self.selected = None
+        self.listbox.selection_clear(0, tk.END)
+
+    def select(self, index: int):
+        """Select a row (scrolling to it) and report it to on_select."""
+        self.selected = index
+        self.see(index)
+        if self.on_select:
+            self.on_select(index)
+
+    def see(self, index: int):
+        if index < self.top:
+            self.top = index
+        elif index >= self.top + self.rows:
+            self.top = index - self.rows + 1
+        self.refresh()
+
+    # ---------------- scrolling ----------------
+    def scroll(self, delta: int):
+        self.top += delta
+        self.refresh()
+
+    def _update_scrollbar(self, n: int):
+        if n <= self.rows:
+            self.scrollbar.set(0, 1)
+        else:
+            self.scrollbar.set(self.top / n, (self.top + self.rows) / n)
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.top = int(float(amount) * self.row_count())
+            self.refresh()
+        elif unit == "pages":
+            self.scroll(int(amount) * self.rows)
+        else:
+            self.scroll(int(amount))
+
+    def _on_wheel(self, event):
+        self.scroll(-3 if event.delta > 0 else 3)
+
+    def _on_resize(self, event):
+        linespace = tkfont.Font(font=self.listbox.cget("font")).metrics("linespace")
+        rows = max(1, event.height // (linespace + 1))
+        if rows != self.rows:
+            self.rows = rows
+            self.refresh()
+
+    # ---------------- events ----------------
+    def _on_listbox_select(self, event):
+        selection = self.listbox.curselection()
+        if selection:
+            self.selected = self.top + selection[0]
+            if self.on_select:
+                self.on_select(self.selected)
+
+    def _move(self, delta: int):
+        n = self.row_count()
+        if n:
+            current = -1 if self.selected is None and delta > 0 else (self.selected or 0)
+            self.select(max(0, min(n - 1, current + delta)))
+        return "break"
@@ -0,0 +1,81 @@
+# wear_history.py
+from array import array
+
+# how many past wears are remembered per item
+WEAR_SLOTS = 8
+
+
+class WearHistory:
+    """
+    When each item was last worn.
+
+    Days are day numbers (date.toordinal()). Each worn item has a small
+    array("I") ring buffer: slot 0 counts all wears ever recorded, the
+    other WEAR_SLOTS slots hold the most recent days, oldest overwritten
+    first. Items never worn take no space.
+    """
+
+    def __init__(self):
+        self._rings = {}  # item id -> array("I", [count, day, day, ...])
+
+    def __len__(self):
+        return len(self._rings)
+
+    def __contains__(self, item_id):
+        return item_id in self._rings
+
+    def record(self, item_id: int, day: int):
+        ring = self._rings.get(item_id)
+        if ring is None:
+            ring = self._rings[item_id] = array("I", bytes(4 * (WEAR_SLOTS + 1)))
+        ring[1 + ring[0] % WEAR_SLOTS] = day
+        ring[0] += 1
+
+    def days(self, item_id: int) -> list:
+        """Remembered days the item was worn, oldest first."""
+        ring = self._rings.get(item_id)
+        if ring is None:
+            return []
+        count = ring[0]
+        if count <= WEAR_SLOTS:
+            return ring[1:1 + count].tolist()
+        start = 1 + count % WEAR_SLOTS
+        return ring[start:].tolist() + ring[1:start].tolist()
+
+    def last_worn(self, item_id: int) -> int | None:
+        days = self.days(item_id)
+        return max(days) if days else None
+
+    def times_worn(self, item_id: int) -> int:
+        ring = self._rings.get(item_id)
+        return ring[0] if ring is not None else 0
+
+    def remove(self, item_id: int):
+        self._rings.pop(item_id, None)
+
+    def merge(self, keep_id: int, item_ids):
+        """Fold the history of item_ids into keep_id's (see Closet.merge_items)."""
+        days, count = self.days(keep_id), self.times_worn(keep_id)
+        for item_id in item_ids:
+            if item_id != keep_id and item_id in self._rings:
+                days += self.days(item_id)
+                count += self.times_worn(item_id)
+                self.remove(item_id)
+        if count:
+            self.restore(keep_id, count, sorted(days))
+
+    def restore(self, item_id: int, count: int, days: list):
+        """Set an item's history: count wears in total, days oldest first."""
+        days = days[-WEAR_SLOTS:]
+        if len(days) < WEAR_SLOTS:
+            count = len(days)  # a full history always has WEAR_SLOTS days
+        ring = self._rings[item_id] = array("I", bytes(4 * (WEAR_SLOTS + 1)))
+        ring[0] = count
+        # lay the days out as record() would have after count wears
+        for i, day in enumerate(days):
+            ring[1 + (count - len(days) + i) % WEAR_SLOTS] = day
+
+    def to_dict(self) -> dict:
+        # {item id: [times worn, day, day, ...]} -- the JSON "worn" section
+        return {str(item_id): [self.times_worn(item_id)] + self.days(item_id)
+                for item_id in self._rings}
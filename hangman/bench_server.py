@@ -0,0 +1,128 @@
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from typing import List, Optional
+
+# Load generator for server.py. Starts the server in a subprocess (one
+# process, one event loop: one core), opens --clients connections that
+# each keep a game going, guessing in letter-frequency order, and reports
+# moves per second, move latency and how many games were open at once.
+#
+#   python bench_server.py [--clients 2000] [--seconds 10] [--words big.txt]
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ORDER = "etaoinshrdlcumwfgypbvkjxqz"
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+async def wait_for_server(port: int, timeout: float = 30):
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            return
+        except OSError:
+            if time.perf_counter() > deadline:
+                raise
+            await asyncio.sleep(0.05)
+
+async def client(port: int, deadline: float, seed: int, latencies: List[float],
+                 stats: dict, think: float):
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+
+    async def ask(line: str) -> List[str]:
+        start = time.perf_counter()
+        writer.write(line.encode("ascii") + b"\n")
+        reply = (await reader.readline()).decode("ascii").split()
+        latencies.append(time.perf_counter() - start)
+        if not reply or reply[0] == "ERR":
+            stats["errors"] += 1
+        return reply
+
+    try:
+        # stagger the start so the clients don't move in lockstep
+        await asyncio.sleep(rng.random() * max(think, 0.01))
+        while time.perf_counter() < deadline:
+            reply = await ask("NEW " + rng.choice(("easy", "medium", "hard")))
+            if reply[0] != "GAME":
+                break
+            sid = reply[1]
+            for letter in ORDER:
+                if think:
+                    await asyncio.sleep(think * (0.5 + rng.random()))
+                reply = await ask(f"GUESS {sid} {letter}")
+                if reply[0] in ("WON", "LOST"):
+                    stats["won" if reply[0] == "WON" else "lost"] += 1
+                    break
+                if reply[0] == "ERR":
+                    break
+    finally:
+        writer.close()
+
+async def sample_sessions(port: int, deadline: float, peak: dict):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        while time.perf_counter() < deadline:
+            writer.write(b"STATS\n")
+            sessions = int((await reader.readline()).split()[1])
+            peak["sessions"] = max(peak["sessions"], sessions)
+            await asyncio.sleep(0.25)
+    finally:
+        writer.close()
+
+async def run_clients(port: int, clients: int, seconds: float, think: float):
+    await wait_for_server(port)
+    latencies: List[float] = []
+    stats = {"won": 0, "lost": 0, "errors": 0}
+    peak = {"sessions": 0}
+    start = time.perf_counter()
+    deadline = start + seconds
+    await asyncio.gather(
+        sample_sessions(port, deadline, peak),
+        *(client(port, deadline, seed, latencies, stats, think) for seed in range(clients)),
+    )
+    return latencies, stats, peak["sessions"], time.perf_counter() - start
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Load test the Hangman server.")
+    parser.add_argument("--clients", type=int, default=2000)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--think", type=float, default=0.05,
+                        help="average seconds between a client's moves (0 = flat out)")
+    parser.add_argument("--words", help="word list file for the server")
+    args = parser.parse_args(argv)
+
+    port = free_port()
+    command = [sys.executable, os.path.join(HERE, "server.py"), "--port", str(port)]
+    if args.words:
+        command += ["--words", args.words]
+    server = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+    try:
+        latencies, stats, peak, elapsed = asyncio.run(
+            run_clients(port, args.clients, args.seconds, args.think))
+    finally:
+        server.terminate()
+        server.wait()
+
+    latencies.sort()
+    count = len(latencies)
+    print(f"{args.clients} clients, think {args.think * 1000:.0f} ms, {elapsed:.1f}s")
+    print(f"peak concurrent games: {peak}")
+    print(f"{count} moves: {count / elapsed:,.0f}/s; games won {stats['won']}, "
+          f"lost {stats['lost']}, errors {stats['errors']}")
+    if count:
+        for label, q in (("p50", 0.50), ("p90", 0.90), ("p99", 0.99)):
+            print(f"  {label}: {latencies[min(count - 1, int(q * count))] * 1000:.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+import argparse
+import hashlib
+import heapq
+import json
+import math
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from wordlist import GROUP, HEADER, MAGIC, MAX_LENGTH, MIN_LENGTH, WordList, word_from_line
+
+# Builds a word list file (see wordlist.py) from raw text sources: one
+# word per line, read with wordlist.word_from_line like any other list.
+#
+#   python build_words.py -o words.hwl big.txt names.txt [--workers 8]
+#
+# Each source is cut into CHUNK_BYTES pieces that worker processes read,
+# normalize and de-duplicate on their own, writing one sorted "run" file
+# per word length. Runs are merged (heapq.merge, so never more than a line
+# per file in memory) into one file per source and length, kept in the
+# build folder with the source's size and mtime: rebuilding after one
+# source changes only re-reads that source. The final merge across sources
+# writes the word list's blobs directly.
+BUILD_DIR = ".wordbuild"
+MANIFEST = "manifest.json"
+CHUNK_BYTES = 8 << 20
+SCORE_BINS = 4096
+
+def chunk_ranges(path: str, chunk_bytes: int = CHUNK_BYTES) -> List[Tuple[int, int]]:
+    size = os.path.getsize(path)
+    return [(start, min(start + chunk_bytes, size)) for start in range(0, size, chunk_bytes)]
+
+def read_range(path: str, start: int, end: int) -> Iterator[bytes]:
+    """Lines that start within [start, end) of the file."""
+    with open(path, "rb") as f:
+        if start:
+            f.seek(start - 1)
+            f.readline()  # the line under start belongs to the previous range
+        while f.tell() < end:
+            line = f.readline()
+            if not line:
+                break
+            yield line
+
+def merge_runs(paths: List[str], out_path: str) -> int:
+    """Merge sorted word files into one, dropping duplicates; returns the count."""
+    files = [open(path, "r", encoding="ascii") for path in paths]
+    count = 0
+    try:
+        with open(out_path, "w", encoding="ascii") as out:
+            last = None
+            for line in heapq.merge(*files):
+                if line != last:
+                    out.write(line)
+                    count += 1
+                    last = line
+    finally:
+        for f in files:
+            f.close()
+    return count
+
+def _process_chunk(path: str, start: int, end: int, prefix: str,
+                   min_length: int, max_length: int) -> dict:
+    groups: Dict[int, set] = {}
+    lines = rejected = 0
+    for raw in read_range(path, start, end):
+        lines += 1
+        word = word_from_line(raw.decode("utf-8", "replace"), min_length, max_length)
+        if word is None:
+            rejected += 1
+            continue
+        groups.setdefault(len(word), set()).add(word)
+    for length, words in groups.items():
+        with open(f"{prefix}.{length}", "w", encoding="ascii") as f:
+            f.write("".join(word + "\n" for word in sorted(words)))
+    return {"lines": lines, "rejected": rejected, "lengths": sorted(groups)}
+
+def _merge_job(paths: List[str], out_path: str, remove: bool) -> int:
+    count = merge_runs(paths, out_path)
+    if remove:
+        for path in paths:
+            os.remove(path)
+    return count
+
+def _letter_counts(path: str) -> List[int]:
+    counts = [0] * 26
+    with open(path, "r", encoding="ascii") as f:
+        for line in f:
+            for ch in set(line.rstrip("\n")):
+                counts[ord(ch) - 97] += 1
+    return counts
+
+def _rarities(path: str, costs: List[float]) -> Iterator[float]:
+    with open(path, "r", encoding="ascii") as f:
+        for line in f:
+            letters = set(line.rstrip("\n"))
+            yield sum(costs[ord(ch) - 97] for ch in letters) / len(letters)
+
+def _bin(value: float, top: float) -> int:
+    return min(SCORE_BINS - 1, int(value / top * SCORE_BINS))
+
+def _histogram(path: str, costs: List[float], top: float) -> List[int]:
+    bins = [0] * SCORE_BINS
+    for value in _rarities(path, costs):
+        bins[_bin(value, top)] += 1
+    return bins
+
+def _write_scores(path: str, costs: List[float], top: float, table: bytes, out_path: str):
+    with open(out_path, "wb") as out:
+        out.write(bytes(table[_bin(value, top)] for value in _rarities(path, costs)))
+
+class Builder:
+    """One build folder: per-source merged runs plus a manifest of what they came from."""
+
+    def __init__(self, build_dir: str = BUILD_DIR, workers: Optional[int] = None,
+                 min_length: int = MIN_LENGTH, max_length: int = MAX_LENGTH,
+                 on_progress=print):
+        self.build_dir = build_dir
+        self.workers = workers
+        self.min_length = min_length
+        self.max_length = max_length
+        self.on_progress = on_progress or (lambda message: None)
+        os.makedirs(build_dir, exist_ok=True)
+        self.manifest_path = os.path.join(build_dir, MANIFEST)
+        try:
+            with open(self.manifest_path, "r") as f:
+                self.manifest = json.load(f)
+        except (OSError, ValueError):
+            self.manifest = {}
+        self.manifest.setdefault("sources", {})
+
+    def build(self, sources: List[str], output: str) -> dict:
+        sources = [os.path.abspath(path) for path in sources]
+        settings = [self.min_length, self.max_length]
+        if self.manifest.get("settings") != settings:
+            self.manifest = {"sources": {}, "settings": settings}
+
+        with ProcessPoolExecutor(self.workers) as pool:
+            stale = [path for path in sources if not self._is_current(path)]
+            for path in sources:
+                if path in stale:
+                    self._process_source(pool, path)
+                else:
+                    self.on_progress(f"{path}: unchanged")
+            for path in list(self.manifest["sources"]):
+                if path not in sources:  # source dropped from the build
+                    shutil.rmtree(self._source_dir(path), ignore_errors=True)
+                    del self.manifest["sources"][path]
+            self._save_manifest()
+
+            signature = [[path, self.manifest["sources"][path]["size"],
+                          self.manifest["sources"][path]["mtime_ns"]] for path in sources]
+            output = os.path.abspath(output)
+            previous = self.manifest.get("output", {})
+            if (not stale and previous.get("path") == output
+                    and previous.get("sources") == signature and os.path.exists(output)
+                    and os.path.getmtime(output) == previous.get("mtime")):
+                self.on_progress(f"{output}: up to date")
+                return previous["summary"]
+
+            summary = self._write_output(pool, sources, output)
+
+        self.manifest["output"] = {"path": output, "sources": signature,
+                                   "mtime": os.path.getmtime(output), "summary": summary}
+        self._save_manifest()
+        return summary
+
+    def _source_dir(self, path: str) -> str:
+        return os.path.join(self.build_dir, hashlib.sha1(path.encode("utf-8")).hexdigest()[:16])
+
+    def _is_current(self, path: str) -> bool:
+        entry = self.manifest["sources"].get(path)
+        st = os.stat(path)
+        return (entry is not None and entry["size"] == st.st_size
+                and entry["mtime_ns"] == st.st_mtime_ns
+                and all(os.path.exists(os.path.join(self._source_dir(path), f"len_{length}.txt"))
+                        for length in entry["counts"]))
+
+    def _process_source(self, pool, path: str):
+        start_time = time.perf_counter()
+        st = os.stat(path)
+        folder = self._source_dir(path)
+        shutil.rmtree(folder, ignore_errors=True)
+        os.makedirs(folder)
+
+        ranges = chunk_ranges(path)
+        futures = [pool.submit(_process_chunk, path, start, end,
+                               os.path.join(folder, f"chunk_{i:05}"),
+                               self.min_length, self.max_length)
+                   for i, (start, end) in enumerate(ranges)]
+        lines = rejected = 0
+        runs: Dict[int, List[str]] = {}
+        for i, future in enumerate(futures):
+            result = future.result()
+            lines += result["lines"]
+            rejected += result["rejected"]
+            for length in result["lengths"]:
+                runs.setdefault(length, []).append(os.path.join(folder, f"chunk_{i:05}.{length}"))
+
+        merges = {length: pool.submit(_merge_job, paths,
+                                      os.path.join(folder, f"len_{length}.txt"), True)
+                  for length, paths in runs.items()}
+        counts = {str(length): future.result() for length, future in merges.items()}
+
+        self.manifest["sources"][path] = {
+            "size": st.st_size, "mtime_ns": st.st_mtime_ns, "counts": counts,
+            "lines": lines, "rejected": rejected,
+        }
+        self.on_progress(f"{path}: {lines} lines in {len(ranges)} chunks, {rejected} rejected, "
+                         f"{sum(counts.values())} unique, {time.perf_counter() - start_time:.1f}s")
+
+    def _write_output(self, pool, sources: List[str], output: str) -> dict:
+        start_time = time.perf_counter()
+        merged_dir = os.path.join(self.build_dir, "merged")
+        shutil.rmtree(merged_dir, ignore_errors=True)
+        os.makedirs(merged_dir)
+
+        # 1. one sorted, de-duplicated file per length across all sources
+        by_length: Dict[int, List[str]] = {}
+        for path in sources:
+            for length in self.manifest["sources"][path]["counts"]:
+                by_length.setdefault(int(length), []).append(
+                    os.path.join(self._source_dir(path), f"len_{length}.txt"))
+        lengths = sorted(by_length)
+        merged = {length: os.path.join(merged_dir, f"len_{length}.txt") for length in lengths}
+        futures = {length: pool.submit(_merge_job, by_length[length], merged[length], False)
+                   for length in lengths}
+        counts = {length: futures[length].result() for length in lengths}
+        total = sum(counts.values())
+
+        # 2. difficulty bytes, as in wordlist.rarity_scores but ranked through a
+        #    histogram so no per-word list is needed
+        letter_counts = [0] * 26
+        for counts_part in pool.map(_letter_counts, [merged[l] for l in lengths]):
+            letter_counts = [a + b for a, b in zip(letter_counts, counts_part)]
+        costs = [-math.log((c + 1) / (total + 1)) for c in letter_counts]
+        top = max(costs) + 1e-9
+        bins = [0] * SCORE_BINS
+        for part in pool.map(_histogram, [merged[l] for l in lengths],
+                             [costs] * len(lengths), [top] * len(lengths)):
+            bins = [a + b for a, b in zip(bins, part)]
+        table, below = bytearray(SCORE_BINS), 0
+        for i, n in enumerate(bins):
+            table[i] = min(255, int((below + n / 2) / max(1, total) * 256))
+            below += n
+        score_paths = {length: merged[length] + ".scores" for length in lengths}
+        list(pool.map(_write_scores, [merged[l] for l in lengths], [costs] * len(lengths),
+                      [top] * len(lengths), [bytes(table)] * len(lengths),
+                      [score_paths[l] for l in lengths]))
+
+        # 3. the word list file: header, then each group's words and scores
+        offset = HEADER.size + GROUP.size * len(lengths)
+        tmp = output + ".tmp"
+        with open(tmp, "wb") as out:
+            out.write(HEADER.pack(MAGIC, len(lengths)))
+            for length in lengths:
+                words_at = offset
+                scores_at = words_at + counts[length] * (length + 1)
+                out.write(GROUP.pack(length, counts[length], words_at, scores_at))
+                offset = scores_at + counts[length]
+            for length in lengths:
+                for path in (merged[length], score_paths[length]):
+                    with open(path, "rb") as f:
+                        shutil.copyfileobj(f, out)
+        if os.path.getsize(tmp) != offset:
+            raise RuntimeError(f"{tmp}: size doesn't match its header")
+        os.replace(tmp, output)
+        shutil.rmtree(merged_dir, ignore_errors=True)
+
+        summary = {"words": total, "lengths": {str(l): counts[l] for l in lengths},
+                   "bytes": os.path.getsize(output)}
+        self.on_progress(f"{output}: {total} words, {summary['bytes'] / 1024:.0f} KiB, "
+                         f"{time.perf_counter() - start_time:.1f}s")
+        return summary
+
+    def _save_manifest(self):
+        tmp = self.manifest_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.manifest, f, indent=1)
+        os.replace(tmp, self.manifest_path)
+
+def main(argv: List[str]):
+    parser = argparse.ArgumentParser(description="Build a Hangman word list file.")
+    parser.add_argument("sources", nargs="+", help="text files, a word per line")
+    parser.add_argument("-o", "--output", required=True, help="word list file to write")
+    parser.add_argument("-w", "--workers", type=int, help="processes (default: CPUs)")
+    parser.add_argument("--build-dir", default=BUILD_DIR)
+    parser.add_argument("--min-length", type=int, default=MIN_LENGTH)
+    parser.add_argument("--max-length", type=int, default=MAX_LENGTH)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    builder = Builder(args.build_dir, args.workers, args.min_length, args.max_length)
+    builder.build(args.sources, args.output)
+    words = WordList(args.output)
+    print(f"done in {time.perf_counter() - start:.1f}s: {len(words)} words, "
+          f"lengths {words.lengths()[0]}-{words.lengths()[-1]}" if len(words) else "no words")
+    words.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,204 @@
+import argparse
+import os
+import random
+import struct
+import sys
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from weakref import WeakKeyDictionary
+
+from simulate import SolverStrategy, play
+from wordlist import DIFFICULTY, WordList, letter_costs, rank_scores, rarity, write_scores
+
+# A word list file's difficulties are its score bytes (see wordlist.py), so
+# WordList.choose and choose_word agree on the bands. score_wordlist
+# replaces the quick letter-rarity scores written by build_wordlist /
+# build_words with the solver's.
+#
+# Band index cache next to the word list (path + ".difficulty"), little-endian:
+#   b"HWD1", word list size, word list mtime (ns), word count
+#   scores: one byte per word, in WordList order (0 = easiest)
+#   per band in DIFFICULTY order: count, then that many u32 word indexes
+MAGIC = b"HWD1"
+HEADER = struct.Struct("<4sQQI")
+COUNT = struct.Struct("<I")
+CHUNK_WORDS = 500  # words per pool task
+
+def raw_difficulty(word: str, solver: SolverStrategy, costs: List[float]) -> float:
+    """
+    How hard word is: misses the solver makes guessing it, then (to order
+    the many words it gets without a miss) its guess count and how rare
+    its letters are.
+    """
+    _, guesses, wrong = play(word, solver, random.Random(0))
+    return wrong + 0.1 * guesses + 0.2 * rarity(word, costs)
+
+class Difficulty:
+    """Per-word scores plus, per band, the indexes of its words."""
+
+    def __init__(self, scores: bytes, buckets: Dict[str, array]):
+        self.scores = scores
+        self.buckets = buckets
+
+    @classmethod
+    def from_scores(cls, scores: bytes) -> "Difficulty":
+        buckets = {band: array("I") for band in DIFFICULTY}
+        for i, score in enumerate(scores):
+            for band, (low, high) in DIFFICULTY.items():
+                if low <= score <= high:
+                    buckets[band].append(i)
+                    break
+        return cls(scores, buckets)
+
+    def choose(self, words, band: str, rng=random) -> str:
+        """Random word of a band: one randrange and one lookup."""
+        bucket = self.buckets[band]
+        if not bucket:
+            raise ValueError(f"no {band} words")
+        return words[bucket[rng.randrange(len(bucket))]]
+
+    def save(self, path: str, source: str):
+        st = os.stat(source)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(HEADER.pack(MAGIC, st.st_size, st.st_mtime_ns, len(self.scores)))
+            f.write(self.scores)
+            for band in DIFFICULTY:
+                f.write(COUNT.pack(len(self.buckets[band])))
+                f.write(self.buckets[band].tobytes())
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str, source: str) -> Optional["Difficulty"]:
+        """The cached scores, or None if missing or older than the word list."""
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            st = os.stat(source)
+        except OSError:
+            return None
+        if len(data) < HEADER.size:
+            return None
+        magic, size, mtime_ns, count = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or (size, mtime_ns) != (st.st_size, st.st_mtime_ns):
+            return None
+        offset = HEADER.size + count
+        buckets = {}
+        for band in DIFFICULTY:
+            # a truncated or damaged file: rebuild rather than fail
+            if offset + COUNT.size > len(data):
+                return None
+            (n,) = COUNT.unpack_from(data, offset)
+            offset += COUNT.size
+            if offset + 4 * n > len(data):
+                return None
+            bucket = buckets[band] = array("I")
+            bucket.frombytes(data[offset:offset + 4 * n])
+            offset += 4 * n
+        if offset != len(data) or sum(map(len, buckets.values())) != count:
+            return None
+        return cls(data[HEADER.size:HEADER.size + count], buckets)
+
+# per worker process, for score_wordlist
+_wordlist: Optional[WordList] = None
+_solver: Optional[SolverStrategy] = None
+_costs: List[float] = []
+
+def _init_worker(path: str):
+    global _wordlist, _solver, _costs
+    _wordlist = WordList(path)
+    _solver = SolverStrategy(_wordlist)
+    _costs = letter_costs(_wordlist)
+
+def _score_chunk(length: int, start: int, stop: int) -> array:
+    return array("d", (raw_difficulty(_wordlist.word(length, i), _solver, _costs)
+                       for i in range(start, stop)))
+
+def score_words(words: List[str]) -> Difficulty:
+    """Score a small in-memory list (like words.WORDS) in this process."""
+    solver, costs = SolverStrategy(words), letter_costs(words)
+    raw = [raw_difficulty(word.lower(), solver, costs) for word in words]
+    return Difficulty.from_scores(bytes(rank_scores(raw)))
+
+def score_wordlist(path: str, workers: Optional[int] = None, on_progress=None) -> Difficulty:
+    """
+    Score every word of a word list file across a process pool, store the
+    scores in the file and cache the band indexes in path + ".difficulty".
+    """
+    words = WordList(path)
+    jobs = [(length, start, min(start + CHUNK_WORDS, words.count(length)))
+            for length in words.lengths()
+            for start in range(0, words.count(length), CHUNK_WORDS)]
+    words.close()
+
+    raw: List[float] = []
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(path,)) as pool:
+        futures = [pool.submit(_score_chunk, *job) for job in jobs]
+        # jobs are in word list order, so the chunks concatenate in order
+        for done, future in enumerate(futures, 1):
+            raw.extend(future.result())
+            if on_progress:
+                on_progress(done, len(futures))
+
+    scores = bytes(rank_scores(raw))
+    write_scores(path, scores)  # changes the file's mtime, so save the index after
+    difficulty = Difficulty.from_scores(scores)
+    difficulty.save(path + ".difficulty", path)
+    return difficulty
+
+def _wordlist_difficulty(words: WordList) -> Difficulty:
+    cache = words.path + ".difficulty"
+    difficulty = Difficulty.load(cache, words.path)
+    if difficulty is None:
+        difficulty = Difficulty.from_scores(words.scores())
+        try:
+            difficulty.save(cache, words.path)
+        except OSError:
+            pass  # only an index
+    return difficulty
+
+@lru_cache(maxsize=16)
+def _list_difficulty(words: Tuple[str, ...]) -> Difficulty:
+    return score_words(list(words))
+
+# per open WordList; dropped with it
+_loaded: "WeakKeyDictionary[WordList, Difficulty]" = WeakKeyDictionary()
+
+def difficulty_for(words) -> Difficulty:
+    """
+    Difficulty scores for a word list: a WordList's are its score bytes
+    (with the band indexes cached on disk), a plain list's are computed
+    in memory, once per distinct list. Finding a list's copies it, so
+    callers picking many words hold on to the result (see choose_word).
+    """
+    if isinstance(words, WordList):
+        if words not in _loaded:
+            _loaded[words] = _wordlist_difficulty(words)
+        return _loaded[words]
+    return _list_difficulty(tuple(words))
+
+def main(argv: List[str]):
+    parser = argparse.ArgumentParser(description="Score a word list for difficulty.")
+    parser.add_argument("words", help="word list (.hwl, or text to compile first)")
+    parser.add_argument("-w", "--workers", type=int, help="processes (default: CPUs)")
+    args = parser.parse_args(argv)
+
+    from wordlist import open_wordlist
+    words = open_wordlist(args.words)
+    start = time.perf_counter()
+
+    def progress(done: int, total: int):
+        print(f"\r{done}/{total} chunks", end="", flush=True)
+
+    difficulty = score_wordlist(words.path, args.workers, progress)
+    print(f"\nscored {len(words)} words in {time.perf_counter() - start:.1f}s")
+    for band, bucket in difficulty.buckets.items():
+        sample = ", ".join(difficulty.choose(words, band) for _ in range(5))
+        print(f"  {band:7} {len(bucket):8}  e.g. {sample}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
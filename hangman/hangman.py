@@ -1,5 +1,6 @@
 import random
-from typing import Set, Tuple, List
+from functools import lru_cache
+from typing import Iterable, List, Optional, Set, Tuple
 
 HANGMAN_PICS = [
     """
@@ -67,8 +68,118 @@ HANGMAN_PICS = [
     """,
 ]
 
-def choose_word(words: List[str]) -> str:
-    """Pick a random word from the list."""
+# Letters as bits: bit 0 is 'a', bit 25 is 'z'.
+# GameState.guess results
+MISS, HIT, REPEAT = 0, 1, 2
+
+def letter_bit(ch: str) -> int:
+    """Bit for a lowercase letter (0 for anything else)."""
+    if len(ch) != 1:
+        return 0
+    i = ord(ch) - 97
+    return 1 << i if 0 <= i < 26 else 0
+
+def letters_mask(letters: Iterable[str]) -> int:
+    mask = 0
+    for ch in letters:
+        mask |= letter_bit(ch)
+    return mask
+
+def mask_letters(mask: int) -> str:
+    """'abc' for a mask with the a, b and c bits set."""
+    return "".join(chr(97 + i) for i in range(26) if mask >> i & 1)
+
+@lru_cache(maxsize=4096)
+def secret_masks(secret: str) -> Tuple[int, Tuple[int, ...], str]:
+    """
+    (letters, positions, others) for a secret word: the mask of its
+    letters, positions[i] = bitmask of where letter i occurs, and any
+    characters that aren't a-z.
+    """
+    positions = [0] * 26
+    letters = 0
+    others = ""
+    for pos, ch in enumerate(secret):
+        bit = letter_bit(ch)
+        if bit:
+            letters |= bit
+            positions[bit.bit_length() - 1] |= 1 << pos
+        elif ch not in others:
+            others += ch
+    return letters, tuple(positions), others
+
+class GameState:
+    """
+    One game of Hangman as a few integers.
+
+    guessed is the mask of letters tried so far and remaining the mask of
+    the secret's letters not found yet, so a guess is a couple of bit
+    operations and the game is won when remaining hits 0. positions (see
+    secret_masks) says where each letter shows up in the word.
+    """
+    __slots__ = ("secret", "letters", "positions", "guessed", "remaining", "wrong")
+
+    def __init__(self, secret: str):
+        self.secret = secret
+        self.letters, self.positions, _ = secret_masks(secret)
+        self.guessed = 0
+        self.remaining = self.letters
+        self.wrong = 0  # misses (repeats don't count)
+
+    def guess(self, letter: str) -> int:
+        """
+        Apply a single-letter guess; returns HIT, MISS or REPEAT.
+        Raises ValueError for anything but one lowercase a-z letter.
+        """
+        bit = letter_bit(letter)
+        if not bit:
+            # bit 0 would never be REPEAT, so the same bad guess would miss every time
+            raise ValueError(f"guess must be a single letter a-z, not {letter!r}")
+        if self.guessed & bit:
+            return REPEAT
+        self.guessed |= bit
+        if self.letters & bit:
+            self.remaining &= ~bit
+            return HIT
+        self.wrong += 1
+        return MISS
+
+    def is_won(self) -> bool:
+        return not self.remaining
+
+    def revealed(self) -> int:
+        """Bitmask of the positions in the word that have been found."""
+        found = 0
+        hits = self.guessed & self.letters
+        while hits:
+            low = hits & -hits
+            found |= self.positions[low.bit_length() - 1]
+            hits ^= low
+        return found
+
+    def reveal(self) -> str:
+        """The masked word like 'p _ t h o n'."""
+        found = self.revealed()
+        return " ".join(c if found >> i & 1 else "_" for i, c in enumerate(self.secret))
+
+def guess_message(guess: str, outcome: int) -> str:
+    if outcome == REPEAT:
+        return f"You already guessed '{guess}'."
+    if outcome == HIT:
+        return f"Nice! '{guess}' is in the word."
+    return f"Oops! '{guess}' is not in the word."
+
+def choose_word(words: List[str], difficulty: Optional[str] = None, bands=None) -> str:
+    """
+    Pick a random word from the list, optionally from a band ('easy', 'medium', 'hard').
+    bands is difficulty.difficulty_for(words); pass it when picking many words,
+    since looking it up goes over the whole list.
+    """
+    if difficulty:
+        if bands is None:
+            from difficulty import difficulty_for
+            bands = difficulty_for(words)
+        return bands.choose(words, difficulty).lower()
     return random.choice(words).lower()
 
 def reveal_progress(secret: str, guessed: Set[str]) -> str:
@@ -81,15 +192,17 @@ def process_guess(secret: str, guess: str, guessed: Set[str]) -> Tuple[bool, str
     Returns (is_correct, message).
     """
     if guess in guessed:
-        return False, f"You already guessed '{guess}'."
+        return False, guess_message(guess, REPEAT)
     guessed.add(guess)
-    if guess in secret:
-        return True, f"Nice! '{guess}' is in the word."
-    return False, f"Oops! '{guess}' is not in the word."
+    bit = letter_bit(guess)
+    if (secret_masks(secret)[0] & bit) if bit else guess in secret:
+        return True, guess_message(guess, HIT)
+    return False, guess_message(guess, MISS)
 
 def is_won(secret: str, guessed: Set[str]) -> bool:
     """All letters revealed?"""
-    return all(c in guessed for c in secret)
+    letters, _, others = secret_masks(secret)
+    return not letters & ~letters_mask(guessed) and all(c in guessed for c in others)
 
 def draw_stage(wrong_guesses: int) -> str:
     """ASCII art based on wrong guess count."""
@@ -1,64 +1,103 @@
-from typing import Set
+import getpass
+import sys
+import time
+from typing import Optional
+
 from words import WORDS
-from hangman import choose_word, reveal_progress, process_guess, is_won, draw_stage
+from hangman import GameState, HIT, choose_word, guess_message
+from render import Screen, make_screen, turn_lines
+from stats import GameResult, StatsStore
 
 MAX_WRONG = 6  # number of wrong guesses allowed (matches last ASCII stage)
 
-def get_letter(prompt: str) -> str:
+def get_letter(prompt: str, screen: Optional[Screen] = None) -> str:
     """Ask user for a single A–Z letter, lowercased."""
+    screen = screen or Screen()
     while True:
-        raw = input(prompt).strip().lower()
-        if len(raw) != 1 or not raw.isalpha():
-            print("Please enter a single letter (A–Z).")
+        raw = screen.ask(prompt).strip().lower()
+        if len(raw) != 1 or not "a" <= raw <= "z":  # isalpha() lets 'é' through
+            screen.say("Please enter a single letter (A–Z).")
             continue
         return raw
 
-def play_one_round() -> None:
-    secret = choose_word(WORDS)
-    guessed: Set[str] = set()
-    wrong = 0
+def get_difficulty() -> str:
+    """Ask for a difficulty band; '' means any word."""
+    while True:
+        raw = input("Difficulty (easy/medium/hard, Enter for any): ").strip().lower()
+        if raw in ("", "easy", "medium", "hard"):
+            return raw
+        print("Please type easy, medium or hard.")
+
+def play_one_round(words=WORDS, difficulty: str = "", screen: Optional[Screen] = None,
+                   player: str = "player", bands=None) -> GameResult:
+    secret = choose_word(words, difficulty, bands)
+    state = GameState(secret)
+    wrong = 0  # misses, plus repeated guesses
+    guesses = []
+    started = time.monotonic()
+    screen = screen or make_screen()
 
-    print("\n=== Hangman ===")
-    print("Guess the word, one letter at a time.")
-    print(f"(You can miss up to {MAX_WRONG} times.)")
+    screen.start([
+        "=== Hangman ===",
+        "Guess the word, one letter at a time.",
+        f"(You can miss up to {MAX_WRONG} times.)",
+    ])
+    message = ""
 
     while True:
-        print(draw_stage(wrong))
-        print("Word:  ", reveal_progress(secret, guessed))
-        print("Used:  ", " ".join(sorted(guessed)) or "—")
-        print(f"Wrong: {wrong}/{MAX_WRONG}")
+        screen.show(turn_lines(state, wrong, MAX_WRONG, message))
 
-        guess = get_letter("Your guess: ")
+        guess = get_letter("Your guess: ", screen)
+        guesses.append(guess)
 
-        correct, msg = process_guess(secret, guess, guessed)
-        print(msg)
+        outcome = state.guess(guess)
+        message = guess_message(guess, outcome)
 
-        if not correct:
+        if outcome != HIT:
             wrong += 1
 
         # Check end conditions
-        if is_won(secret, guessed):
-            print("\n🎉 You win! The word was:", secret)
-            print(draw_stage(wrong))
+        if state.is_won():
+            screen.show(turn_lines(state, wrong, MAX_WRONG, message))
+            screen.finish(["", f"🎉 You win! The word was: {secret}"])
             break
 
         if wrong > MAX_WRONG:
             # Safety guard (shouldn’t trigger if MAX_WRONG matches stages)
-            print("\nOut of guesses! The word was:", secret)
+            screen.finish(["", f"Out of guesses! The word was: {secret}"])
             break
 
         if wrong == MAX_WRONG:
-            print(draw_stage(wrong))
-            print("\n💀 Game over! The word was:", secret)
+            screen.show(turn_lines(state, wrong, MAX_WRONG, message))
+            screen.finish(["", f"💀 Game over! The word was: {secret}"])
             break
 
+    return GameResult(player, secret, "".join(guesses), state.is_won(), wrong,
+                      round(time.monotonic() - started, 3), time.time())
+
 def main():
-    while True:
-        play_one_round()
-        again = input("\nPlay again? (y/n): ").strip().lower()
-        if again != "y":
-            print("Thanks for playing! Bye 👋")
-            return
+    words = WORDS
+    if len(sys.argv) > 1:
+        # python main.py words.txt -- any word list instead of the built-in one
+        from wordlist import open_wordlist
+        words = open_wordlist(sys.argv[1])
+    difficulty = get_difficulty()
+    bands = None
+    if difficulty:
+        # scored once here, not on every round
+        from difficulty import difficulty_for
+        bands = difficulty_for(words)
+    stats = StatsStore()
+    player = getpass.getuser()
+    try:
+        while True:
+            stats.record(play_one_round(words, difficulty, player=player, bands=bands))
+            again = input("\nPlay again? (y/n): ").strip().lower()
+            if again != "y":
+                print("Thanks for playing! Bye 👋")
+                return
+    finally:
+        stats.close()
 
 if __name__ == "__main__":
     main()
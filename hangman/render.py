@@ -0,0 +1,142 @@
+import io
+import sys
+from typing import Callable, List, Tuple
+
+from hangman import HANGMAN_PICS, HIT, GameState, mask_letters
+
+CLEAR = "\x1b[2J\x1b[H"
+CLEAR_LINE = "\x1b[K"
+CLEAR_BELOW = "\x1b[J"
+
+# HANGMAN_PICS split into lines once, so a turn never re-splits the art
+FRAMES: List[Tuple[str, ...]] = [tuple(pic.split("\n")) for pic in HANGMAN_PICS]
+
+def frame(wrong: int) -> Tuple[str, ...]:
+    """Lines of the stage for wrong guesses (clamped like draw_stage)."""
+    return FRAMES[max(0, min(wrong, len(FRAMES) - 1))]
+
+def turn_lines(state: GameState, wrong: int, max_wrong: int, message: str = "") -> List[str]:
+    """Everything shown for one turn, stage first and message last."""
+    used = " ".join(mask_letters(state.guessed)) or "—"
+    return [*frame(wrong), f"Word:   {state.reveal()}", f"Used:   {used}",
+            f"Wrong: {wrong}/{max_wrong}", message]
+
+def _move(row: int, column: int = 1) -> str:
+    return f"\x1b[{row};{column}H"
+
+def _common_prefix(a: str, b: str) -> int:
+    n = min(len(a), len(b))
+    i = 0
+    while i < n and a[i] == b[i]:
+        i += 1
+    return i
+
+class Screen:
+    """
+    Plain output: each turn's lines and the prompt go out in one write.
+    turn_bytes records how much was written per turn (UTF-8 bytes).
+    """
+
+    def __init__(self, out=None, read: Callable[[], str] = input):
+        self.out = out or sys.stdout
+        self.read = read
+        self.turn_bytes: List[int] = []
+        self._pending = ""
+
+    def start(self, header: List[str]):
+        self._pending = "\n" + "\n".join(header) + "\n"
+
+    def show(self, lines: List[str]):
+        self._pending += "\n".join(lines) + "\n"
+
+    def say(self, text: str):
+        """A one-line message, e.g. for bad input."""
+        self._pending += text + "\n"
+
+    def ask(self, prompt: str) -> str:
+        self._write(self._pending + prompt)
+        return self.read()
+
+    def finish(self, lines: List[str]):
+        self._write(self._pending + "\n".join(lines) + "\n")
+
+    def bytes_per_turn(self) -> float:
+        return sum(self.turn_bytes) / len(self.turn_bytes) if self.turn_bytes else 0.0
+
+    def _write(self, text: str):
+        self.out.write(text)
+        self.out.flush()
+        self.turn_bytes.append(len(text.encode("utf-8")))
+        self._pending = ""
+
+class TerminalScreen(Screen):
+    """
+    ANSI terminal output: the screen is drawn once, then each turn only
+    rewrites what changed, moving the cursor to it.
+    """
+
+    def start(self, header: List[str]):
+        self._top = len(header) + 1  # rows above the turn lines (header + blank)
+        self._shown: List[str] = []
+        self._pending = CLEAR + "\n".join(header) + "\n"
+
+    def show(self, lines: List[str]):
+        parts = [self._pending]
+        for i, line in enumerate(lines):
+            old = self._shown[i] if i < len(self._shown) else ""
+            if old != line:
+                # rewrite from the first changed column (columns are only
+                # predictable while the unchanged start is plain ASCII)
+                same = _common_prefix(old, line)
+                if not line[:same].isascii():
+                    same = 0
+                parts.append(_move(self._top + i + 1, same + 1) + line[same:] + CLEAR_LINE)
+        for i in range(len(lines), len(self._shown)):
+            parts.append(_move(self._top + i + 1) + CLEAR_LINE)
+        self._shown = list(lines)
+        self._pending = "".join(parts)
+
+    def say(self, text: str):
+        # the message line is the last one
+        self.show(self._shown[:-1] + [text])
+
+    def ask(self, prompt: str) -> str:
+        # prompt goes on its own row; clearing it also wipes the last answer
+        self._write(self._pending + _move(self._prompt_row()) + prompt + CLEAR_LINE)
+        return self.read()
+
+    def finish(self, lines: List[str]):
+        self._write(self._pending + _move(self._prompt_row()) + CLEAR_BELOW
+                    + "\n".join(lines) + "\n")
+
+    def _prompt_row(self) -> int:
+        return self._top + len(self._shown) + 1
+
+def make_screen(out=None) -> Screen:
+    """TerminalScreen when writing to a terminal, plain Screen otherwise."""
+    out = out or sys.stdout
+    return TerminalScreen(out) if out.isatty() else Screen(out)
+
+def main():
+    # bytes per turn for a sample game, full redraw vs changed lines only
+    from main import MAX_WRONG
+    secret, guesses = "frankenstein", "etaoinsrkfh"
+    for screen in (Screen(io.StringIO()), TerminalScreen(io.StringIO())):
+        answers = iter(guesses)
+        screen.read = lambda: next(answers)
+        state, wrong = GameState(secret), 0
+        screen.start(["=== Hangman ==="])
+        message = ""
+        while not state.is_won() and wrong < MAX_WRONG:
+            screen.show(turn_lines(state, wrong, MAX_WRONG, message))
+            letter = screen.ask("Your guess: ")
+            outcome = state.guess(letter)
+            wrong += outcome != HIT
+            message = f"guessed {letter}"
+        screen.finish(["done"])
+        print(f"{type(screen).__name__:15} {len(screen.turn_bytes)} writes, "
+              f"{sum(screen.turn_bytes)} bytes, {screen.bytes_per_turn():.0f} bytes/turn, "
+              f"first {screen.turn_bytes[0]}, then {screen.turn_bytes[1:]}")
+
+if __name__ == "__main__":
+    main()
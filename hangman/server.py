@@ -0,0 +1,216 @@
+import argparse
+import asyncio
+import secrets
+import signal
+import sys
+import time
+from collections import OrderedDict
+from typing import List, Optional
+
+from hangman import HIT, GameState, choose_word
+from main import MAX_WRONG
+from words import WORDS
+
+# Line protocol (one command per line, one reply line per command):
+#   NEW [easy|medium|hard]  -> GAME <id> <pattern> <wrong> <max wrong>
+#   GUESS <id> <letter>     -> HIT|MISS|REPEAT <pattern> <wrong> <max wrong>
+#                              or, when that guess ends the game,
+#                              WON <word> <wrong> / LOST <word>
+#   STATS                   -> STATS <sessions> <started> <expired>
+#   QUIT                    -> (connection closed)
+# Errors are "ERR <message>". The pattern is the word with unfound
+# letters as "_", e.g. "p_th_n". Sessions belong to the id, not the
+# connection, so a client can reconnect and carry on.
+IDLE_SECONDS = 300
+MAX_SESSIONS = 200_000
+MAX_LINE = 128
+BANDS = ("easy", "medium", "hard")
+OUTCOMES = ("MISS", "HIT", "REPEAT")  # indexed by hangman's MISS, HIT, REPEAT
+
+class Session:
+    """A game in progress: GameState is a few ints, plus main.py's wrong count."""
+    __slots__ = ("state", "wrong", "seen")
+
+    def __init__(self, secret: str):
+        self.state = GameState(secret)
+        self.wrong = 0  # misses and repeats, as in main.py
+        self.seen = time.monotonic()
+
+    def pattern(self) -> str:
+        found = self.state.revealed()
+        return "".join(c if found >> i & 1 else "_" for i, c in enumerate(self.state.secret))
+
+class Sessions:
+    """
+    Games by id, least recently used first: touching a session moves it to
+    the end, so expiring idle ones only looks at the front.
+    """
+
+    def __init__(self, words, idle_seconds: float = IDLE_SECONDS,
+                 max_sessions: int = MAX_SESSIONS, bands=None):
+        self.words = words
+        self.bands = bands  # difficulty.difficulty_for(words), looked up on first use
+        self.idle_seconds = idle_seconds
+        self.max_sessions = max_sessions
+        self._games: "OrderedDict[str, Session]" = OrderedDict()
+        self.started = 0
+        self.expired = 0
+
+    def __len__(self):
+        return len(self._games)
+
+    def new(self, band: Optional[str]) -> str:
+        while len(self._games) >= self.max_sessions:
+            self._drop_oldest()
+            self.expired += 1
+        sid = secrets.token_urlsafe(6)
+        if band and self.bands is None:
+            from difficulty import difficulty_for
+            self.bands = difficulty_for(self.words)
+        self._games[sid] = Session(choose_word(self.words, band, self.bands))
+        self.started += 1
+        return sid
+
+    def get(self, sid: str) -> Optional[Session]:
+        session = self._games.get(sid)
+        if session is not None:
+            session.seen = time.monotonic()
+            self._games.move_to_end(sid)
+        return session
+
+    def end(self, sid: str):
+        self._games.pop(sid, None)
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """Drop sessions idle for idle_seconds; returns how many."""
+        cutoff = (now if now is not None else time.monotonic()) - self.idle_seconds
+        dropped = 0
+        while self._games and next(iter(self._games.values())).seen < cutoff:
+            self._drop_oldest()
+            dropped += 1
+        self.expired += dropped
+        return dropped
+
+    def _drop_oldest(self):
+        self._games.popitem(last=False)
+
+    async def expire_forever(self, interval: float = 5.0):
+        while True:
+            await asyncio.sleep(interval)
+            self.expire()
+
+def handle(sessions: Sessions, line: str) -> Optional[str]:
+    """Reply to one command line; None means close the connection."""
+    parts = line.split()
+    if not parts:
+        return "ERR empty command"
+    command = parts[0].upper()
+
+    if command == "NEW":
+        band = parts[1].lower() if len(parts) > 1 else None
+        if band is not None and band not in BANDS:
+            return "ERR difficulty must be easy, medium or hard"
+        sid = sessions.new(band)
+        session = sessions.get(sid)
+        return f"GAME {sid} {session.pattern()} 0 {MAX_WRONG}"
+
+    if command == "GUESS":
+        if len(parts) != 3:
+            return "ERR usage: GUESS <id> <letter>"
+        sid, guess = parts[1], parts[2].lower()
+        session = sessions.get(sid)
+        if session is None:
+            return "ERR no such game (finished or expired)"
+        if len(guess) != 1 or not "a" <= guess <= "z":
+            return "ERR guess a single letter a-z"
+        outcome = session.state.guess(guess)
+        if outcome != HIT:
+            session.wrong += 1
+        if session.state.is_won():
+            sessions.end(sid)
+            return f"WON {session.state.secret} {session.wrong}"
+        if session.wrong >= MAX_WRONG:
+            sessions.end(sid)
+            return f"LOST {session.state.secret}"
+        return f"{OUTCOMES[outcome]} {session.pattern()} {session.wrong} {MAX_WRONG}"
+
+    if command == "STATS":
+        return f"STATS {len(sessions)} {sessions.started} {sessions.expired}"
+    if command == "QUIT":
+        return None
+    return f"ERR unknown command {command}"
+
+async def serve_connection(sessions: Sessions, reader, writer):
+    try:
+        while True:
+            try:
+                raw = await reader.readuntil(b"\n")
+            except asyncio.LimitOverrunError:
+                writer.write(b"ERR line too long\n")
+                break
+            except (asyncio.IncompleteReadError, ConnectionError):
+                break
+            if not raw.isascii():
+                reply = "ERR commands must be ASCII"
+            else:
+                reply = handle(sessions, raw.decode("ascii"))
+            if reply is None:
+                break
+            # replies can quote the command back; never let that raise here
+            writer.write(reply.encode("ascii", "replace") + b"\n")
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+async def run_server(host: str, port: int, words_path: Optional[str] = None,
+                     idle_seconds: float = IDLE_SECONDS):
+    words = WORDS
+    if words_path:
+        from wordlist import open_wordlist
+        words = open_wordlist(words_path)
+    # index (or for WORDS, score) the bands now rather than on the first "NEW hard"
+    from difficulty import difficulty_for
+    sessions = Sessions(words, idle_seconds, bands=difficulty_for(words))
+    server = await asyncio.start_server(
+        lambda r, w: serve_connection(sessions, r, w), host, port, limit=MAX_LINE)
+    # at least every 5s, at most 10 times a second
+    interval = max(0.1, min(5.0, idle_seconds / 2))
+    expiry = asyncio.create_task(sessions.expire_forever(interval))
+    try:
+        asyncio.get_running_loop().add_signal_handler(
+            signal.SIGTERM, asyncio.current_task().cancel)
+    except NotImplementedError:  # Windows
+        pass
+    print(f"Hangman server on {host}:{port} ({len(words)} words)", flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    except asyncio.CancelledError:
+        pass
+    finally:
+        expiry.cancel()
+
+def _positive(text: str) -> float:
+    value = float(text)
+    if not value > 0:  # also rejects nan
+        raise argparse.ArgumentTypeError(f"must be more than 0, not {text}")
+    return value
+
+def main(argv: List[str]):
+    parser = argparse.ArgumentParser(description="Hangman line-protocol server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7777)
+    parser.add_argument("--words", help="word list file (default: words.WORDS)")
+    parser.add_argument("--idle", type=_positive, default=IDLE_SECONDS,
+                        help="seconds before an untouched game is dropped")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(run_server(args.host, args.port, args.words, args.idle))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,183 @@
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
+
+from hangman import choose_word, is_won, process_guess, reveal_progress
+from main import MAX_WRONG
+from solver import WordIndex
+from words import WORDS
+
+ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+CHUNK_GAMES = 200  # games per pool task
+
+class RandomStrategy:
+    """Any letter not tried yet."""
+
+    def __init__(self, words):
+        pass
+
+    def start(self, length: int):
+        pass
+
+    def guess(self, progress: str, guessed: Set[str], rng: random.Random) -> str:
+        return rng.choice([ch for ch in ALPHABET if ch not in guessed])
+
+class FrequencyStrategy:
+    """Letters in order of how many dictionary words contain them."""
+
+    def __init__(self, words):
+        counts = {ch: 0 for ch in ALPHABET}
+        for word in words:
+            for ch in set(word):
+                if ch in counts:
+                    counts[ch] += 1
+        self.order = sorted(ALPHABET, key=lambda ch: -counts[ch])
+
+    def start(self, length: int):
+        pass
+
+    def guess(self, progress: str, guessed: Set[str], rng: random.Random) -> str:
+        return next(ch for ch in self.order if ch not in guessed)
+
+class SolverStrategy:
+    """solver.Solver's best_guess, narrowing the dictionary every turn."""
+
+    def __init__(self, words):
+        self.index = WordIndex(words)
+        self.fallback = FrequencyStrategy(words)
+
+    def start(self, length: int):
+        self.solver = self.index.solver(length)
+
+    def guess(self, progress: str, guessed: Set[str], rng: random.Random) -> str:
+        shown = set(progress.replace(" ", ""))
+        self.solver.update(progress, (ch for ch in guessed if ch not in shown))
+        letter = self.solver.best_guess()
+        if letter is None or letter in guessed:  # secret isn't in the dictionary
+            return self.fallback.guess(progress, guessed, rng)
+        return letter
+
+STRATEGIES = {
+    "random": RandomStrategy,
+    "frequency": FrequencyStrategy,
+    "solver": SolverStrategy,
+}
+
+def play(secret: str, strategy, rng: random.Random) -> Tuple[bool, int, int]:
+    """One game under main.py's rules; returns (won, guesses, wrong)."""
+    guessed: Set[str] = set()
+    guesses = wrong = 0
+    strategy.start(len(secret))
+    while True:
+        letter = strategy.guess(reveal_progress(secret, guessed), guessed, rng)
+        guesses += 1
+        correct, _ = process_guess(secret, letter, guessed)
+        if not correct:
+            wrong += 1
+        if is_won(secret, guessed):
+            return True, guesses, wrong
+        if wrong >= MAX_WRONG:
+            return False, guesses, wrong
+
+# per worker process: the words and the strategies built on them
+_words = None
+_strategies: Dict[str, object] = {}
+
+def _init_worker(words_path: Optional[str]):
+    global _words
+    if words_path:
+        from wordlist import open_wordlist
+        _words = open_wordlist(words_path)
+    else:
+        _words = WORDS
+    _strategies.clear()
+
+def _strategy(name: str):
+    strategy = _strategies.get(name)
+    if strategy is None:
+        strategy = _strategies[name] = STRATEGIES[name](_words)
+    return strategy
+
+def run_chunk(name: str, games: int, seed: str) -> dict:
+    """Play games with one strategy; seed makes the chunk reproducible."""
+    strategy = _strategy(name)
+    rng = random.Random(seed)
+    random.seed(seed)  # choose_word uses the module-level generator
+    wins = guesses = wrong = 0
+    start = time.perf_counter()
+    for _ in range(games):
+        won, g, w = play(choose_word(_words), strategy, rng)
+        wins += won
+        guesses += g
+        wrong += w
+    return {"games": games, "wins": wins, "guesses": guesses, "wrong": wrong,
+            "cpu_s": time.perf_counter() - start}
+
+def simulate(strategies: List[str], games: int, workers: Optional[int] = None,
+             seed: int = 0, words_path: Optional[str] = None) -> dict:
+    """
+    Play games with each strategy across a process pool and report the
+    totals. Every chunk of CHUNK_GAMES has its own seed, so the results
+    don't depend on the number of workers.
+    """
+    workers = workers or os.cpu_count() or 1
+    report = {"games": games, "workers": workers, "seed": seed,
+              "words": words_path or "words.WORDS", "max_wrong": MAX_WRONG,
+              "strategies": {}}
+    chunks = [min(CHUNK_GAMES, games - start) for start in range(0, games, CHUNK_GAMES)]
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker,
+                             initargs=(words_path,)) as pool:
+        for name in strategies:
+            start = time.perf_counter()
+            futures = [pool.submit(run_chunk, name, n, f"{seed}:{name}:{i}")
+                       for i, n in enumerate(chunks)]
+            totals = {"games": 0, "wins": 0, "guesses": 0, "wrong": 0, "cpu_s": 0.0}
+            for future in futures:
+                for key, value in future.result().items():
+                    totals[key] += value
+            elapsed = time.perf_counter() - start
+            played = max(1, totals["games"])
+            report["strategies"][name] = {
+                "win_rate": totals["wins"] / played,
+                "guesses_per_game": totals["guesses"] / played,
+                "wrong_per_game": totals["wrong"] / played,
+                # wall clock, so includes worker startup and index building
+                "games_per_s": totals["games"] / elapsed,
+                "games_per_cpu_s": totals["games"] / max(totals["cpu_s"], 1e-9),
+                **totals,
+            }
+    return report
+
+def main(argv: List[str]):
+    parser = argparse.ArgumentParser(description="Play Hangman games headless.")
+    parser.add_argument("-n", "--games", type=int, default=10000,
+                        help="games per strategy")
+    parser.add_argument("-s", "--strategies", default=",".join(STRATEGIES),
+                        help="comma-separated, from: " + ", ".join(STRATEGIES))
+    parser.add_argument("-w", "--workers", type=int, help="processes (default: CPUs)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--words", help="word list file (default: words.WORDS)")
+    parser.add_argument("-o", "--output", help="write the JSON report here too")
+    args = parser.parse_args(argv)
+
+    names = [name.strip() for name in args.strategies.split(",") if name.strip()]
+    unknown = [name for name in names if name not in STRATEGIES]
+    if unknown:
+        parser.error(f"unknown strategy: {', '.join(unknown)}")
+
+    report = simulate(names, args.games, args.workers, args.seed, args.words)
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,189 @@
+import math
+from typing import Dict, Iterable, List, Optional, Set
+
+from hangman import letter_bit, mask_letters
+
+# Below this many candidates, letters are scored on the exact split of the
+# candidates by where the letter shows up; above it, on per-position counts.
+EXACT_LIMIT = 256
+
+def _bitset(indexes: List[int], size: int) -> int:
+    bits = bytearray((size + 7) // 8)
+    for i in indexes:
+        bits[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(bits, "little")
+
+def _checked_bit(letter: str) -> int:
+    # letter_bit gives 0 for non a-z, which would index row[-1] below
+    bit = letter_bit(letter)
+    if not bit:
+        raise ValueError(f"not a letter a-z: {letter!r}")
+    return bit
+
+class LengthGroup:
+    """
+    Words of one length as bitsets over their index in self.words:
+    at[pos][letter] holds the words with that letter at pos, has[letter]
+    the words containing it anywhere. Filtering candidates is then a few
+    big-integer ANDs instead of a pass over the words.
+    """
+
+    def __init__(self, words: List[str]):
+        self.words = words
+        n, length = len(words), len(words[0]) if words else 0
+        at_lists = [[[] for _ in range(26)] for _ in range(length)]
+        for i, word in enumerate(words):
+            for pos, ch in enumerate(word):
+                at_lists[pos][ord(ch) - 97].append(i)
+        self.at = [[_bitset(ids, n) for ids in row] for row in at_lists]
+        self.has = [0] * 26
+        for row in self.at:
+            for letter, bits in enumerate(row):
+                self.has[letter] |= bits
+        self.all = (1 << n) - 1
+
+class WordIndex:
+    """Dictionary grouped by word length; each group is indexed on first use."""
+
+    def __init__(self, words: Iterable[str]):
+        self._by_length: Dict[int, List[str]] = {}
+        for word in sorted(set(w.lower() for w in words)):
+            if word.isascii() and word.isalpha():
+                self._by_length.setdefault(len(word), []).append(word)
+        self._groups: Dict[int, LengthGroup] = {}
+
+    def __len__(self):
+        return sum(len(words) for words in self._by_length.values())
+
+    def group(self, length: int) -> LengthGroup:
+        group = self._groups.get(length)
+        if group is None:
+            group = self._groups[length] = LengthGroup(self._by_length.get(length, []))
+        return group
+
+    def solver(self, length: int) -> "Solver":
+        return Solver(self.group(length))
+
+class Solver:
+    """
+    The candidate words of one game, narrowed with each guess.
+
+    Feed it results with hit()/miss(), or sync it from the reveal_progress
+    string with update(); best_guess() then suggests the next letter.
+    """
+
+    def __init__(self, group: LengthGroup):
+        self.group = group
+        self.candidates = group.all  # bitset of indexes into group.words
+        self.guessed = 0             # letter mask, like GameState.guessed
+
+    def hit(self, letter: str, positions: int):
+        """letter is in the word exactly at positions (bitmask)."""
+        bit = _checked_bit(letter)
+        self.guessed |= bit
+        i = bit.bit_length() - 1
+        for pos, row in enumerate(self.group.at):
+            if positions >> pos & 1:
+                self.candidates &= row[i]
+            else:
+                self.candidates &= ~row[i]
+
+    def miss(self, letter: str):
+        bit = _checked_bit(letter)
+        self.guessed |= bit
+        self.candidates &= ~self.group.has[bit.bit_length() - 1]
+
+    def update(self, progress: str, wrong: Iterable[str]):
+        """Catch up with a reveal_progress string ('p _ t h o n') and the misses."""
+        shown = progress.split(" ")
+        found: Dict[str, int] = {}
+        for pos, ch in enumerate(shown):
+            if ch != "_":
+                found[ch] = found.get(ch, 0) | 1 << pos
+        # characters that aren't a-z say nothing about the candidates
+        for letter, positions in found.items():
+            bit = letter_bit(letter)
+            if bit and not self.guessed & bit:
+                self.hit(letter, positions)
+        for letter in wrong:
+            bit = letter_bit(letter)
+            if bit and not self.guessed & bit:
+                self.miss(letter)
+
+    def count(self) -> int:
+        return self.candidates.bit_count()
+
+    def words(self, limit: Optional[int] = None) -> List[str]:
+        """The remaining candidates (the first limit of them)."""
+        found = []
+        bits = self.candidates
+        while bits and (limit is None or len(found) < limit):
+            low = bits & -bits
+            found.append(self.group.words[low.bit_length() - 1])
+            bits ^= low
+        return found
+
+    def best_guess(self) -> Optional[str]:
+        """
+        The unguessed letter whose answer splits the candidates best
+        (highest entropy over "not in the word" and where it appears);
+        ties go to the letter more likely to be in the word.
+        """
+        total = self.count()
+        if total == 0:
+            return None
+        if total <= EXACT_LIMIT:
+            splits = self._exact_splits()
+        else:
+            splits = self._estimated_splits()
+
+        best, best_score = None, None
+        for letter, (present, groups) in splits.items():
+            if not present:
+                continue
+            sizes = [total - present] + groups
+            entropy = -sum(s / total * math.log2(s / total) for s in sizes if s)
+            score = (entropy, present)
+            if best_score is None or score > best_score:
+                best, best_score = letter, score
+        if best is None:  # every candidate fully guessed already
+            open_letters = ~self.guessed & ((1 << 26) - 1)
+            return mask_letters(open_letters)[:1] or None
+        return chr(97 + best)
+
+    def _exact_splits(self) -> Dict[int, tuple]:
+        # letter -> (words containing it, sizes of the groups by position pattern)
+        patterns: Dict[int, Dict[int, int]] = {}
+        for word in self.words():
+            masks: Dict[int, int] = {}
+            for pos, ch in enumerate(word):
+                i = ord(ch) - 97
+                if not self.guessed >> i & 1:
+                    masks[i] = masks.get(i, 0) | 1 << pos
+            for i, mask in masks.items():
+                by_mask = patterns.setdefault(i, {})
+                by_mask[mask] = by_mask.get(mask, 0) + 1
+        return {i: (sum(by_mask.values()), list(by_mask.values()))
+                for i, by_mask in patterns.items()}
+
+    def _estimated_splits(self) -> Dict[int, tuple]:
+        # group sizes approximated by how many candidates have the letter at
+        # each position, scaled so they add up to the words containing it
+        splits = {}
+        cands = self.candidates
+        for i in range(26):
+            if self.guessed >> i & 1:
+                continue
+            present = (cands & self.group.has[i]).bit_count()
+            if not present:
+                continue
+            at = [(cands & row[i]).bit_count() for row in self.group.at]
+            spread = sum(at)
+            splits[i] = (present, [n * present / spread for n in at if n])
+        return splits
+
+def suggest(index: WordIndex, progress: str, wrong: Set[str]) -> Optional[str]:
+    """Best next letter for a game in this state (no Solver kept around)."""
+    solver = index.solver(len(progress.split(" ")))
+    solver.update(progress, wrong)
+    return solver.best_guess()
@@ -0,0 +1,212 @@
+import heapq
+import json
+import os
+import sys
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+# A stats folder holds:
+#   games.log        every game, one JSON object per line, append-only
+#   aggregates.json  the totals below, plus how much of games.log they cover
+# Recording a game appends one line and bumps a few counters; the totals
+# are rewritten every CHECKPOINT_GAMES games (and on close), and on open
+# only the log written after that is replayed.
+STATS_DIR = "stats"
+LOG_FILE = "games.log"
+AGGREGATES_FILE = "aggregates.json"
+CHECKPOINT_GAMES = 1000
+
+class GameResult(NamedTuple):
+    player: str
+    word: str
+    guesses: str      # letters in the order guessed
+    won: bool
+    wrong: int
+    duration: float   # seconds
+    when: float       # time.time() at the end of the game
+
+def _parse_game(raw: bytes) -> GameResult:
+    """A log line as a GameResult; ValueError / TypeError if it isn't one."""
+    game = GameResult(**json.loads(raw))
+    if not (isinstance(game.player, str) and isinstance(game.word, str)
+            and isinstance(game.guesses, str) and isinstance(game.wrong, int)):
+        raise TypeError(f"bad game record: {raw[:80]!r}")
+    return game
+
+class StatsStore:
+    """Append-only game log with running per-word, per-letter and per-player totals."""
+
+    def __init__(self, folder: str = STATS_DIR):
+        self.folder = folder
+        os.makedirs(folder, exist_ok=True)
+        self.log_path = os.path.join(folder, LOG_FILE)
+        self.aggregates_path = os.path.join(folder, AGGREGATES_FILE)
+        self.games = 0
+        self.words: Dict[str, List[int]] = {}    # word -> [played, won, wrong, guesses]
+        self.players: Dict[str, List[int]] = {}  # player -> [played, won, streak, best]
+        self.letters = [0] * 26                  # times each letter was guessed
+        self.letter_hits = [0] * 26              # ... and was in the word
+        self._since_checkpoint = 0
+        self._log_size = 0
+
+        self._load_aggregates()
+        self._replay_log()
+        # binary, so "\n" isn't written as "\r\n" on Windows and
+        # _log_size stays the real file offset
+        self._log = open(self.log_path, "ab")
+
+    def record(self, game: GameResult):
+        """Log a game and update the totals; cost doesn't grow with the history."""
+        line = (json.dumps(game._asdict(), separators=(",", ":")) + "\n").encode("utf-8")
+        self._log.write(line)
+        self._log.flush()
+        self._log_size += len(line)
+        self._apply(game)
+        self._since_checkpoint += 1
+        if self._since_checkpoint >= CHECKPOINT_GAMES:
+            self.checkpoint()
+
+    def checkpoint(self):
+        data = {
+            "log_size": self._log_size,
+            "games": self.games,
+            "words": self.words,
+            "players": self.players,
+            "letters": self.letters,
+            "letter_hits": self.letter_hits,
+        }
+        tmp = self.aggregates_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp, self.aggregates_path)
+        self._since_checkpoint = 0
+
+    def close(self):
+        if self._since_checkpoint:
+            self.checkpoint()
+        self._log.close()
+
+    # --- queries ---
+
+    def word_stats(self, word: str) -> Optional[dict]:
+        totals = self.words.get(word)
+        if totals is None:
+            return None
+        played, won, wrong, guesses = totals
+        return {"played": played, "win_rate": won / played,
+                "wrong_per_game": wrong / played, "guesses_per_game": guesses / played}
+
+    def hardest_words(self, n: int = 10, min_played: int = 5) -> List[Tuple[str, float]]:
+        """Lowest win rate first, among words played at least min_played times."""
+        rates = ((word, t[1] / t[0]) for word, t in self.words.items() if t[0] >= min_played)
+        return heapq.nsmallest(n, rates, key=lambda item: item[1])
+
+    def leaderboard(self, n: int = 10, by: str = "best_streak") -> List[Tuple[str, dict]]:
+        """Top players by "best_streak", "streak", "won" or "win_rate"."""
+        rows = ((name, self.player_stats(name)) for name in self.players)
+        return heapq.nlargest(n, rows, key=lambda row: (row[1][by], row[1]["played"]))
+
+    def player_stats(self, player: str) -> dict:
+        played, won, streak, best = self.players.get(player, [0, 0, 0, 0])
+        return {"played": played, "won": won, "win_rate": won / played if played else 0.0,
+                "streak": streak, "best_streak": best}
+
+    def letter_frequencies(self) -> Dict[str, dict]:
+        """How often each letter is guessed, and how often it's a hit."""
+        total = sum(self.letters) or 1
+        return {chr(97 + i): {"share": count / total,
+                              "hit_rate": self.letter_hits[i] / count if count else 0.0}
+                for i, count in enumerate(self.letters)}
+
+    # --- internals ---
+
+    def _apply(self, game: GameResult):
+        self.games += 1
+        word = self.words.setdefault(game.word, [0, 0, 0, 0])
+        word[0] += 1
+        word[1] += game.won
+        word[2] += game.wrong
+        word[3] += len(game.guesses)
+
+        player = self.players.setdefault(game.player, [0, 0, 0, 0])
+        player[0] += 1
+        if game.won:
+            player[1] += 1
+            player[2] += 1
+            player[3] = max(player[3], player[2])
+        else:
+            player[2] = 0
+
+        for ch in game.guesses:
+            i = ord(ch) - 97
+            if 0 <= i < 26:
+                self.letters[i] += 1
+                if ch in game.word:
+                    self.letter_hits[i] += 1
+
+    def _load_aggregates(self):
+        try:
+            with open(self.aggregates_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        self._log_size = data["log_size"]
+        self.games = data["games"]
+        self.words = data["words"]
+        self.players = data["players"]
+        self.letters = data["letters"]
+        self.letter_hits = data["letter_hits"]
+
+    def _reset(self):
+        self.games = 0
+        self.words, self.players = {}, {}
+        self.letters, self.letter_hits = [0] * 26, [0] * 26
+        self._log_size = 0
+
+    def _replay_log(self):
+        # games logged after the last checkpoint
+        if not os.path.exists(self.log_path):
+            self._log_size = 0
+            return
+        if os.path.getsize(self.log_path) < self._log_size:
+            # the log was replaced or cut short: the totals don't match it
+            print(f"{self.log_path} is shorter than the checkpoint, rebuilding the totals",
+                  file=sys.stderr)
+            self._reset()
+        skipped = 0
+        with open(self.log_path, "rb") as f:
+            f.seek(self._log_size)
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break  # torn last line from a crash; cut it off below
+                try:
+                    game = _parse_game(raw)
+                except (ValueError, TypeError):
+                    skipped += 1  # a damaged line; keep it, but don't count it
+                else:
+                    self._apply(game)
+                self._log_size += len(raw)
+                self._since_checkpoint += 1
+        if skipped:
+            print(f"{self.log_path}: skipped {skipped} unreadable games", file=sys.stderr)
+        if os.path.getsize(self.log_path) > self._log_size:
+            with open(self.log_path, "r+b") as f:
+                f.truncate(self._log_size)
+
+def main(argv: List[str]):
+    # python stats.py [stats folder] -- print the leaderboards
+    store = StatsStore(argv[0] if argv else STATS_DIR)
+    print(f"{store.games} games, {len(store.words)} words, {len(store.players)} players")
+    print("\nBest streaks:")
+    for name, s in store.leaderboard(10):
+        print(f"  {name:16} {s['best_streak']:4}  (won {s['won']}/{s['played']})")
+    print("\nHardest words:")
+    for word, rate in store.hardest_words(10):
+        print(f"  {word:16} {rate:.0%} won")
+    top = sorted(store.letter_frequencies().items(), key=lambda kv: -kv[1]["share"])[:8]
+    print("\nMost guessed letters:",
+          ", ".join(f"{ch} ({s['share']:.0%}, hits {s['hit_rate']:.0%})" for ch, s in top))
+    store.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,310 @@
+import bisect
+import math
+import mmap
+import os
+import random
+import re
+import struct
+import sys
+import unicodedata
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# File layout (little-endian):
+#   b"HWL1", group count
+#   per group: word length, word count, offset of words, offset of scores
+#   words: each group's words sorted, one per line ("word\n"), so word i
+#          of a group is at offset + i * (length + 1)
+#   scores: one byte per word (0 = easiest, 255 = hardest), same order
+MAGIC = b"HWL1"
+HEADER = struct.Struct("<4sI")
+GROUP = struct.Struct("<IIQQ")
+
+# choose(difficulty=...) bands, as score ranges
+DIFFICULTY = {"easy": (0, 84), "medium": (85, 169), "hard": (170, 255)}
+
+# word lengths kept from sources (build_wordlist and build_words.py)
+MIN_LENGTH, MAX_LENGTH = 3, 32
+
+_clean_re = re.compile(r"^[a-z]+$")
+
+def normalize(word: str) -> Optional[str]:
+    """
+    Lowercase word if it's A-Z letters only (what main.get_letter can
+    guess), after dropping accents ('Café' -> 'cafe'); else None.
+    """
+    word = word.strip().lower()
+    if not word.isascii():
+        decomposed = unicodedata.normalize("NFKD", word)
+        word = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return word if _clean_re.match(word) else None
+
+def _letters(word: str) -> set:
+    # a-z letters of word, case-insensitive; spaces, hyphens etc. don't count
+    return {ch for ch in word.lower() if "a" <= ch <= "z"}
+
+def word_from_line(line: str, min_length: int = MIN_LENGTH,
+                   max_length: int = MAX_LENGTH) -> Optional[str]:
+    """
+    The word on a line of a source file: its first field (anything after
+    whitespace is ignored, so frequency lists work too), normalized, if
+    its length is in range; else None.
+    """
+    field = line.split(None, 1)
+    word = normalize(field[0]) if field else None
+    return word if word and min_length <= len(word) <= max_length else None
+
+def letter_costs(words: Iterable[str]) -> List[float]:
+    """-log of the share of words containing each letter a..z (rare = high)."""
+    counts = [0] * 26
+    total = 0
+    for word in words:
+        total += 1
+        for ch in _letters(word):
+            counts[ord(ch) - 97] += 1
+    return [-math.log((c + 1) / (total + 1)) for c in counts]
+
+def rarity(word: str, costs: List[float]) -> float:
+    letters = _letters(word)
+    if not letters:
+        return 0.0
+    return sum(costs[ord(ch) - 97] for ch in letters) / len(letters)
+
+def rank_scores(raw: List[float]) -> List[int]:
+    """Raw difficulties as ranks spread over 0..255, so bands are about equal size."""
+    order = sorted(range(len(raw)), key=raw.__getitem__)
+    scores = [0] * len(raw)
+    for rank, i in enumerate(order):
+        scores[i] = rank * 255 // max(1, len(raw) - 1)
+    return scores
+
+def rarity_scores(words: List[str]) -> List[int]:
+    """Quick difficulty guess: words made of rarer letters score higher."""
+    costs = letter_costs(words)
+    return rank_scores([rarity(word, costs) for word in words])
+
+def write_wordlist(groups: Dict[int, List[str]], path: str,
+                   scores: Optional[Dict[int, List[int]]] = None):
+    """
+    Write words grouped by length ({length: sorted words}) to path.
+    scores defaults to rarity_scores over the whole list.
+    """
+    if scores is None:
+        flat = [w for length in sorted(groups) for w in groups[length]]
+        flat_scores = iter(rarity_scores(flat))
+        scores = {length: [next(flat_scores) for _ in groups[length]]
+                  for length in sorted(groups)}
+
+    lengths = sorted(length for length in groups if groups[length])
+    offset = HEADER.size + GROUP.size * len(lengths)
+    table = []
+    for length in lengths:
+        count = len(groups[length])
+        words_at = offset
+        scores_at = words_at + count * (length + 1)
+        table.append(GROUP.pack(length, count, words_at, scores_at))
+        offset = scores_at + count
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(lengths)))
+        f.writelines(table)
+        for length in lengths:
+            f.write("".join(w + "\n" for w in groups[length]).encode("ascii"))
+            f.write(bytes(scores[length]))
+    os.replace(tmp, path)
+
+def write_scores(path: str, scores: bytes):
+    """
+    Replace the scores in a word list file (one byte per word, in index
+    order), in place: the words and the layout stay as they are.
+    """
+    words = WordList(path)
+    groups = [(words.groups[length][2], words.count(length)) for length in words.lengths()]
+    total = len(words)
+    words.close()
+    if len(scores) != total:
+        raise ValueError(f"{path} has {total} words, got {len(scores)} scores")
+    start = 0
+    with open(path, "r+b") as f:
+        for scores_at, n in groups:
+            f.seek(scores_at)
+            f.write(scores[start:start + n])
+            start += n
+
+def build_wordlist(lines: Iterable[str], path: str):
+    """Pick the words out of lines (word_from_line), de-duplicate, group and write them."""
+    groups: Dict[int, set] = {}
+    for line in lines:
+        word = word_from_line(line)
+        if word:
+            groups.setdefault(len(word), set()).add(word)
+    write_wordlist({length: sorted(ws) for length, ws in groups.items()}, path)
+
+class WordList:
+    """
+    A word list file, memory-mapped: opening it reads only the header, and
+    words are decoded one at a time when asked for. Indexing and len()
+    work like a list, so random.choice / hangman.choose_word accept it.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a word list file")
+        self.groups: Dict[int, Tuple[int, int, int]] = {}  # length -> (count, words at, scores at)
+        self._firsts: List[int] = []   # global index of each group's first word,
+        self._lengths: List[int] = []  # for __getitem__
+        first = 0
+        for g in range(count):
+            length, n, words_at, scores_at = GROUP.unpack_from(
+                self._mm, HEADER.size + g * GROUP.size)
+            self.groups[length] = (n, words_at, scores_at)
+            self._firsts.append(first)
+            self._lengths.append(length)
+            first += n
+        self._len = first
+
+    def close(self):
+        self._mm.close()
+
+    def __len__(self):
+        return self._len
+
+    def __getitem__(self, i: int) -> str:
+        if i < 0:
+            i += self._len
+        if not 0 <= i < self._len:
+            raise IndexError(i)
+        g = bisect.bisect_right(self._firsts, i) - 1
+        return self.word(self._lengths[g], i - self._firsts[g])
+
+    def __iter__(self) -> Iterator[str]:
+        for length in self.lengths():
+            yield from self.words(length)
+
+    def __contains__(self, word: str) -> bool:
+        return self.find(word) is not None
+
+    def lengths(self) -> List[int]:
+        return sorted(self.groups)
+
+    def count(self, length: int) -> int:
+        return self.groups.get(length, (0, 0, 0))[0]
+
+    def word(self, length: int, i: int) -> str:
+        _, words_at, _ = self.groups[length]
+        start = words_at + i * (length + 1)
+        return self._mm[start:start + length].decode("ascii")
+
+    def score(self, length: int, i: int) -> int:
+        return self._mm[self.groups[length][2] + i]
+
+    def find(self, word: str) -> Optional[int]:
+        """Index of word within its length group (binary search), or None."""
+        if len(word) not in self.groups:
+            return None
+        key = word.encode("ascii", "replace")
+        n, words_at, _ = self.groups[len(word)]
+        stride = len(word) + 1
+        lo, hi = 0, n
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = words_at + mid * stride
+            if self._mm[start:start + len(word)] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        start = words_at + lo * stride
+        return lo if lo < n and self._mm[start:start + len(word)] == key else None
+
+    def words(self, length: int) -> Iterator[str]:
+        for i in range(self.count(length)):
+            yield self.word(length, i)
+
+    def filter(self, pattern: str, exclude: str = "") -> Iterator[str]:
+        """
+        Words matching a pattern like 'p_t__n' ('_' = unknown letter,
+        which can't be one of exclude or an already shown letter).
+        Runs a regex over the group's bytes; no list of words is built.
+        """
+        if len(pattern) not in self.groups:
+            return
+        banned = set(exclude) | set(pattern.replace("_", ""))
+        blank = f"[^{''.join(sorted(banned))}\\n]" if banned else "[a-z]"
+        regex = ("^" + "".join(blank if ch == "_" else re.escape(ch) for ch in pattern)
+                 + "$").encode("ascii")
+        n, words_at, scores_at = self.groups[len(pattern)]
+        region = memoryview(self._mm)[words_at:scores_at]
+        try:
+            for match in re.finditer(regex, region, re.M):
+                yield match.group().decode("ascii")
+        finally:
+            region.release()
+
+    def choose(self, length: Optional[int] = None, difficulty: Optional[str] = None,
+               rng=random) -> str:
+        """Random word, optionally of a given length and/or difficulty band."""
+        lengths = [length] if length is not None else self.lengths()
+        lengths = [l for l in lengths if self.count(l)]
+        if not lengths:
+            raise ValueError(f"no words of length {length}")
+        low, high = DIFFICULTY[difficulty] if difficulty else (0, 255)
+
+        weights = [self.count(l) for l in lengths]
+        for _ in range(64):  # bands are ~1/3 of the words: rarely needs many tries
+            l = rng.choices(lengths, weights)[0]
+            i = rng.randrange(self.count(l))
+            if low <= self.score(l, i) <= high:
+                return self.word(l, i)
+        # sparse band: scan the score bytes for the matches
+        matches = [(l, i) for l in lengths
+                   for i, s in enumerate(self._scores(l)) if low <= s <= high]
+        if not matches:
+            raise ValueError(f"no {difficulty} words of length {length}")
+        l, i = rng.choice(matches)
+        return self.word(l, i)
+
+    def scores(self) -> bytes:
+        """Every word's score, in index order."""
+        return b"".join(self._scores(length) for length in self.lengths())
+
+    def _scores(self, length: int) -> bytes:
+        n, _, scores_at = self.groups[length]
+        return self._mm[scores_at:scores_at + n]
+
+def open_wordlist(path: str) -> WordList:
+    """
+    Open a word list file, or a plain text one (a word per line): that's
+    compiled to path + ".hwl" on first use, and again when it changes.
+    """
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) == MAGIC:
+            return WordList(path)
+    compiled = path + ".hwl"
+    if not os.path.exists(compiled) or os.path.getmtime(compiled) < os.path.getmtime(path):
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            build_wordlist(f, compiled)
+    return WordList(compiled)
+
+def main(argv: List[str]):
+    # python wordlist.py words.txt words.hwl
+    if len(argv) != 2:
+        print("usage: python wordlist.py WORDS.txt OUT.hwl")
+        return 2
+    with open(argv[0], "r", encoding="utf-8", errors="replace") as f:
+        build_wordlist(f, argv[1])
+    words = WordList(argv[1])
+    lengths = words.lengths()
+    words.close()
+    if not lengths:
+        print(f"no usable words in {argv[0]} (only A-Z letters count)")
+        return 1
+    print(f"{len(words)} words, lengths {lengths[0]}-{lengths[-1]}, "
+          f"{os.path.getsize(argv[1]) / 1024:.0f} KiB")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,360 @@
+# volleyball_stats.py
+#
+# Season stats for volleyball_tracker.html. The tracker keeps running
+# per-player counters in localStorage ("vb_teams_v2", saved with the
+# Export Stats button); every save overwrites them. Ingesting an export
+# after each match turns the change since the previous export into one
+# match worth of per-player deltas.
+#
+# A stats folder (vb_stats/) holds:
+#   col_<name>.bin  one file per column (match, player, then each stat),
+#                   raw little-endian arrays, append-only: row i is one
+#                   player's deltas for one match
+#   matches.jsonl   one line per match: team, season, day, first row
+#   players.jsonl   one line per player (team + tracker id), updates appended
+#   state.json      committed row/match/player counts, each player's
+#                   baseline counters, snapshots already seen, and season totals
+# state.json is written last, so after a crash the extra rows and lines
+# are cut back to what it says. Season totals are kept up to date on each
+# ingest; leaderboards over the last N matches sum a slice of the columns.
+#
+#   python volleyball_stats.py ingest export.json [--date 2026-10-19] [--season 2026]
+#   python volleyball_stats.py leaders kills [--season 2026] [--team Name] [--last 10]
+#   python volleyball_stats.py teams [--season 2026]
+import argparse
+import hashlib
+import heapq
+import json
+import os
+import sys
+from array import array
+from datetime import date
+
+STATS_DIR = "vb_stats"
+# same names and order as defaultStats() in volleyball_tracker.html
+STATS = ("kills", "aces", "errors", "serves", "serviceErrors", "digs", "assists", "blocks")
+DERIVED = {"points": ("kills", "aces", "blocks")}  # sums of other stats
+COLUMNS = {"match": "I", "player": "I", **{stat: "H" for stat in STATS}}
+MAX_DELTA = 0xFFFF  # one match's delta has to fit a "H" column
+
+
+def season_of(day: date) -> str:
+    return str(day.year)
+
+
+def snapshot_hash(team: dict) -> str:
+    roster = sorted((str(p.get("id")), [p.get("stats", {}).get(s, 0) for s in STATS])
+                    for p in team.get("roster", []))
+    return hashlib.sha1(json.dumps([team.get("name"), roster]).encode("utf-8")).hexdigest()
+
+
+class SeasonStats:
+    """Per-match stat deltas in columns, plus running per-season totals."""
+
+    def __init__(self, folder: str = STATS_DIR):
+        self.folder = folder
+        os.makedirs(folder, exist_ok=True)
+        state = self._read_json("state.json") or {}
+        self.rows = state.get("rows", 0)
+        self.baseline = {int(k): v for k, v in state.get("baseline", {}).items()}
+        self.seen = set(state.get("seen", []))
+        # "season|player index" / "season|team" -> [matches, *STATS]
+        self.player_totals = state.get("player_totals", {})
+        self.team_totals = state.get("team_totals", {})
+
+        self.columns = {name: self._load_column(name, code) for name, code in COLUMNS.items()}
+        self.matches = self._load_lines("matches.jsonl", state.get("matches", 0))
+        player_lines = self._load_lines("players.jsonl", state.get("player_lines", 0))
+        self.players = []        # index -> {"team", "id", "name", "number"}
+        self._player_index = {}  # (team, tracker id) -> index
+        for record in player_lines:
+            self._remember_player(record)
+        self._player_lines = len(player_lines)
+        self._team_matches = {}  # team -> [match index]
+        for i, match in enumerate(self.matches):
+            self._team_matches.setdefault(match["team"], []).append(i)
+
+    # --- ingest ---
+
+    def ingest(self, teams: dict, day: date | None = None, season: str | None = None,
+               label: str = "") -> list:
+        """
+        Add a vb_teams_v2 export. Each team whose counters moved since the
+        last export becomes a match; returns the new match indexes.
+        """
+        day = day or date.today()
+        season = season or season_of(day)
+        added = []
+        new_rows = {name: array(code) for name, code in COLUMNS.items()}
+        new_matches, new_players = [], []
+
+        for team_name, team in sorted(teams.items()):
+            team_name = team.get("name") or team_name
+            digest = snapshot_hash(team)
+            if digest in self.seen:
+                continue
+
+            match_index = len(self.matches) + len(new_matches)
+            first_row = self.rows + len(new_rows["match"])
+            deltas, baselines, too_big = [], {}, []
+            for player in team.get("roster", []):
+                index = self._player(team_name, player, new_players)
+                counters = [max(0, int(player.get("stats", {}).get(s, 0) or 0)) for s in STATS]
+                before = self.baseline.get(index, [0] * len(STATS))
+                if any(before) and all(now < old for now, old in zip(counters, before) if old):
+                    before = [0] * len(STATS)  # every counter went down: reset in the tracker
+                # a single lower counter is an Undo: nothing is counted for it,
+                # and its baseline stays up so the next increase makes up for it
+                baselines[index] = [max(now, old) for now, old in zip(counters, before)]
+                delta = [max(0, now - old) for now, old in zip(counters, before)]
+                if max(delta) > MAX_DELTA:
+                    too_big.append(player.get("name") or str(player.get("id")))
+                if any(delta):
+                    deltas.append((index, delta))
+            if too_big:
+                # can't be stored; left unseen so a fixed export can be ingested
+                print(f"skipping {team_name}: more than {MAX_DELTA} of a stat in one match "
+                      f"for {', '.join(too_big)}", file=sys.stderr)
+                continue
+            self.seen.add(digest)
+            self.baseline.update(baselines)
+            if not deltas:
+                continue
+
+            for index, delta in deltas:
+                new_rows["match"].append(match_index)
+                new_rows["player"].append(index)
+                for stat, value in zip(STATS, delta):
+                    new_rows[stat].append(value)
+                self._add_total(self.player_totals, f"{season}|{index}", delta)
+            team_delta = [sum(d[i] for _, d in deltas) for i in range(len(STATS))]
+            self._add_total(self.team_totals, f"{season}|{team_name}", team_delta)
+            new_matches.append({"team": team_name, "season": season, "day": day.isoformat(),
+                                "label": label, "first_row": first_row})
+            added.append(match_index)
+
+        self._commit(new_rows, new_matches, new_players)
+        return added
+
+    def ingest_file(self, path: str, day: date | None = None, season: str | None = None) -> list:
+        with open(path, "r", encoding="utf-8") as f:
+            teams = json.load(f)
+        if "vb_teams_v2" in teams:  # a whole localStorage dump
+            teams = json.loads(teams["vb_teams_v2"])
+        return self.ingest(teams, day, season, label=os.path.basename(path))
+
+    # --- queries ---
+
+    def seasons(self) -> list:
+        return sorted({match["season"] for match in self.matches})
+
+    def player_season(self, season: str, team: str | None = None) -> list:
+        """Season totals of each player (of team), as dicts."""
+        rows = []
+        for key, totals in self.player_totals.items():
+            key_season, index = key.split("|", 1)
+            player = self.players[int(index)]
+            if key_season == season and (team is None or player["team"] == team):
+                rows.append(self._row(player, totals))
+        return rows
+
+    def team_season(self, season: str) -> list:
+        rows = []
+        for key, totals in self.team_totals.items():
+            key_season, team = key.split("|", 1)
+            if key_season == season:
+                rows.append(self._row({"team": team}, totals))
+        return rows
+
+    def leaderboard(self, stat: str, season: str | None = None, team: str | None = None,
+                    last: int | None = None, n: int = 10) -> list:
+        """
+        Top n players by stat. With last, over the last matches (of team,
+        or of the whole club) rather than a season; season defaults to the
+        latest one.
+        """
+        parts = DERIVED.get(stat, (stat,))
+        if any(part not in STATS for part in parts):
+            raise ValueError(f"unknown stat {stat!r}")
+        if last is None:
+            season = season or (self.seasons() or [""])[-1]
+            rows = self.player_season(season, team)
+        else:
+            rows = self._window(self._last_matches(team, last))
+        return heapq.nlargest(n, rows, key=lambda row: (sum(row[p] for p in parts), -row["matches"]))
+
+    # --- internals ---
+
+    def _last_matches(self, team: str | None, last: int) -> list:
+        matches = self._team_matches.get(team, []) if team else range(len(self.matches))
+        return list(matches[-last:]) if last > 0 else []
+
+    def _window(self, match_indexes: list) -> list:
+        # sum the column slices of those matches, per player
+        totals = {}
+        cols = [self.columns[stat] for stat in STATS]
+        players = self.columns["player"]
+        for m in match_indexes:
+            start = self.matches[m]["first_row"]
+            stop = self.matches[m + 1]["first_row"] if m + 1 < len(self.matches) else self.rows
+            for row in range(start, stop):
+                t = totals.get(players[row])
+                if t is None:
+                    t = totals[players[row]] = [0] * (len(STATS) + 1)
+                t[0] += 1
+                for i, col in enumerate(cols):
+                    t[i + 1] += col[row]
+        return [self._row(self.players[index], t) for index, t in totals.items()]
+
+    @staticmethod
+    def _row(player: dict, totals: list) -> dict:
+        row = {key: player.get(key) for key in ("team", "name", "number") if key in player}
+        row["matches"] = totals[0]
+        row.update(zip(STATS, totals[1:]))
+        for stat, parts in DERIVED.items():
+            row[stat] = sum(row[p] for p in parts)
+        return row
+
+    @staticmethod
+    def _add_total(totals: dict, key: str, delta: list):
+        t = totals.get(key)
+        if t is None:
+            t = totals[key] = [0] * (len(STATS) + 1)
+        t[0] += 1
+        for i, value in enumerate(delta):
+            t[i + 1] += value
+
+    def _player(self, team: str, player: dict, new_players: list) -> int:
+        record = {"team": team, "id": str(player.get("id")),
+                  "name": player.get("name", ""), "number": player.get("number", "")}
+        index = self._player_index.get((team, record["id"]))
+        if index is None or self.players[index] != record:  # new, or renamed/renumbered
+            new_players.append(record)
+            index = self._remember_player(record)
+        return index
+
+    def _remember_player(self, record: dict) -> int:
+        key = (record["team"], record["id"])
+        index = self._player_index.get(key)
+        if index is None:
+            index = self._player_index[key] = len(self.players)
+            self.players.append(record)
+        else:
+            self.players[index] = record
+        return index
+
+    def _commit(self, new_rows: dict, new_matches: list, new_players: list):
+        for name, values in new_rows.items():
+            with open(self._path(f"col_{name}.bin"), "ab") as f:
+                values.tofile(f)
+            self.columns[name].extend(values)
+        self._append_lines("matches.jsonl", new_matches)
+        self._append_lines("players.jsonl", new_players)
+        self.rows += len(new_rows["match"])
+        self._player_lines += len(new_players)
+        for match in new_matches:
+            self._team_matches.setdefault(match["team"], []).append(len(self.matches))
+            self.matches.append(match)
+
+        state = {
+            "rows": self.rows,
+            "matches": len(self.matches),
+            "player_lines": self._player_lines,
+            "baseline": self.baseline,
+            "seen": sorted(self.seen),
+            "player_totals": self.player_totals,
+            "team_totals": self.team_totals,
+        }
+        tmp = self._path("state.json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f, separators=(",", ":"))
+        os.replace(tmp, self._path("state.json"))
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.folder, name)
+
+    def _read_json(self, name: str):
+        try:
+            with open(self._path(name), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _load_column(self, name: str, code: str) -> array:
+        values = array(code)
+        path = self._path(f"col_{name}.bin")
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                values.frombytes(f.read(self.rows * values.itemsize))
+            if os.path.getsize(path) > self.rows * values.itemsize:
+                os.truncate(path, self.rows * values.itemsize)  # rows from an unfinished ingest
+        return values
+
+    def _load_lines(self, name: str, count: int) -> list:
+        records, size = [], 0
+        path = self._path(name)
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                for raw in f:
+                    if len(records) == count:
+                        break
+                    records.append(json.loads(raw))
+                    size += len(raw)
+            if os.path.getsize(path) > size:
+                os.truncate(path, size)
+        return records
+
+    def _append_lines(self, name: str, records: list):
+        if records:
+            with open(self._path(name), "a", encoding="utf-8") as f:
+                f.writelines(json.dumps(r, separators=(",", ":")) + "\n" for r in records)
+
+
+def _print_rows(rows: list, first: str, stats: list):
+    print(f"{first:24} {'M':>3} " + " ".join(f"{s[:6]:>6}" for s in stats))
+    for row in rows:
+        name = row.get("name") or row.get("team")
+        if "name" in row:
+            name = f"#{row.get('number') or '?'} {name} ({row['team']})"
+        print(f"{name[:24]:24} {row['matches']:3} " + " ".join(f"{row[s]:6}" for s in stats))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Volleyball season stats.")
+    parser.add_argument("--dir", default=STATS_DIR, help="stats folder")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ingest = commands.add_parser("ingest", help="add exported vb_teams_v2 snapshots")
+    ingest.add_argument("files", nargs="+")
+    ingest.add_argument("--date", type=date.fromisoformat, help="match day (default: today)")
+    ingest.add_argument("--season", help="season label (default: the match year)")
+
+    leaders = commands.add_parser("leaders", help="top players for a stat")
+    leaders.add_argument("stat", choices=STATS + tuple(DERIVED))
+    leaders.add_argument("--season")
+    leaders.add_argument("--team")
+    leaders.add_argument("--last", type=int, help="over the last N matches instead")
+    leaders.add_argument("-n", type=int, default=10)
+
+    teams = commands.add_parser("teams", help="team totals for a season")
+    teams.add_argument("--season")
+    args = parser.parse_args(argv)
+
+    stats = SeasonStats(args.dir)
+    if args.command == "ingest":
+        for path in args.files:
+            added = stats.ingest_file(path, args.date, args.season)
+            print(f"{path}: {len(added)} new match(es)")
+    elif args.command == "leaders":
+        rows = stats.leaderboard(args.stat, args.season, args.team, args.last, args.n)
+        shown = [args.stat] + [s for s in ("points", "kills", "aces", "blocks", "digs")
+                               if s != args.stat]
+        _print_rows(rows, "player", shown)
+    elif args.command == "teams":
+        season = args.season or (stats.seasons() or [""])[-1]
+        print(f"season {season or '-'}")
+        _print_rows(stats.team_season(season), "team", list(STATS) + list(DERIVED))
+
+
+if __name__ == "__main__":
+    main()